@@ -0,0 +1,50 @@
+'''
+Compares loading and saving a mGTFS dataset through the schema against the
+generated decoders and encoders of `railroaded.codec`.
+
+    python benchmarks/codec.py path/to/mgtfs.json [repeats]
+'''
+
+import json
+import sys
+import time
+
+from railroaded import GTFS
+from railroaded.codec import decode, encode
+
+
+def best (fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main (path: str, repeats: int = 5):
+    with open(path, 'r') as file:
+        data = json.load(file)
+    gtfs = GTFS.SCHEMA.load(data)
+    records = sum(
+        len(getattr(getattr(gtfs, table), 'data', None) or [])
+        for table in ('agencies', 'routes', 'schedules', 'stops', 'trips')
+    )
+    decode(GTFS, data)
+
+    rows = [
+        ('load (schema)', best(lambda: GTFS.SCHEMA.load(data), repeats)),
+        ('load (codec)', best(lambda: decode(GTFS, data), repeats)),
+        ('dump (schema)', best(lambda: GTFS.SCHEMA.dump(gtfs), repeats)),
+        ('dump (codec)', best(lambda: encode(gtfs), repeats))
+    ]
+    print(f'{path}: {records} records, best of {repeats}')
+    for label, secs in rows:
+        print(
+            f'{label:<14} {secs * 1000:10.1f} ms '
+            f'{records / secs:12.0f} rec/s'
+        )
+
+
+if __name__ == '__main__':
+    main(sys.argv[1], *(int(a) for a in sys.argv[2:3]))
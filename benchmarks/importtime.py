@@ -0,0 +1,101 @@
+'''
+Measures the time taken to import `railroaded` in a fresh interpreter with
+`python -X importtime`, both for the bare package and for the modules needed
+to read a mGTFS dataset, and reports the slowest modules.
+
+    python benchmarks/importtime.py [repeats]
+'''
+
+import os
+import subprocess
+import sys
+from typing import Any
+
+
+STATEMENTS = {
+    'package': 'import railroaded',
+    'gtfs': 'import railroaded; railroaded.GTFS'
+}
+'''the statements timed, by name'''
+
+
+def _run (statement: str) -> list[tuple[str, int, int]]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in sys.path if p)
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'): continue
+        own, total, name = line[len('import time:'):].split('|')
+        if not own.strip().isdigit(): continue
+        modules.append((name.strip(), int(own), int(total)))
+    return modules
+
+
+def measure (
+            statement: str,
+            repeats: int = 5,
+            top: int = 10
+        ) -> dict[str, Any]:
+    '''
+    Imports with `statement` in `repeats` fresh interpreters and returns the
+    fastest run. Modules imported by the interpreter at startup are not
+    counted.
+
+    Parameters:
+        statement (str):
+            the Python statement to run
+        repeats (int):
+            the number of interpreters to run it in
+        top (int):
+            the number of slowest modules to report
+
+    Returns:
+        result (dict[str, Any]):
+            the total import `seconds`, whether `pandas` was imported and the
+            `slowest` modules by their own import time in seconds
+    '''
+    startup = { name for name, _, _ in _run('pass') }
+    runs = [
+        [m for m in _run(statement) if m[0] not in startup]
+        for _ in range(repeats)
+    ]
+    best = min(runs, key=lambda r: sum(own for _, own, _ in r))
+    return {
+        'statement': statement,
+        'seconds': sum(own for _, own, _ in best) / 1e6,
+        'modules': len(best),
+        'pandas': any(name == 'pandas' for name, _, _ in best),
+        'slowest': [
+            (name, own / 1e6)
+            for name, own, _ in sorted(best, key=lambda m: -m[1])[:top]
+        ]
+    }
+
+
+def run (repeats: int = 5) -> dict[str, dict[str, Any]]:
+    '''
+    Measures every statement of `STATEMENTS`.
+    '''
+    return { name: measure(s, repeats) for name, s in STATEMENTS.items() }
+
+
+def main (repeats: int = 5):
+    for name, result in run(repeats).items():
+        print(
+            f'{name:<8} {result["seconds"] * 1000:8.1f} ms '
+            f'{result["modules"]:5d} modules '
+            f'pandas {"yes" if result["pandas"] else "no"}'
+        )
+        for module, secs in result['slowest']:
+            print(f'    {module:<40} {secs * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,81 @@
+'''
+Compares parsing the files of a GTFS dataset with pandas (the python engine
+used by `load_list`) against the `csv` module path used when pandas is not
+installed, both for parsing alone and for `load_list` as a whole.
+
+    python benchmarks/ingest.py [path/to/gtfs] [repeats]
+
+Without a path, a synthetic dataset of about 100k stop times is generated.
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+from synthetic import generate
+
+from railroaded.models import Route, StopTime, Stop, Trip
+from railroaded.util import _read_pandas, load_list, read_rows
+
+
+FILES = [
+    (
+        'stop_times.txt',
+        StopTime,
+        ['drop_off_type', 'pickup_type', 'timepoint']
+    ),
+    ('trips.txt', Trip, ['bikes_allowed', 'wheelchair_accessible']),
+    ('stops.txt', Stop, ['drop_off_type', 'pickup_type', 'timepoint']),
+    ('routes.txt', Route, ['route_type'])
+]
+'''the files parsed, with their models and integer columns'''
+
+
+def best (fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main (path: str, repeats: int = 3):
+    print(f'{path}: best of {repeats}')
+    print(
+        f'{"file":<16} {"rows":>8} {"parse pandas":>13} {"parse csv":>10} '
+        f'{"load pandas":>12} {"load csv":>9}'
+    )
+    for name, model, ints in FILES:
+        file = os.path.join(path, name)
+        if not os.path.exists(file): continue
+        rows = len(read_rows(file))
+        secs = [
+            best(lambda: _read_pandas(file, ',', ints, [], None), repeats),
+            best(lambda: read_rows(file, ',', ints, []), repeats),
+            best(
+                lambda: load_list(file, model.SCHEMA, ints, engine='pandas'),
+                repeats
+            ),
+            best(
+                lambda: load_list(file, model.SCHEMA, ints, engine='csv'),
+                repeats
+            )
+        ]
+        print(
+            f'{name:<16} {rows:>8} {secs[0]:>12.3f}s {secs[1]:>9.3f}s '
+            f'{secs[2]:>11.3f}s {secs[3]:>8.3f}s'
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(sys.argv[1], *(int(a) for a in sys.argv[2:3]))
+    else:
+        with tempfile.TemporaryDirectory(prefix='railroaded-bench-') as tmp:
+            generate(
+                tmp, stops=1000, routes=25, trips_per_route=100,
+                stops_per_trip=40
+            )
+            main(tmp)
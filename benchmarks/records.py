@@ -0,0 +1,63 @@
+'''
+Reports the memory used per `StopTime` and per `Trip` record by the seared
+models and by their `__slots__` variants from `railroaded.records`.
+
+    python benchmarks/records.py [count]
+'''
+
+import gc
+import sys
+import tracemalloc
+
+from railroaded.codec import decoder
+from railroaded.models import StopTime, Trip
+
+
+def stop_time (i: int) -> dict:
+    return {
+        'trip_id': f'trip-{i // 20}',
+        'stop_id': f'stop-{i % 500}',
+        'stop_sequence': i % 20,
+        'arrival_time': '08:00:00',
+        'departure_time': '08:00:30'
+    }
+
+
+def trip (i: int) -> dict:
+    return {
+        'trip_id': f'trip-{i}',
+        'route_id': f'route-{i % 50}',
+        'service_id': 'weekday',
+        'pattern_id': f'pattern-{i % 200}',
+        'offset': 21600 + i % 64800
+    }
+
+
+def measure (cls: type, make, count: int, slots: bool) -> float:
+    data = [make(i) for i in range(count)]
+    decode = decoder(cls, slots)
+    decode(data[0])
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    records = [decode(d) for d in data]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, 'filename'))
+    del records
+    return size / count
+
+
+def main (count: int = 100000):
+    print(f'{count} records each, bytes per record')
+    for cls, make in ((StopTime, stop_time), (Trip, trip)):
+        model = measure(cls, make, count, False)
+        slotted = measure(cls, make, count, True)
+        print(
+            f'{cls.__name__:<10} model {model:8.1f}  slots {slotted:8.1f}  '
+            f'saved {1 - slotted / model:6.1%}'
+        )
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,271 @@
+'''
+Measures the wall time, peak RSS and throughput of the ingest,
+serialization and query entry points of `railroaded` on synthetic feeds of
+several sizes, and the import time of the package (see `importtime.py`), and
+writes the results as JSON so runs can be compared.
+
+    python benchmarks/suite.py --scales 10k,100k --out results.json
+
+Every stage runs in a fresh process, so its peak RSS is not hidden by an
+earlier stage. `peak_rss` is the peak of the whole process, including the
+setup the stage needs (such as loading the feed), and `stage_rss` is how far
+the stage raised it.
+'''
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Optional
+
+import importtime
+from synthetic import generate
+
+
+SCALES = {
+    '10k': dict(stops=200, routes=10, trips_per_route=50, stops_per_trip=20),
+    '100k': dict(
+        stops=1000, routes=25, trips_per_route=100, stops_per_trip=40
+    ),
+    '1m': dict(stops=5000, routes=100, trips_per_route=250, stops_per_trip=40),
+    '10m': dict(
+        stops=20000, routes=400, trips_per_route=500, stops_per_trip=50
+    )
+}
+'''the generator parameters of every scale, named by their stop time count'''
+
+STAGES = [
+    'from_gtfs',
+    'from_gtfs_padded',
+    'save',
+    'save_compact',
+    'read_mgtfs',
+    'read_mgtfs_compact',
+    'read_mgtfs_validate',
+    'read_mgtfs_slots',
+    'index',
+    'on_date',
+    'between',
+    'on_route',
+    'connecting'
+]
+'''every measured stage, in order'''
+
+DAY = date(2026, 3, 4)
+'''the service date queried'''
+
+
+def _maxrss () -> int:
+    try:
+        with open('/proc/self/status', 'r') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def _stage (
+            stage: str,
+            feeds: dict[str, str],
+            work: str
+        ) -> tuple[Callable[[], Any], int]:
+    from railroaded import GTFS
+
+    mgtfs = os.path.join(work, 'feed.json')
+    compact = os.path.join(work, 'compact.json')
+    if stage == 'from_gtfs':
+        return lambda: GTFS.read('bench', gtfs_path=feeds[',']), 0
+    if stage == 'from_gtfs_padded':
+        return lambda: GTFS.read('bench', gtfs_path=feeds[', ']), 0
+    if stage.startswith('read_mgtfs'):
+        path = compact if stage == 'read_mgtfs_compact' else mgtfs
+        return lambda: GTFS.read(
+            'bench',
+            mgtfs_path=path,
+            validate=stage == 'read_mgtfs_validate',
+            slots=stage == 'read_mgtfs_slots'
+        ), 0
+
+    g = GTFS.read('bench', mgtfs_path=mgtfs)
+    if stage == 'save':
+        return lambda: GTFS.save(g, os.path.join(work, 'out.json')), 0
+    if stage == 'save_compact':
+        return lambda: GTFS.save(
+            g, os.path.join(work, 'out.json'), compact=True
+        ), 0
+    if stage == 'index':
+        return lambda: g._ref(g.trips).index, 0
+
+    g.index
+    g.timeline
+    trip = g.trips.trips[0]
+    stop_ids = trip.stop_ids
+    if stage == 'on_date': return lambda: g.on_date(DAY), 1
+    if stage == 'between':
+        return lambda: g.between(
+            datetime(DAY.year, DAY.month, DAY.day, 8),
+            datetime(DAY.year, DAY.month, DAY.day, 9)
+        ), 1
+    if stage == 'on_route': return lambda: g.on_route(trip.route_id), 1
+    if stage == 'connecting':
+        return lambda: g.connecting(stop_ids[0], stop_ids[-1]), 1
+    raise ValueError(f'unknown stage {stage}')
+
+
+def run_stage (
+            stage: str,
+            feeds: dict[str, str],
+            work: str,
+            repeats: int
+        ) -> dict[str, Any]:
+    '''
+    Runs one stage in the current process and returns its measurements.
+    Queries are repeated `repeats` times and reported by their best run.
+    '''
+    fn, repeat = _stage(stage, feeds, work)
+    before = _maxrss()
+    times = []
+    for _ in range(repeats if repeat else 1):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    peak = _maxrss()
+    return {
+        'seconds': min(times),
+        'peak_rss': peak,
+        'stage_rss': peak - before
+    }
+
+
+def _isolated (*args) -> dict[str, Any]:
+    ctx = mp.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(run_stage, *args).result()
+
+
+def _commit () -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run (
+            scales: list[str],
+            stages: list[str] = STAGES,
+            repeats: int = 3,
+            work: Optional[str] = None
+        ) -> dict[str, Any]:
+    '''
+    Runs every stage at every scale and returns the results.
+
+    Parameters:
+        scales (list[str]):
+            the names of the scales to run (see `SCALES`)
+        stages (list[str]):
+            the stages to run (see `STAGES`)
+        repeats (int):
+            the number of runs of every query stage
+        work (Optional[str]):
+            the directory to generate feeds in, by default a temporary one
+
+    Returns:
+        results (dict[str, Any]):
+            the environment of the run, the import times and a result per
+            scale and stage
+    '''
+    import railroaded
+
+    imports = importtime.run(repeats)
+    for name, result in imports.items():
+        print(
+            f'import {name:<14} {result["seconds"]:10.4f} s',
+            file=sys.stderr
+        )
+
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix='railroaded-bench-') as tmp:
+        work = work or tmp
+        for scale in scales:
+            root = os.path.join(work, scale)
+            feeds = {
+                ',': os.path.join(root, 'gtfs'),
+                ', ': os.path.join(root, 'gtfs-padded')
+            }
+            counts = generate(feeds[','], **SCALES[scale])
+            generate(feeds[', '], delimiter=', ', **SCALES[scale])
+            from railroaded import GTFS
+            g = GTFS.read('bench', gtfs_path=feeds[','])
+            GTFS.save(g, os.path.join(root, 'feed.json'))
+            GTFS.save(g, os.path.join(root, 'compact.json'), compact=True)
+            del g
+
+            for stage in stages:
+                result = _isolated(stage, feeds, root, repeats)
+                result.update(
+                    scale=scale,
+                    stage=stage,
+                    stop_times=counts['stop_times'],
+                    throughput=counts['stop_times'] / result['seconds']
+                        if result['seconds'] > 0 else None
+                )
+                results.append(result)
+                print(
+                    f'{scale:>5} {stage:<20} {result["seconds"]:10.4f} s '
+                    f'{result["peak_rss"] / 2 ** 20:9.1f} MiB peak '
+                    f'{result["stage_rss"] / 2 ** 20:9.1f} MiB stage',
+                    file=sys.stderr
+                )
+
+    return {
+        'timestamp': datetime.now().astimezone().isoformat(),
+        'commit': _commit(),
+        'version': railroaded.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': repeats,
+        'scales': { s: SCALES[s] for s in scales },
+        'imports': imports,
+        'results': results
+    }
+
+
+def main (argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', default='10k,100k')
+    parser.add_argument('--stages', default=','.join(STAGES))
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--work')
+    parser.add_argument('--out')
+    args = parser.parse_args(argv)
+    out = run(
+        args.scales.split(','),
+        args.stages.split(','),
+        args.repeats,
+        args.work
+    )
+    text = json.dumps(out, indent=2)
+    if args.out:
+        with open(args.out, 'w') as file: file.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+'''
+Writes a deterministic synthetic GTFS dataset, for benchmarks and for trying
+out `railroaded` on feeds of any size.
+
+    python benchmarks/synthetic.py out/dir --routes 50 --trips 100 ...
+
+The same parameters and seed always produce the same files. Stops lie on a
+jittered grid, every route runs back and forth along a walk through
+neighbouring stops, trips alternate direction and vary their running times
+slightly, and late trips run past `24:00:00`.
+'''
+
+import argparse
+import csv
+from datetime import date, timedelta
+import math
+import os
+import random
+from typing import Optional
+
+
+CENTER = (39.95, -75.16)
+'''the latitude and longitude the stop grid is centered on'''
+SPACING = 0.004
+'''the distance in degrees between neighbouring stops on the grid'''
+START = date(2026, 1, 1)
+'''the first service date'''
+DAYS = 365
+'''the number of service dates'''
+
+
+def _write (
+            path: str,
+            header: list[str],
+            rows: list[list],
+            delimiter: str
+        ):
+    empty = [
+        i for i in range(len(header))
+        if all(row[i] is None for row in rows)
+    ]
+    if empty:
+        header = [h for i, h in enumerate(header) if i not in empty]
+        rows = [[v for i, v in enumerate(r) if i not in empty] for r in rows]
+    with open(path, 'w', newline='') as file:
+        if delimiter == ',':
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+        else:
+            file.write(delimiter.join(header) + '\n')
+            for row in rows:
+                file.write(delimiter.join(
+                    '' if v is None else str(v) for v in row
+                ) + '\n')
+
+
+def _time (secs: int) -> str:
+    return f'{secs // 3600:02d}:{secs % 3600 // 60:02d}:{secs % 60:02d}'
+
+
+def generate (
+            path: str,
+            stops: int = 200,
+            routes: int = 10,
+            trips_per_route: int = 50,
+            stops_per_trip: int = 20,
+            services: int = 3,
+            exceptions: int = 5,
+            shapes: bool = True,
+            frequencies: float = 0.0,
+            delimiter: str = ',',
+            seed: int = 0
+        ) -> dict[str, int]:
+    '''
+    Writes a synthetic GTFS dataset to the directory `path`.
+
+    Parameters:
+        path (str):
+            the directory to write the dataset to, created if needed
+        stops (int):
+            the number of stops
+        routes (int):
+            the number of routes
+        trips_per_route (int):
+            the number of trips of every route, in both directions
+        stops_per_trip (int):
+            the number of stops visited by every trip
+        services (int):
+            the number of services; the first two run on weekdays and
+            weekends, and the rest on random days of the week
+        exceptions (int):
+            the number of `calendar_dates.txt` exceptions of every service
+        shapes (bool):
+            whether to write `shapes.txt`
+        frequencies (float):
+            the share of trips that are frequency-based templates
+        delimiter (str):
+            the CSV delimiter, such as `', '` to mimic feeds padded after
+            every comma
+        seed (int):
+            the seed of the random generator
+
+    Returns:
+        counts (dict[str, int]):
+            the number of rows written to every file
+    '''
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    stops_per_trip = min(stops_per_trip, stops)
+    side = math.ceil(math.sqrt(stops))
+
+    stop_rows = []
+    coords = []
+    for i in range(stops):
+        lat = CENTER[0] + (i // side - side / 2) * SPACING + \
+            rng.uniform(-0.3, 0.3) * SPACING
+        lon = CENTER[1] + (i % side - side / 2) * SPACING + \
+            rng.uniform(-0.3, 0.3) * SPACING
+        coords.append((round(lat, 6), round(lon, 6)))
+        stop_rows.append([f'S{i}', f'Stop {i}', *coords[-1], 0, None])
+
+    weekdays = [[1, 1, 1, 1, 1, 0, 0], [0, 0, 0, 0, 0, 1, 1]]
+    service_ids = [f'SV{i}' for i in range(services)]
+    end = START + timedelta(days=DAYS - 1)
+    calendar_rows = []
+    date_rows = []
+    for i, sid in enumerate(service_ids):
+        days = weekdays[i] if i < len(weekdays) \
+            else [rng.randint(0, 1) for _ in range(7)]
+        calendar_rows.append([
+            sid, *days, START.strftime('%Y%m%d'), end.strftime('%Y%m%d')
+        ])
+        for day in sorted(rng.sample(range(DAYS), min(exceptions, DAYS))):
+            d = START + timedelta(days=day)
+            date_rows.append([
+                sid, d.strftime('%Y%m%d'), 1 if rng.random() < 0.5 else 2
+            ])
+
+    route_rows = []
+    trip_rows = []
+    time_rows = []
+    shape_rows = []
+    frequency_rows = []
+    for r in range(routes):
+        rid = f'R{r}'
+        route_rows.append([rid, 'A', str(r), f'Route {r}', 3])
+        at = rng.randrange(stops)
+        line = [at]
+        while len(line) < stops_per_trip:
+            row, col = divmod(at, side)
+            options = [
+                n for n in (
+                    at - side if row > 0 else None,
+                    at + side,
+                    at - 1 if col > 0 else None,
+                    at + 1 if col < side - 1 else None
+                )
+                if n is not None and n < stops and n not in line
+            ]
+            at = rng.choice(options) if options \
+                else rng.choice([n for n in range(stops) if n not in line])
+            line.append(at)
+        hops = [rng.randint(60, 240) for _ in line]
+
+        for direction in (0, 1):
+            seq = line if direction == 0 else line[::-1]
+            if shapes:
+                shape_rows.extend(
+                    [f'SH{r}_{direction}', *coords[s], k + 1]
+                    for k, s in enumerate(seq)
+                )
+
+        first, last = 5 * 3600, 25 * 3600
+        step = (last - first) // max(1, trips_per_route // 2)
+        for t in range(trips_per_route):
+            direction = t % 2
+            seq = line if direction == 0 else line[::-1]
+            tid = f'T{r}_{t}'
+            sid = service_ids[rng.randrange(len(service_ids))]
+            trip_rows.append([
+                rid, sid, tid, f'Stop {seq[-1]}', direction,
+                f'SH{r}_{direction}' if shapes else None
+            ])
+            secs = first + (t // 2) * step + rng.randint(0, 120)
+            slow = rng.random() < 0.2
+            for k, s in enumerate(seq):
+                if k > 0: secs += hops[k] + (rng.randint(0, 60) if slow else 0)
+                dwell = 30 if k % 5 == 0 else 0
+                time_rows.append([
+                    tid, _time(secs), _time(secs + dwell), f'S{s}', k + 1
+                ])
+                secs += dwell
+            if rng.random() < frequencies:
+                frequency_rows.append([tid, '06:00:00', '10:00:00', 600, 0])
+
+    _write(
+        os.path.join(path, 'agency.txt'),
+        ['agency_id', 'agency_name', 'agency_url', 'agency_timezone'],
+        [['A', 'Synthetic Transit', 'http://example.com', 'America/New_York']],
+        delimiter
+    )
+    _write(
+        os.path.join(path, 'feed_info.txt'),
+        ['feed_publisher_name', 'feed_publisher_url', 'feed_lang',
+            'feed_version'],
+        [['Synthetic', 'http://example.com', 'en', str(seed)]],
+        delimiter
+    )
+    _write(
+        os.path.join(path, 'stops.txt'),
+        ['stop_id', 'stop_name', 'stop_lat', 'stop_lon', 'location_type',
+            'parent_station'],
+        stop_rows,
+        delimiter
+    )
+    _write(
+        os.path.join(path, 'routes.txt'),
+        ['route_id', 'agency_id', 'route_short_name', 'route_long_name',
+            'route_type'],
+        route_rows,
+        delimiter
+    )
+    _write(
+        os.path.join(path, 'calendar.txt'),
+        ['service_id', 'monday', 'tuesday', 'wednesday', 'thursday',
+            'friday', 'saturday', 'sunday', 'start_date', 'end_date'],
+        calendar_rows,
+        delimiter
+    )
+    _write(
+        os.path.join(path, 'calendar_dates.txt'),
+        ['service_id', 'date', 'exception_type'],
+        date_rows,
+        delimiter
+    )
+    _write(
+        os.path.join(path, 'trips.txt'),
+        ['route_id', 'service_id', 'trip_id', 'trip_headsign',
+            'direction_id', 'shape_id'],
+        trip_rows,
+        delimiter
+    )
+    _write(
+        os.path.join(path, 'stop_times.txt'),
+        ['trip_id', 'arrival_time', 'departure_time', 'stop_id',
+            'stop_sequence'],
+        time_rows,
+        delimiter
+    )
+    if shapes:
+        _write(
+            os.path.join(path, 'shapes.txt'),
+            ['shape_id', 'shape_pt_lat', 'shape_pt_lon', 'shape_pt_sequence'],
+            shape_rows,
+            delimiter
+        )
+    if frequency_rows:
+        _write(
+            os.path.join(path, 'frequencies.txt'),
+            ['trip_id', 'start_time', 'end_time', 'headway_secs',
+                'exact_times'],
+            frequency_rows,
+            delimiter
+        )
+
+    return {
+        'stops': len(stop_rows),
+        'routes': len(route_rows),
+        'trips': len(trip_rows),
+        'stop_times': len(time_rows),
+        'calendar': len(calendar_rows),
+        'calendar_dates': len(date_rows),
+        'shapes': len(shape_rows),
+        'frequencies': len(frequency_rows)
+    }
+
+
+def main (argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('path')
+    parser.add_argument('--stops', type=int, default=200)
+    parser.add_argument('--routes', type=int, default=10)
+    parser.add_argument('--trips', type=int, default=50)
+    parser.add_argument('--stops-per-trip', type=int, default=20)
+    parser.add_argument('--services', type=int, default=3)
+    parser.add_argument('--exceptions', type=int, default=5)
+    parser.add_argument('--no-shapes', action='store_true')
+    parser.add_argument('--frequencies', type=float, default=0.0)
+    parser.add_argument('--delimiter', default=',')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    counts = generate(
+        args.path,
+        stops=args.stops,
+        routes=args.routes,
+        trips_per_route=args.trips,
+        stops_per_trip=args.stops_per_trip,
+        services=args.services,
+        exceptions=args.exceptions,
+        shapes=not args.no_shapes,
+        frequencies=args.frequencies,
+        delimiter=args.delimiter,
+        seed=args.seed
+    )
+    print(', '.join(f'{k}: {v}' for k, v in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,60 @@
-import os
-import shutil
+from __future__ import annotations
 
-from .gtfs import GTFS
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .aio import FeedResult, read_many
+    from .delta import Delta, diff, patch
+    from .gtfs import GTFS
+    from .manager import FeedManager
+    from .merge import merge
+    from .profiles import Profile
+    from .stats import QueryStats, queries
+    from .store import FeedStore
+    from .subset import Subset
+    from .tables import TableNotLoadedError
+    from .timing import Event, Report, instrument
+    from .validation import InvalidFeedError, ValidationReport
 
 
 __version__ = '0.1.5'
 
 
-_TMP = os.path.join(os.path.realpath(os.path.dirname(__file__)), 'tmp')
+_LAZY = {
+    'Delta': 'delta',
+    'Event': 'timing',
+    'FeedManager': 'manager',
+    'FeedResult': 'aio',
+    'FeedStore': 'store',
+    'GTFS': 'gtfs',
+    'InvalidFeedError': 'validation',
+    'Profile': 'profiles',
+    'QueryStats': 'stats',
+    'Report': 'timing',
+    'Subset': 'subset',
+    'TableNotLoadedError': 'tables',
+    'ValidationReport': 'validation',
+    'diff': 'delta',
+    'instrument': 'timing',
+    'merge': 'merge',
+    'patch': 'delta',
+    'queries': 'stats',
+    'read_many': 'aio'
+}
+'''the module of every public name, imported on first access'''
+
+__all__ = sorted(_LAZY)
+
+
+def __dir__ () -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
 
-if os.path.exists(_TMP): shutil.rmtree(_TMP)
\ No newline at end of file
+def __getattr__ (name: str) -> object:
+    module = _LAZY.get(name, None)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
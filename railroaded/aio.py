@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import os
+import shutil
+import tempfile
+from typing import Any, Callable, Optional
+
+from .fetch import download, extract
+from .gtfs import GTFS
+
+
+class FeedResult:
+    '''
+    The outcome of reading one feed with `read_many`.
+
+    Attributes:
+        name (str):
+            the name of the GTFS dataset
+        error (Optional[BaseException]):
+            the exception raised while reading the feed, if it failed
+        gtfs (Optional[GTFS]):
+            the `GTFS` dataset, if it was read successfully
+        ok (bool):
+            whether the feed was read successfully
+    '''
+
+    def __init__ (
+                self,
+                name: str,
+                gtfs: Optional[GTFS] = None,
+                error: Optional[BaseException] = None
+            ):
+        self.name = name
+        self.gtfs = gtfs
+        self.error = error
+
+
+    ### PROPERTIES ###
+    @property
+    def ok (self) -> bool:
+        '''whether the feed was read successfully'''
+        return self.error is None
+
+
+def _convert (feed: dict[str, Any], zip_path: str, scratch: str) -> GTFS:
+    path = extract(zip_path, scratch, feed.get('gtfs_sub', None))
+    return GTFS.read(
+        **{ **feed, 'gtfs_path': path, 'gtfs_sub': None, 'gtfs_uri': None }
+    )
+
+
+async def _read (
+            feed: dict[str, Any],
+            limit: asyncio.Semaphore,
+            pool: ProcessPoolExecutor,
+            timeout: Optional[float]
+        ) -> GTFS:
+    loop = asyncio.get_running_loop()
+    mgtfs_path = feed.get('mgtfs_path', None)
+    if feed.get('gtfs_path', None) or \
+            (mgtfs_path and os.path.exists(mgtfs_path)):
+        return await loop.run_in_executor(
+            pool, functools.partial(GTFS.read, **feed)
+        )
+
+    scratch = tempfile.mkdtemp(prefix='railroaded-')
+    try:
+        zip_path = os.path.join(scratch, 'gtfs.zip')
+        async with limit:
+            await asyncio.to_thread(
+                download, feed['gtfs_uri'], zip_path, timeout
+            )
+        return await loop.run_in_executor(
+            pool, _convert, feed, zip_path, scratch
+        )
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+async def read_many (
+            feeds: list[dict[str, Any]],
+            connections: int = 8,
+            processes: Optional[int] = None,
+            timeout: Optional[float] = None,
+            callback: Optional[Callable[[FeedResult], None]] = None
+        ) -> list[FeedResult]:
+    '''
+    Reads many GTFS datasets concurrently, and returns a `FeedResult` for
+    each in the order of `feeds`.
+
+    Each entry of `feeds` holds the keyword arguments for `GTFS.read`.
+    Remote datasets are downloaded concurrently, at most `connections` at a
+    time, and streamed into scratch space of their own. Parsing runs in a
+    pool of worker processes. A failing feed does not affect the others: its
+    `FeedResult` holds the exception instead.
+
+    Parameters:
+        feeds (list[dict[str, Any]]):
+            the `GTFS.read` arguments of each feed
+        connections (int):
+            the maximum number of concurrent downloads
+        processes (Optional[int]):
+            the number of worker processes to parse feeds with
+        timeout (Optional[float]):
+            the timeout in seconds for connecting and for each read of a
+            download
+        callback (Optional[Callable[[FeedResult], None]]):
+            a function called with each `FeedResult` as soon as its feed
+            completes or fails
+
+    Returns:
+        results (list[FeedResult]):
+            the `FeedResult` of each feed
+    '''
+    limit = asyncio.Semaphore(connections)
+
+    async def run (feed: dict[str, Any]) -> FeedResult:
+        try:
+            result = FeedResult(
+                feed['name'], await _read(feed, limit, pool, timeout)
+            )
+        except Exception as e:
+            result = FeedResult(feed['name'], error=e)
+        if callback is not None: callback(result)
+        return result
+
+    with ProcessPoolExecutor(processes) as pool:
+        return await asyncio.gather(*(run(feed) for feed in feeds))
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timezone as tz
+import functools
+import inspect
+import os
+from itertools import count
+import sys
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+
+
+_PREFIX = os.urandom(8).hex()
+_tokens = count()
+
+
+def token (obj: Any) -> Optional[str]:
+    '''
+    Returns a token unique to `obj`, assigning one on first use. Unlike `id`,
+    tokens are never reused, so a replaced table can never be mistaken for
+    the table it replaced, even if it was copied from another process.
+
+    Parameters:
+        obj (Any):
+            the object to identify
+
+    Returns:
+        token (Optional[str]):
+            the token of `obj`, or `None` if `obj` is `None`
+    '''
+    if obj is None: return None
+    t = getattr(obj, '_token', None)
+    if t is None:
+        t = f'{_PREFIX}:{next(_tokens)}'
+        obj._token = t
+    return t
+
+
+def normalize (value: Any, zone: Optional[Any] = None) -> Hashable:
+    '''
+    Returns a hashable form of the query argument `value`, so that equivalent
+    arguments produce equal cache keys.
+
+    Aware `datetime` values are converted to UTC, and naive ones are first
+    placed in `zone`. Lists and tuples become tuples, and sets become sorted
+    tuples.
+
+    Parameters:
+        value (Any):
+            the query argument to normalize
+        zone (Optional[tzinfo]):
+            the timezone naive `datetime` values are interpreted in
+
+    Returns:
+        key (Hashable):
+            a hashable form of `value`
+    '''
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            if zone is None: return value
+            value = value.replace(tzinfo=zone)
+        return value.astimezone(tz.utc)
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(v, zone) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize(v, zone) for v in value))
+    return value
+
+
+def weight (value: Any) -> int:
+    '''
+    Returns an estimate in bytes of the memory held by a cached query result,
+    not counting records it shares with the dataset it was derived from.
+
+    Parameters:
+        value (Any):
+            the cached query result
+
+    Returns:
+        weight (int):
+            the estimated size of `value` in bytes
+    '''
+    if isinstance(value, np.ndarray): return value.nbytes
+    data = getattr(getattr(value, 'trips', None), 'data', None)
+    if isinstance(data, dict):
+        return sys.getsizeof(value) + sys.getsizeof(data)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(weight(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(weight(v) for v in value.values())
+    if hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + sum(
+            weight(v) for v in vars(value).values()
+            if isinstance(v, (np.ndarray, list))
+        )
+    return sys.getsizeof(value)
+
+
+class QueryCache:
+    '''
+    A bounded least-recently-used cache of query results, safe to share
+    between threads.
+
+    Entries are evicted once the cache holds more than `maxsize` entries or
+    more than `max_bytes` of estimated result memory (see `weight`), and
+    expire after their time to live, if any.
+
+    Attributes:
+        evictions (int):
+            the number of entries evicted to respect `maxsize` or `max_bytes`
+        expirations (int):
+            the number of entries dropped after their time to live
+        hits (int):
+            the number of lookups answered from the cache
+        max_bytes (Optional[int]):
+            the maximum estimated memory in bytes of all cached results
+        maxsize (Optional[int]):
+            the maximum number of cached results
+        misses (int):
+            the number of lookups not answered from the cache
+        nbytes (int):
+            the estimated memory in bytes of all cached results
+        relative_ttl (float):
+            the time to live in seconds of results of queries relative to the
+            current time, such as `GTFS.today`
+        stats (dict[str, int]):
+            the counters and current size of the cache
+        ttl (Optional[float]):
+            the default time to live in seconds of each entry
+    '''
+
+    def __init__ (
+                self,
+                maxsize: Optional[int] = 1024,
+                max_bytes: Optional[int] = None,
+                ttl: Optional[float] = None,
+                relative_ttl: float = 60.0
+            ):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.relative_ttl = relative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.nbytes = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int, float]] = \
+            OrderedDict()
+        self._lock = threading.Lock()
+
+
+    ### PROPERTIES ###
+    @property
+    def stats (self) -> dict[str, int]:
+        '''the counters and current size of the cache'''
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'entries': len(self._entries),
+            'nbytes': self.nbytes
+        }
+
+
+    ### MAGIC METHODS ###
+    def __contains__ (self, key: Hashable) -> bool:
+        entry = self._entries.get(key, None)
+        return entry is not None and entry[2] > time.monotonic()
+
+    def __len__ (self) -> int:
+        return len(self._entries)
+
+
+    ### METHODS ###
+    def _drop (self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self.nbytes -= size
+
+    def clear (self):
+        '''
+        Removes every entry from the cache. Counters are kept.
+        '''
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def get (
+                self,
+                key: Hashable,
+                compute: Callable[[], Any],
+                ttl: Optional[float] = None
+            ) -> Any:
+        '''
+        Returns the cached result for `key`, calling `compute` to produce and
+        cache it if it is missing or expired.
+
+        Parameters:
+            key (Hashable):
+                the key of the query
+            compute (Callable[[], Any]):
+                a function returning the result of the query
+            ttl (Optional[float]):
+                the time to live in seconds of a new entry, overriding the
+                default `ttl`
+
+        Returns:
+            result (Any):
+                the result of the query
+        '''
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None:
+                if entry[2] > now:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return entry[0]
+                self._drop(key)
+                self.expirations += 1
+            self.misses += 1
+
+        value = compute()
+        ttl = self.ttl if ttl is None else ttl
+        size = weight(value)
+        if self.max_bytes is not None and size > self.max_bytes: return value
+        with self._lock:
+            if key in self._entries: self._drop(key)
+            self._entries[key] = (
+                value, size, float('inf') if ttl is None else now + ttl
+            )
+            self.nbytes += size
+            while (self.maxsize is not None and len(self) > self.maxsize) or \
+                    (self.max_bytes is not None and \
+                        self.nbytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+
+def memoized (relative: bool = False) -> Callable:
+    '''
+    Returns a decorator caching the results of a `GTFS` query method in the
+    `QueryCache` of the instance, if memoization is enabled on it.
+
+    Results are keyed by the tables the instance holds, the name of the method
+    and its normalized arguments, so replacing a table invalidates every
+    result derived from it.
+
+    Parameters:
+        relative (bool):
+            whether the method is relative to the current time, so its
+            results expire after `QueryCache.relative_ttl`
+
+    Returns:
+        decorator (Callable):
+            a decorator for `GTFS` query methods
+    '''
+    def decorator (method: Callable) -> Callable:
+        sig = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper (self, *args, **kwargs):
+            cache: Optional[QueryCache] = getattr(self, '_cache', None)
+            if cache is None: return method(self, *args, **kwargs)
+            bound = sig.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            values = list(bound.arguments.values())[1:]
+            zone = None
+            if any(isinstance(v, datetime) for v in values):
+                zone = self.timeline.zone
+            key = (
+                token(self.agencies),
+                token(self.feed),
+                token(self.routes),
+                token(self.schedules),
+                token(self.shapes),
+                token(self.stops),
+                token(self.transfers),
+                token(self.trips),
+                method.__name__,
+                tuple(normalize(v, zone) for v in values)
+            )
+            return cache.get(
+                key, 
+                lambda: method(self, *args, **kwargs), 
+                cache.relative_ttl if relative else None
+            )
+
+        return wrapper
+    return decorator
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import dataclasses
+from datetime import date, datetime
+from enum import Enum
+from sys import intern
+import typing
+from typing import Any, Callable, Optional, Union
+
+from marshmallow import missing
+
+from .records import RECORDS
+from .strings import StringTable
+
+
+_DECODERS: dict[tuple[type, bool], Callable[[dict], Any]] = {}
+_ENCODERS: dict[type, Callable[[Any], dict]] = {}
+
+
+class _Compact:
+    '''
+    The state shared by the decoders or encoders of one compact dataset: its
+    `StringTable`, the stored field order of every model and the functions
+    generated for it.
+    '''
+
+    def __init__ (
+                self,
+                strings: StringTable,
+                layouts: Optional[dict[str, list[str]]] = None
+            ):
+        self.strings = strings
+        self.layouts = layouts if layouts is not None else {}
+        self.decoders: dict[tuple[type, bool], Callable] = {}
+        self.encoders: dict[type, Callable] = {}
+
+
+def _unwrap (hint: Any) -> Any:
+    if typing.get_origin(hint) is Union:
+        args = [a for a in typing.get_args(hint) if a is not type(None)]
+        if len(args) == 1: return args[0]
+    return hint
+
+
+def _default (cls: type, name: str) -> Any:
+    field = cls.SCHEMA.fields.get(name, None)
+    default = getattr(field, 'load_default', getattr(field, 'missing', None))
+    if default is missing: return None
+    return default() if callable(default) else default
+
+
+def _format (cls: type, name: str) -> Optional[str]:
+    field = getattr(cls, 'SCHEMA', None) and cls.SCHEMA.fields.get(name, None)
+    fmt = getattr(field, 'format', None)
+    inner = getattr(field, 'inner', None)
+    fmt = fmt or getattr(inner, 'format', None)
+    return None if fmt in ('iso', 'iso8601') else fmt
+
+
+def _data_key (cls: type, name: str) -> str:
+    field = cls.SCHEMA.fields.get(name, None)
+    return getattr(field, 'data_key', None) or name
+
+
+def _load_str (ctx: Optional[_Compact]) -> Callable:
+    if ctx is None: return lambda v: v if v is None else intern(v)
+    table = ctx.strings.strings
+    return lambda v: None if v is None else table[v]
+
+
+def _load_key (ctx: Optional[_Compact]) -> Callable:
+    if ctx is None: return intern
+    table = ctx.strings.strings
+    return lambda k: table[int(k)]
+
+
+def _dump_str (ctx: Optional[_Compact]) -> Optional[Callable]:
+    if ctx is None: return None
+    id = ctx.strings.id
+    return lambda v: None if v is None else id(v)
+
+
+def _load_converter (
+            hint: Any,
+            fmt: Optional[str],
+            ctx: Optional[_Compact],
+            slots: bool
+        ) -> Optional[Callable]:
+    hint = _unwrap(hint)
+    origin = typing.get_origin(hint)
+    if origin is list:
+        (item,) = typing.get_args(hint)
+        conv = _load_converter(item, fmt, ctx, slots)
+        if conv is None: return None
+        return lambda v: None if v is None else [conv(x) for x in v]
+    if origin is dict:
+        key = _load_key(ctx)
+        conv = _load_converter(typing.get_args(hint)[1], fmt, ctx, slots) \
+            or (lambda x: x)
+        return lambda v: None if v is None \
+            else { key(k): conv(x) for k, x in v.items() }
+    if isinstance(hint, type):
+        if issubclass(hint, Enum):
+            return lambda v: None if v is None else hint(v)
+        if issubclass(hint, str):
+            return _load_str(ctx)
+        if issubclass(hint, datetime):
+            return lambda v: None if v is None else datetime.fromisoformat(v)
+        if issubclass(hint, date):
+            if fmt:
+                return lambda v: None if v is None \
+                    else datetime.strptime(v, fmt).date()
+            return lambda v: None if v is None else date.fromisoformat(v)
+        if hasattr(hint, 'SCHEMA'):
+            return lambda v: None if v is None \
+                else _decoder(hint, ctx, slots)(v)
+    return None
+
+
+def _dump_converter (
+            hint: Any,
+            fmt: Optional[str],
+            ctx: Optional[_Compact]
+        ) -> Optional[Callable]:
+    hint = _unwrap(hint)
+    origin = typing.get_origin(hint)
+    if origin is list:
+        (item,) = typing.get_args(hint)
+        conv = _dump_converter(item, fmt, ctx)
+        if conv is None: return lambda v: None if v is None else list(v)
+        return lambda v: None if v is None else [conv(x) for x in v]
+    if origin is dict:
+        key = _dump_str(ctx) or (lambda k: k)
+        conv = _dump_converter(typing.get_args(hint)[1], fmt, ctx) \
+            or (lambda x: x)
+        return lambda v: None if v is None \
+            else { key(k): conv(x) for k, x in v.items() }
+    if isinstance(hint, type):
+        if issubclass(hint, Enum):
+            return lambda v: None if v is None else v.value
+        if issubclass(hint, str):
+            return _dump_str(ctx)
+        if issubclass(hint, datetime):
+            return lambda v: None if v is None else v.isoformat()
+        if issubclass(hint, date):
+            if fmt: return lambda v: None if v is None else v.strftime(fmt)
+            return lambda v: None if v is None else v.isoformat()
+        if hasattr(hint, 'SCHEMA'):
+            return lambda v: None if v is None else _encoder(hint, ctx)(v)
+    return None
+
+
+def _compile (name: str, source: str, scope: dict[str, Any]) -> Callable:
+    exec(compile(source, f'<railroaded.codec {name}>', 'exec'), scope)
+    return scope[name]
+
+
+def _decoder (
+            cls: type,
+            ctx: Optional[_Compact],
+            slots: bool = False
+        ) -> Callable[[Any], Any]:
+    cache = _DECODERS if ctx is None else ctx.decoders
+    if (cls, slots) in cache: return cache[(cls, slots)]
+    hints = typing.get_type_hints(cls)
+    stored = {} if ctx is None else {
+        key: p for p, key in enumerate(ctx.layouts.get(cls.__name__, []))
+    }
+    scope: dict[str, Any] = {
+        'cls': RECORDS.get(cls, cls) if slots else cls
+    }
+    args: list[str] = []
+    for i, field in enumerate(dataclasses.fields(cls)):
+        key = _data_key(cls, field.name)
+        scope[f'd{i}'] = _default(cls, field.name)
+        if ctx is None: value = f'data.get({key!r}, d{i})'
+        elif key in stored: value = f'data[{stored[key]}]'
+        else:
+            args.append(f'd{i}')
+            continue
+        conv = _load_converter(
+            hints[field.name], _format(cls, field.name), ctx, slots
+        )
+        if conv is not None:
+            scope[f'c{i}'] = conv
+            value = f'c{i}({value})'
+        args.append(value)
+    source = 'def decode (data):\n    return cls(\n        ' + \
+        ',\n        '.join(args) + '\n    )\n'
+    cache[(cls, slots)] = _compile('decode', source, scope)
+    return cache[(cls, slots)]
+
+
+def _encoder (cls: type, ctx: Optional[_Compact]) -> Callable[[Any], Any]:
+    cache = _ENCODERS if ctx is None else ctx.encoders
+    if cls in cache: return cache[cls]
+    hints = typing.get_type_hints(getattr(cls, '_model', cls))
+    scope: dict[str, Any] = {}
+    keys: list[str] = []
+    items: list[str] = []
+    for i, field in enumerate(dataclasses.fields(cls)):
+        key = _data_key(cls, field.name)
+        value = f'obj.{field.name}'
+        conv = _dump_converter(
+            hints[field.name], _format(cls, field.name), ctx
+        )
+        if conv is not None:
+            scope[f'c{i}'] = conv
+            value = f'c{i}({value})'
+        keys.append(key)
+        items.append(value if ctx is not None else f'{key!r}: {value}')
+    if ctx is None:
+        body = '{\n        ' + ',\n        '.join(items) + '\n    }'
+    else:
+        ctx.layouts[getattr(cls, '_model', cls).__name__] = keys
+        body = '[\n        ' + ',\n        '.join(items) + '\n    ]'
+    source = f'def encode (obj):\n    return {body}\n'
+    cache[cls] = _compile('encode', source, scope)
+    return cache[cls]
+
+
+def decoder (cls: type, slots: bool = False) -> Callable[[dict], Any]:
+    '''
+    Returns a function building a `cls` record from its plain serialized
+    form, generated from the fields of `cls` and cached. Unlike
+    `cls.SCHEMA.load`, the function does not validate its input, so it must
+    only be used on data written by `railroaded`. Every string is interned.
+
+    Parameters:
+        cls (type):
+            the seared dataclass model to decode
+        slots (bool):
+            whether to build `StopTime` and `Trip` records as their
+            `__slots__` variants (see `records`)
+
+    Returns:
+        decode (Callable[[dict], Any]):
+            a function building a `cls` record from a `dict`
+    '''
+    return _decoder(cls, None, slots)
+
+
+def encoder (cls: type) -> Callable[[Any], dict]:
+    '''
+    Returns a function serializing a `cls` record to the same form as
+    `cls.SCHEMA.dump`, generated from the fields of `cls` and cached.
+
+    Parameters:
+        cls (type):
+            the seared dataclass model to encode
+
+    Returns:
+        encode (Callable[[Any], dict]):
+            a function serializing a `cls` record to a `dict`
+    '''
+    return _encoder(cls, None)
+
+
+def decode (cls: type, data: dict, slots: bool = False) -> Any:
+    '''
+    Returns a `cls` record built from its serialized form `data`, in either
+    the plain or the compact form, without validation (see `decoder`).
+
+    Parameters:
+        cls (type):
+            the seared dataclass model to decode
+        data (dict):
+            the serialized record
+        slots (bool):
+            whether to build `StopTime` and `Trip` records as their
+            `__slots__` variants
+
+    Returns:
+        record (Any):
+            the `cls` record
+    '''
+    if not is_compact(data): return _decoder(cls, None, slots)(data)
+    ctx = _Compact(StringTable(data['strings']), data['layouts'])
+    return _decoder(cls, ctx, slots)(data['data'])
+
+
+def decode_fields (
+            cls: type,
+            data: dict,
+            names: typing.Iterable[str],
+            slots: bool = False
+        ) -> dict[str, Any]:
+    '''
+    Returns only the fields `names` of a `cls` record, decoded from its
+    serialized form `data` in either form without validation (see
+    `decoder`). The other fields of `data` are never decoded.
+
+    Parameters:
+        cls (type):
+            the seared dataclass model of the record
+        data (dict):
+            the serialized record
+        names (Iterable[str]):
+            the names of the fields to decode
+        slots (bool):
+            whether to build `StopTime` and `Trip` records as their
+            `__slots__` variants
+
+    Returns:
+        fields (dict[str, Any]):
+            the decoded value of every field of `names`
+    '''
+    ctx = None
+    if is_compact(data):
+        ctx = _Compact(StringTable(data['strings']), data['layouts'])
+        stored = {
+            key: p for p, key in enumerate(ctx.layouts.get(cls.__name__, []))
+        }
+        data = data['data']
+    hints = typing.get_type_hints(cls)
+    fields: dict[str, Any] = {}
+    for name in names:
+        key = _data_key(cls, name)
+        if ctx is None and key in data: value = data[key]
+        elif ctx is not None and key in stored: value = data[stored[key]]
+        else:
+            fields[name] = _default(cls, name)
+            continue
+        conv = _load_converter(hints[name], _format(cls, name), ctx, slots)
+        fields[name] = value if conv is None else conv(value)
+    return fields
+
+
+def encode (obj: Any, compact: bool = False) -> dict:
+    '''
+    Returns the serialized form of the seared record `obj` (see `encoder`).
+
+    In compact form, every string is replaced by its `int` ID in a
+    `StringTable` and every record is stored as a `list` of its values. The
+    result holds the table under `strings`, the field order of every model
+    under `layouts` and the record under `data`.
+
+    Parameters:
+        obj (Any):
+            the record to serialize
+        compact (bool):
+            whether to serialize `obj` in compact form
+
+    Returns:
+        data (dict):
+            the serialized record
+    '''
+    if not compact: return _encoder(type(obj), None)(obj)
+    ctx = _Compact(StringTable())
+    data = _encoder(type(obj), ctx)(obj)
+    return {
+        'strings': ctx.strings.strings,
+        'layouts': ctx.layouts,
+        'data': data
+    }
+
+
+def is_compact (data: Any) -> bool:
+    '''
+    Returns a `bool` indicating if `data` was serialized in compact form (see
+    `encode`).
+
+    Parameters:
+        data (Any):
+            the serialized record
+
+    Returns:
+        compact (bool):
+            whether `data` is in compact form
+    '''
+    return isinstance(data, dict) and \
+        data.keys() == { 'strings', 'layouts', 'data' }
+
+
+def plain (cls: type, data: dict) -> dict:
+    '''
+    Returns the plain serialized form of a `cls` record serialized in either
+    form, as produced by `cls.SCHEMA.dump`.
+
+    Parameters:
+        cls (type):
+            the seared dataclass model of the record
+        data (dict):
+            the serialized record
+
+    Returns:
+        data (dict):
+            the record in plain serialized form
+    '''
+    return encode(decode(cls, data)) if is_compact(data) else data
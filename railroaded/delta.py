@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import copy
+import gzip
+import hashlib
+import json
+from typing import Any, Optional
+
+from .codec import decode, encode, is_compact, plain
+from .gtfs import GTFS
+from .models import Agency, Feed, Pattern, Route, Schedule, Shape, Stop, Trip
+from .tables import (
+    Agencies,
+    Routes,
+    Schedules,
+    Shapes,
+    Stops,
+    Transfers,
+    Trips
+)
+
+
+TABLES = {
+    'agencies': ('agencies', 'data', Agency),
+    'routes': ('routes', 'data', Route),
+    'schedules': ('schedules', 'data', Schedule),
+    'stops': ('stops', 'data', Stop),
+    'patterns': ('trips', 'patterns', Pattern),
+    'trips': ('trips', 'data', Trip),
+    'shapes': ('shapes', 'data', Shape)
+}
+'''
+the keyed record collections compared by `diff`, as the `GTFS` table, the
+attribute of the table holding the records and the record model
+'''
+
+
+def _digest (data: Any) -> str:
+    text = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _collections (data: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    collections = {}
+    for key, (table, attr, _) in TABLES.items():
+        collections[key] = ((data.get(table, None) or {}).get(attr, None)) \
+            or {}
+    return collections
+
+
+def _dumped (gtfs: GTFS) -> dict[str, Any]:
+    data: dict[str, Any] = {}
+    for key, (table, attr, model) in TABLES.items():
+        records = getattr(getattr(gtfs, table, None), attr, None) or {}
+        data.setdefault(table, {})[attr] = {
+            id: model.SCHEMA.dump(record) for id, record in records.items()
+        }
+    data['feed'] = None if gtfs.feed is None \
+        else Feed.SCHEMA.dump(gtfs.feed)
+    data['transfers'] = None if gtfs.transfers is None \
+        else Transfers.SCHEMA.dump(gtfs.transfers)
+    return data
+
+
+def digests (data: dict[str, Any]) -> dict[str, dict[str, str]]:
+    '''
+    Returns the content hash of every record of a serialized (mGTFS) dataset,
+    by collection and ID. The feed and the transfers are each hashed as a
+    single record.
+
+    Parameters:
+        data (dict[str, Any]):
+            the serialized dataset
+
+    Returns:
+        digests (dict[str, dict[str, str]]):
+            the content hash of every record by collection and ID
+    '''
+    out = {
+        key: { id: _digest(record) for id, record in records.items() }
+        for key, records in _collections(data).items()
+    }
+    out['feed'] = { '': _digest(data.get('feed', None)) }
+    out['transfers'] = { '': _digest(data.get('transfers', None)) }
+    return out
+
+
+def fingerprint (digests: dict[str, dict[str, str]]) -> str:
+    '''
+    Returns a single hash of a dataset from the content hashes of its records.
+
+    Parameters:
+        digests (dict[str, dict[str, str]]):
+            the content hash of every record (see `digests`)
+
+    Returns:
+        fingerprint (str):
+            the hash of the dataset
+    '''
+    return _digest(sorted(
+        (key, id, d)
+        for key, records in digests.items()
+        for id, d in records.items()
+    ))
+
+
+class Delta:
+    '''
+    The changes between two versions of a dataset: for every keyed record
+    collection, the serialized records that were added or changed and the
+    IDs of the records that were removed, plus the feed and transfers if they
+    changed.
+
+    Attributes:
+        base (str):
+            the fingerprint of the dataset the delta applies to
+        changes (dict[str, dict[str, Any]]):
+            the serialized records added or changed, by collection and ID
+        feed (Optional[dict[str, Any]]):
+            the serialized `Feed` of the new version, if it changed
+        removals (dict[str, list[str]]):
+            the IDs of the records removed, by collection
+        target (str):
+            the fingerprint of the dataset the delta produces
+        transfers (Optional[dict[str, Any]]):
+            the serialized `Transfers` table of the new version, if it changed
+    '''
+
+    def __init__ (
+                self,
+                base: str,
+                target: str,
+                changes: dict[str, dict[str, Any]],
+                removals: dict[str, list[str]],
+                feed: Optional[dict[str, Any]] = None,
+                transfers: Optional[dict[str, Any]] = None
+            ):
+        self.base = base
+        self.target = target
+        self.changes = changes
+        self.removals = removals
+        self.feed = feed
+        self.transfers = transfers
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def load (cls, path: str) -> Delta:
+        '''
+        Returns a `Delta` read from a `.json` file at `path`, which may be
+        gzipped if its name ends in `.gz`.
+
+        Parameters:
+            path (str):
+                the path of the delta file
+
+        Returns:
+            delta (Delta):
+                the `Delta` read from `path`
+        '''
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt') as file:
+            data = json.load(file)
+        return Delta(
+            data['base'],
+            data['target'],
+            data['changes'],
+            data['removals'],
+            data.get('feed', None),
+            data.get('transfers', None)
+        )
+
+    @classmethod
+    def save (cls, delta: Delta, path: str):
+        '''
+        Writes a `Delta` to a `.json` file at `path`, gzipped if its name ends
+        in `.gz`.
+
+        Parameters:
+            delta (Delta):
+                the `Delta` to write
+            path (str):
+                the path of the delta file
+        '''
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'wt') as file:
+            json.dump({
+                'base': delta.base,
+                'target': delta.target,
+                'changes': delta.changes,
+                'removals': delta.removals,
+                'feed': delta.feed,
+                'transfers': delta.transfers
+            }, file, separators=(',', ':'))
+
+
+    ### MAGIC METHODS ###
+    def __len__ (self) -> int:
+        return sum(len(c) for c in self.changes.values()) + \
+            sum(len(r) for r in self.removals.values()) + \
+            (self.feed is not None) + (self.transfers is not None)
+
+
+def diff (old: GTFS, new: GTFS) -> Delta:
+    '''
+    Returns the `Delta` turning `old` into `new`, found by comparing the
+    content hash of every record.
+
+    Parameters:
+        old (GTFS):
+            the current version of the dataset
+        new (GTFS):
+            the new version of the dataset
+
+    Returns:
+        delta (Delta):
+            the changes from `old` to `new`
+    '''
+    old_data, new_data = _dumped(old), _dumped(new)
+    old_digests, new_digests = digests(old_data), digests(new_data)
+    records = _collections(new_data)
+
+    changes: dict[str, dict[str, Any]] = {}
+    removals: dict[str, list[str]] = {}
+    for key in TABLES:
+        before, after = old_digests[key], new_digests[key]
+        changed = {
+            id: records[key][id]
+            for id, d in after.items()
+            if before.get(id, None) != d
+        }
+        removed = [id for id in before if id not in after]
+        if changed: changes[key] = changed
+        if removed: removals[key] = removed
+
+    return Delta(
+        fingerprint(old_digests),
+        fingerprint(new_digests),
+        changes,
+        removals,
+        new_data['feed'] if old_digests['feed'] != new_digests['feed']
+            else None,
+        new_data['transfers']
+            if old_digests['transfers'] != new_digests['transfers'] else None
+    )
+
+
+def patch (gtfs: GTFS, delta: Delta, verify: bool = True) -> GTFS:
+    '''
+    Returns a new `GTFS` dataset with `delta` applied to `gtfs`, which is left
+    unchanged. Unchanged records are shared between the two, and if the
+    `StopTimeIndex` of `gtfs` was built, it is updated with only the added,
+    changed and removed trips.
+
+    Parameters:
+        gtfs (GTFS):
+            the dataset to apply `delta` to
+        delta (Delta):
+            the changes to apply
+        verify (bool):
+            whether to check that `gtfs` is the version `delta` applies to,
+            raising a `ValueError` otherwise
+
+    Returns:
+        gtfs (GTFS):
+            the patched dataset
+    '''
+    if verify and fingerprint(digests(_dumped(gtfs))) != delta.base:
+        raise ValueError(f'delta does not apply to {gtfs.name}')
+
+    tables: dict[str, dict[str, Any]] = {}
+    for key, (table, attr, model) in TABLES.items():
+        records = dict(getattr(getattr(gtfs, table, None), attr, None) or {})
+        for id in delta.removals.get(key, []): records.pop(id, None)
+        for id, record in delta.changes.get(key, {}).items():
+            records[id] = model.SCHEMA.load(record)
+        tables[key] = records
+
+    trips = tables['trips']
+    touched = set(delta.changes.get('trips', {})) | \
+        set(delta.removals.get('trips', []))
+    patterns = set(delta.changes.get('patterns', {}))
+    shapes = set(delta.changes.get('shapes', {}))
+    for id, trip in trips.items():
+        if id in touched: continue
+        if trip.pattern_id in patterns or trip.shape_id in shapes:
+            trips[id] = copy.copy(trip)
+            touched.add(id)
+
+    g = GTFS(
+        gtfs.name,
+        gtfs.feed if delta.feed is None else Feed.SCHEMA.load(delta.feed),
+        Agencies(tables['agencies']),
+        Routes(tables['routes']),
+        Schedules(tables['schedules']),
+        Stops(tables['stops']),
+        Trips(trips, tables['patterns']),
+        Shapes(tables['shapes']),
+        gtfs.transfers if delta.transfers is None
+            else Transfers.SCHEMA.load(delta.transfers),
+        gtfs.profile
+    )
+    g.trips.bind(g.shapes)
+
+    index = getattr(gtfs, '_index', None)
+    if index is not None:
+        g._index = index.update(touched, g.trips._ref({
+            id: trips[id] for id in touched if id in trips
+        }))
+    if gtfs.cache is not None:
+        cache = gtfs.cache
+        g.memoize(
+            cache.maxsize, cache.max_bytes, cache.ttl, cache.relative_ttl
+        )
+    return g
+
+
+def patch_mgtfs (
+            mgtfs_path: str,
+            delta: Delta,
+            out_path: Optional[str] = None,
+            verify: bool = True
+        ):
+    '''
+    Applies `delta` to the mGTFS dataset at `mgtfs_path` directly, without
+    deserializing its records, and writes the result to `out_path` (by
+    default, back to `mgtfs_path`). A compact dataset is expanded to apply
+    `delta` and written back in compact form.
+
+    Parameters:
+        mgtfs_path (str):
+            the path of the mGTFS dataset to apply `delta` to
+        delta (Delta):
+            the changes to apply
+        out_path (Optional[str]):
+            the path to write the patched mGTFS dataset to
+        verify (bool):
+            whether to check that the dataset is the version `delta` applies
+            to, raising a `ValueError` otherwise
+    '''
+    with open(mgtfs_path, 'r') as file:
+        data = json.load(file)
+    packed = is_compact(data)
+    data = plain(GTFS, data)
+    if verify and fingerprint(digests(data)) != delta.base:
+        raise ValueError(f'delta does not apply to {mgtfs_path}')
+
+    for key, (table, attr, _) in TABLES.items():
+        if key not in delta.changes and key not in delta.removals: continue
+        container = data.setdefault(table, None) or {}
+        data[table] = container
+        records = container.get(attr, None) or {}
+        container[attr] = records
+        for id in delta.removals.get(key, []): records.pop(id, None)
+        records.update(delta.changes.get(key, {}))
+    if delta.feed is not None: data['feed'] = delta.feed
+    if delta.transfers is not None: data['transfers'] = delta.transfers
+    if packed: data = encode(decode(GTFS, data), compact=True)
+
+    with open(out_path or mgtfs_path, 'w') as file:
+        json.dump(data, file)
@@ -0,0 +1,56 @@
+import os
+import shutil
+from typing import Optional
+import zipfile
+
+
+CHUNK = 1 << 20
+'''the number of bytes read at a time when streaming a download'''
+
+
+def download (uri: str, path: str, timeout: Optional[float] = None):
+    '''
+    Streams the resource at `uri` to a file at `path`.
+
+    Parameters:
+        uri (str):
+            the URI of the resource
+        path (str):
+            the path of the file to write
+        timeout (Optional[float]):
+            the timeout in seconds for connecting and for each read
+    '''
+    from urllib import request
+
+    with request.urlopen(uri, timeout=timeout) as response, \
+            open(path, 'wb') as file:
+        shutil.copyfileobj(response, file, CHUNK)
+
+
+def extract (zip_path: str, scratch: str, sub: Optional[str] = None) -> str:
+    '''
+    Extracts a zipped GTFS dataset into the directory `scratch`, and returns
+    the path of the extracted dataset.
+
+    Parameters:
+        zip_path (str):
+            the path of the `.zip` file
+        scratch (str):
+            the directory to extract into, which only this dataset uses
+        sub (Optional[str]):
+            the name (without extension) of a nested `.zip` file holding the
+            dataset
+
+    Returns:
+        path (str):
+            the path of the extracted GTFS dataset
+    '''
+    outer = os.path.join(scratch, 'outer')
+    with zipfile.ZipFile(zip_path) as zip:
+        zip.extractall(outer)
+    if not sub: return outer
+    inner = os.path.join(scratch, 'inner')
+    with zipfile.ZipFile(os.path.join(outer, f'{sub}.zip')) as zip:
+        zip.extractall(inner)
+    shutil.rmtree(outer)
+    return inner
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import sys
+import types
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from .models import Pattern, Shape, StopTime, Timetable
+from .records import RECORDS
+from .tables import Schedules, Unloaded
+
+
+_ATOMS = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType
+)
+
+
+def _slots (cls: type) -> tuple[str, ...]:
+    names: list[str] = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get('__slots__', ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return tuple(n for n in names if n not in ('__dict__', '__weakref__'))
+
+
+def deep_sizeof (
+            obj: Any,
+            seen: Optional[set[int]] = None,
+            prune: tuple[type, ...] = ()
+        ) -> int:
+    '''
+    Returns the memory in bytes held by `obj` and every object it refers to,
+    counting each object once.
+
+    Parameters:
+        obj (Any):
+            the object to measure
+        seen (Optional[set[int]]):
+            the `id` of every object already counted, updated with the objects
+            counted here, so objects shared between several calls are only
+            counted by the first
+        prune (tuple[type, ...]):
+            the types of the objects not to count or descend into, unless
+            `obj` is one
+
+    Returns:
+        nbytes (int):
+            the memory in bytes held by `obj`
+    '''
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _ATOMS): continue
+        if o is not obj and prune and isinstance(o, prune): continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, (str, bytes, int, float, bool)) or o is None:
+            continue
+        if isinstance(o, np.ndarray):
+            if o.base is not None: stack.append(o.base)
+            if o.dtype == object: stack.extend(o.ravel())
+        elif isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        else:
+            d = getattr(o, '__dict__', None)
+            if d is not None: stack.append(d)
+            for name in _slots(type(o)):
+                if hasattr(o, name): stack.append(getattr(o, name))
+    return size
+
+
+def _pruned (*classes: type) -> tuple[type, ...]:
+    return classes + tuple(RECORDS[c] for c in classes if c in RECORDS)
+
+
+class Usage:
+    '''
+    The memory used by one part of a loaded dataset.
+
+    Attributes:
+        name (str):
+            the name of the part, such as `trips` or `index`
+        count (int):
+            the number of records it holds
+        nbytes (int):
+            the estimated memory in bytes it holds
+        per_record (Optional[float]):
+            the estimated memory in bytes per record
+    '''
+
+    def __init__ (self, name: str, count: int, nbytes: int):
+        self.name = name
+        self.count = count
+        self.nbytes = nbytes
+
+
+    ### PROPERTIES ###
+    @property
+    def per_record (self) -> Optional[float]:
+        '''the estimated memory in bytes per record'''
+        return self.nbytes / self.count if self.count else None
+
+
+    ### MAGIC METHODS ###
+    def __repr__ (self) -> str:
+        return f'Usage({self.name!r}, {self.count}, {self.nbytes})'
+
+
+    ### METHODS ###
+    def as_dict (self) -> dict[str, Any]:
+        '''
+        Returns the memory used as a `dict`.
+
+        Returns:
+            usage (dict[str, Any]):
+                the count, bytes and bytes per record of the part
+        '''
+        return {
+            'count': self.count,
+            'nbytes': self.nbytes,
+            'per_record': self.per_record
+        }
+
+
+class MemoryReport:
+    '''
+    The memory used by a loaded `GTFS` dataset, broken down by table and by
+    structure. Objects shared between parts (such as interned IDs) are
+    counted in the first part that refers to them.
+
+    Attributes:
+        usages (list[Usage]):
+            the `Usage` of every part of the dataset
+        total (int):
+            the estimated memory in bytes of the whole dataset
+    '''
+
+    def __init__ (self, usages: list[Usage]):
+        self.usages = usages
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def from_gtfs (
+                cls,
+                gtfs: Any,
+                sample: Optional[int] = 1000
+            ) -> MemoryReport:
+        '''
+        Returns the `MemoryReport` of `gtfs`.
+
+        Parameters:
+            gtfs (GTFS):
+                the dataset to measure
+            sample (Optional[int]):
+                the number of records measured in every part, whose sizes are
+                scaled up to the whole part, or `None` to measure every record
+
+        Returns:
+            report (MemoryReport):
+                the `MemoryReport` of `gtfs`
+        '''
+        seen: set[int] = set()
+
+        def usage (
+                    name: str,
+                    container: Any,
+                    records: list[Any],
+                    prune: tuple[type, ...] = ()
+                ) -> Usage:
+            nbytes = 0
+            if container is not None:
+                seen.add(id(container))
+                nbytes += sys.getsizeof(container)
+            n = len(records)
+            if sample is None or n <= sample:
+                nbytes += sum(deep_sizeof(r, seen, prune) for r in records)
+            else:
+                step = n / sample
+                measured = sum(
+                    deep_sizeof(records[int(i * step)], seen, prune)
+                    for i in range(sample)
+                )
+                nbytes += round(measured * n / sample)
+            return Usage(name, n, nbytes)
+
+        def data (table: Any) -> Any:
+            return table.data if Unloaded.loaded(table) else None
+
+        def values (table: Any) -> list[Any]:
+            d = data(table)
+            if d is None: return []
+            return list(d.values()) if isinstance(d, dict) else d
+
+        trips = values(gtfs.trips)
+        pattern_data = gtfs.trips.patterns \
+            if Unloaded.loaded(gtfs.trips) else None
+        patterns = list((pattern_data or {}).values())
+        timetables = [
+            t._timetable for t in trips if t._timetable is not None
+        ]
+        stop_times = [st for p in patterns for st in p.stops]
+        for t in timetables: stop_times.extend(t.data.values())
+
+        feed = gtfs.feed if Unloaded.loaded(gtfs.feed) else None
+        usages = [
+            Usage(
+                'feed',
+                0 if feed is None else 1,
+                0 if feed is None else deep_sizeof(feed, seen)
+            ),
+            *(
+                usage(name, data(table), values(table))
+                for name, table in (
+                    ('agencies', gtfs.agencies),
+                    ('routes', gtfs.routes),
+                    ('schedules', gtfs.schedules),
+                    ('stops', gtfs.stops)
+                )
+            ),
+            usage(
+                'trips',
+                data(gtfs.trips),
+                trips,
+                _pruned(Pattern, Shape, Timetable)
+            ),
+            usage('patterns', pattern_data, patterns, _pruned(StopTime)),
+            usage('timetables', None, timetables, _pruned(StopTime)),
+            usage('stop_times', None, stop_times),
+            usage('shapes', data(gtfs.shapes), values(gtfs.shapes)),
+            usage('transfers', data(gtfs.transfers), values(gtfs.transfers))
+        ]
+
+        index = getattr(gtfs, '_index', None)
+        nbytes = 0 if index is None else deep_sizeof(index, seen)
+        for name in ('_coord_arrays', '_timeline'):
+            value = getattr(gtfs, name, None)
+            if value is not None:
+                nbytes += deep_sizeof(value, seen, (Schedules,))
+        usages.append(Usage(
+            'index',
+            0 if index is None else len(index.stops),
+            nbytes
+        ))
+
+        cache = gtfs.cache
+        usages.append(Usage(
+            'cache',
+            0 if cache is None else len(cache),
+            0 if cache is None else cache.nbytes
+        ))
+        return MemoryReport(usages)
+
+
+    ### PROPERTIES ###
+    @property
+    def total (self) -> int:
+        '''the estimated memory in bytes of the whole dataset'''
+        return sum(u.nbytes for u in self.usages)
+
+
+    ### MAGIC METHODS ###
+    def __getitem__ (self, name: str) -> Usage:
+        for u in self.usages:
+            if u.name == name: return u
+        raise KeyError(name)
+
+    def __iter__ (self) -> Iterator[Usage]:
+        return iter(self.usages)
+
+    def __str__ (self) -> str:
+        lines = [f'{"part":<12} {"count":>10} {"MiB":>10} {"B/record":>10}']
+        for u in self.usages:
+            per = '' if u.per_record is None else f'{u.per_record:.1f}'
+            lines.append(
+                f'{u.name:<12} {u.count:>10} {u.nbytes / 2 ** 20:>10.2f} '
+                f'{per:>10}'
+            )
+        lines.append(f'{"total":<12} {"":>10} {self.total / 2 ** 20:>10.2f}')
+        return '\n'.join(lines)
+
+
+    ### METHODS ###
+    def as_dict (self) -> dict[str, dict[str, Any]]:
+        '''
+        Returns the report as a `dict`, for export as metrics.
+
+        Returns:
+            report (dict[str, dict[str, Any]]):
+                the count, bytes and bytes per record of every part, and the
+                total bytes under `total`
+        '''
+        report = { u.name: u.as_dict() for u in self.usages }
+        report['total'] = { 'nbytes': self.total }
+        return report
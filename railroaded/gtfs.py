@@ -1,26 +1,97 @@
 from __future__ import annotations
 
-from datetime import date as pydate
+from datetime import date as pydate, datetime, time, timedelta
 import json
 import os
-import shutil
-from typing import Optional
-from urllib import request
-import zipfile
+import tempfile
+from typing import Any, Callable, Optional, Union
 
+import numpy as np
 import seared as s
 
-from .models import Feed
+from .cache import QueryCache, memoized
+from .codec import decode, decode_fields, encode, plain
+from .fetch import download, extract
+from .footprint import MemoryReport
+from .index import Connections, StopTimeIndex, expand
+from .matrix import arrival_matrix
+from .models import Feed, Trip
+from .positions import Positions, estimate
+from .profiles import Profile, resolve
+from .stats import counted
+from .subset import Subset
 from .tables import (
     Agencies,
     Routes,
     Schedules,
+    Shapes,
     Stops,
-    Trips
+    Transfers,
+    Trips,
+    Unloaded
 )
+from .timeline import Timeline
+from .timing import stage
+from .util import time_secs
+from .validation import InvalidFeedError, ValidationReport
 
 
-TMP = os.path.join(os.path.realpath(os.path.dirname(__file__)), 'tmp')
+TABLES: dict[str, type] = {
+    'feed': Feed,
+    'agencies': Agencies,
+    'routes': Routes,
+    'schedules': Schedules,
+    'stops': Stops,
+    'trips': Trips,
+    'shapes': Shapes,
+    'transfers': Transfers
+}
+'''the class of every table of a `GTFS` dataset, in the order they are read'''
+
+
+def _prefilter (
+            subset: Subset,
+            loaded: dict[str, Any]
+        ) -> tuple[Callable[[Trip], bool], Optional[set[str]]]:
+    routes = {
+        id for id, r in loaded['routes'].data.items() if subset.keeps(r)
+    }
+    services = {
+        id for id, s in loaded['schedules'].data.items() if subset.runs(s)
+    }
+    area = None
+    if subset.area:
+        area = {
+            id for id, s in loaded['stops'].data.items() if subset.covers(s)
+        }
+    return (
+        lambda t: t.route_id in routes and t.service_id in services,
+        area
+    )
+
+
+def _stop_times (gtfs: GTFS) -> int:
+    return len(gtfs.index.stops)
+
+
+def _tables (
+            tables: Optional[set[str]],
+            subset: Optional[Subset] = None
+        ) -> set[str]:
+    if tables is None: return set(TABLES)
+    if subset is not None:
+        raise ValueError('a subset can only be taken when reading every table')
+    unknown = set(tables) - set(TABLES)
+    if unknown:
+        raise ValueError(
+            f'unknown tables {sorted(unknown)}, expected some of '
+            f'{list(TABLES)}'
+        )
+    return set(tables)
+
+
+def _trips (gtfs: GTFS) -> int:
+    return len(gtfs.trips.data)
 
 
 @s.seared
@@ -43,6 +114,21 @@ class GTFS(s.Seared):
             a `Stops` table mapping `str` IDs to `Stop` records
         trips (Trips):
             a `Trips` table mapping `str` IDs to `Trip` records
+        shapes (Optional[Shapes]):
+            a `Shapes` table mapping `str` IDs to `Shape` records
+        transfers (Optional[Transfers]):
+            a `Transfers` table of `Transfer` records
+        profile (str):
+            the name of the `Profile` of columns the GTFS dataset was read
+            with
+        index (StopTimeIndex):
+            an array-based `StopTimeIndex` of every `StopTime` in `trips`
+        timeline (Timeline):
+            a `Timeline` converting service days to instants in the agency
+            timezone
+
+    Tables left out of the `tables` read are `Unloaded`, and raise a
+    `TableNotLoadedError` when used.
     '''
 
     ### ATTRIBUTES ###
@@ -63,9 +149,105 @@ class GTFS(s.Seared):
     '''a `Stops` table mapping `str` IDs to `Stop` records'''
     trips: Trips = s.T(schema=Trips.SCHEMA)
     '''a `Trips` table mapping `str` IDs to `Trip` records'''
+    shapes: Optional[Shapes] = s.T(schema=Shapes.SCHEMA)
+    '''a `Shapes` table mapping `str` IDs to `Shape` records'''
+    transfers: Optional[Transfers] = s.T(schema=Transfers.SCHEMA)
+    '''a `Transfers` table of `Transfer` records'''
+
+    # Ingest
+    profile: str = s.Str(missing='full')
+    '''the name of the `Profile` of columns the GTFS dataset was read with'''
 
 
     ### CLASS METHODS ###
+    @classmethod
+    def from_gtfs (
+                cls,
+                name: str,
+                path: str,
+                shape_tolerance: Optional[float] = None,
+                slots: bool = False,
+                tables: Optional[set[str]] = None,
+                subset: Optional[Subset] = None,
+                profile: Union[str, Profile, None] = None,
+                check: bool = False
+            ) -> GTFS:
+        '''
+        Returns a `GTFS` object populated from the unzipped GTFS dataset at
+        `path`. Only the files of `tables` are read; the other tables are
+        `Unloaded`.
+
+        With `subset`, trips are pruned as `trips.txt` is read, so the stop
+        times of dropped trips are never deserialized, and the dataset is then
+        reduced to the `subset` (see `GTFS.subset`).
+
+        With `profile`, only the columns it selects are read from each file
+        (see `Profile`), and its name is recorded in `GTFS.profile`.
+
+        With `check`, the dataset is validated before any table is read (see
+        `ValidationReport`), and an `InvalidFeedError` carrying the report is
+        raised if it fails a check with severity `'error'`.
+
+        Parameters:
+            name (str):
+                the name of the GTFS dataset
+            path (str):
+                the path to the GTFS dataset
+            shape_tolerance (Optional[float]):
+                the Douglas-Peucker tolerance in meters to simplify shapes
+                with, or `None` to keep every shape point
+            slots (bool):
+                whether to store `Trip` and `StopTime` records as their
+                compact `__slots__` variants
+            tables (Optional[set[str]]):
+                the names of the tables to read (see `TABLES`), or `None` to
+                read every table
+            subset (Optional[Subset]):
+                the part of the dataset to keep, or `None` to keep all of it
+            profile (Union[str, Profile, None]):
+                the `Profile` or the name of the built-in `Profile` selecting
+                the columns to read, or `None` to read every column
+            check (bool):
+                whether to validate the dataset before reading it
+
+        Returns:
+            gtfs (GTFS):
+                a `GTFS` object populated from the GTFS dataset at `path`
+        '''
+        wanted = _tables(tables, subset)
+        columns = resolve(profile)
+        with stage('from_gtfs', path):
+            if check:
+                with stage('from_gtfs.check', path) as info:
+                    report = ValidationReport.from_gtfs(path)
+                    info['rows'] = sum(f.count for f in report)
+                if not report.ok: raise InvalidFeedError(report)
+            loaded: dict[str, Any] = {}
+            for key, table in TABLES.items():
+                if key not in wanted:
+                    loaded[key] = Unloaded(key)
+                    continue
+                kwargs: dict[str, Any] = { 'profile': columns }
+                if table is Shapes: kwargs = { 'tolerance': shape_tolerance }
+                if table is Trips and subset is not None:
+                    kwargs['where'], kwargs['stop_ids'] = \
+                        _prefilter(subset, loaded)
+                with stage(f'{table.__name__}.from_gtfs') as info:
+                    loaded[key] = table.from_gtfs(path, **kwargs)
+                    data = getattr(loaded[key], 'data', None)
+                    if data is not None: info['rows'] = len(data)
+            g = GTFS(name=name, profile=columns.name, **loaded)
+            if 'trips' in wanted:
+                if { 'shapes', 'stops' } <= wanted:
+                    with stage('from_gtfs.project'):
+                        g.trips.project(g.shapes, g.stops)
+                g.trips.bind(g.shapes if 'shapes' in wanted else None)
+                if slots:
+                    with stage('from_gtfs.slot'): g.trips.slot()
+            if subset is not None:
+                with stage('from_gtfs.subset'): g = g.subset(subset)
+        return g
+
     @classmethod
     def read (
                 cls,
@@ -73,7 +255,14 @@ class GTFS(s.Seared):
                 gtfs_path: Optional[str] = None,
                 gtfs_sub: Optional[str] = None,
                 gtfs_uri: Optional[str] = None,
-                mgtfs_path: Optional[str] = None
+                mgtfs_path: Optional[str] = None,
+                shape_tolerance: Optional[float] = None,
+                validate: bool = False,
+                slots: bool = False,
+                tables: Optional[set[str]] = None,
+                subset: Optional[Subset] = None,
+                profile: Union[str, Profile, None] = None,
+                check: bool = False
             ) -> GTFS:
         '''
         Returns a `GTFS` object containing minified GTFS data read from local
@@ -91,6 +280,37 @@ class GTFS(s.Seared):
         method, the newly parsed mGTFS will be written to `mgtfs_path` to 
         improve performance on subsequent reads.
 
+        mGTFS datasets are decoded with functions generated from the models,
+        which skip schema validation; pass `validate` to load a mGTFS dataset
+        that was not written by `railroaded` through the full schema instead.
+        Either way, every ID and repeated string is interned, so records share
+        one instance of each.
+
+        With `slots`, `Trip` and `StopTime` records are stored as `__slots__`
+        variants built from the same fields, which behave and serialize like
+        the models but need much less memory per record.
+
+        With `tables`, only the named tables are read from GTFS files or
+        decoded from the mGTFS dataset, and the others are `Unloaded`; the
+        sections of the mGTFS file holding them are parsed as JSON but never
+        decoded into records. A mGTFS dataset is only written to `mgtfs_path`
+        if every table was read.
+
+        With `subset`, the dataset is reduced to a `Subset` of its trips and
+        the records they refer to (see `GTFS.subset`). When reading GTFS
+        files, trips are pruned as they are read, so the stop times of
+        dropped trips are never deserialized, and the reduced dataset is what
+        is written to `mgtfs_path`.
+
+        With `profile`, only the columns it selects are read from GTFS files
+        (see `Profile`). Each mGTFS dataset records the profile it was built
+        with, and one built with a different profile than `profile` is read
+        again from the GTFS dataset if one is given, and rejected otherwise.
+
+        Shapes are stored as compact delta-encoded coordinates, optionally
+        simplified to `shape_tolerance`, and stops are projected onto them to
+        fill in `StopTime.dist_traveled` where the dataset leaves it out.
+
         Parameters:
             name (str):
                 the name of the GTFS dataset
@@ -102,85 +322,278 @@ class GTFS(s.Seared):
                 the URI to use when fetching a remote GTFS dataset
             mgtfs_path (Optional[str]):
                 the path to a local mGTFS dataset
+            shape_tolerance (Optional[float]):
+                the Douglas-Peucker tolerance in meters to simplify shapes
+                with, or `None` to keep every shape point
+            validate (bool):
+                whether to validate a mGTFS dataset against the schema while
+                loading it
+            slots (bool):
+                whether to store `Trip` and `StopTime` records as their
+                compact `__slots__` variants
+            tables (Optional[set[str]]):
+                the names of the tables to load (see `TABLES`), or `None` to
+                load every table
+            subset (Optional[Subset]):
+                the part of the dataset to keep, or `None` to keep all of it
+            profile (Union[str, Profile, None]):
+                the `Profile` or the name of the built-in `Profile` selecting
+                the columns to read, or `None` to read every column of GTFS
+                files and to accept a mGTFS dataset built with any profile
+            check (bool):
+                whether to validate GTFS files before reading them, raising
+                an `InvalidFeedError` if they fail a check with severity
+                `'error'` (see `ValidationReport`)
         
         Returns:
             gtfs (GTFS):
                 a `GTFS` object containing the minified GTFS dataset
         '''
-        if mgtfs_path and os.path.exists(mgtfs_path):
-            data = {}
-            with open(mgtfs_path, 'r') as file:
-                data = json.load(file)
-            return GTFS.SCHEMA.load(data)
-        
-        if not gtfs_path:
-            if os.path.exists(TMP): shutil.rmtree(TMP)
-            os.mkdir(TMP)
-            zip_path = os.path.join(TMP, f'{name}.zip')
-            request.urlretrieve(gtfs_uri, zip_path)
-            with zipfile.ZipFile(zip_path) as zip:
-                zip.extractall(TMP)
-            os.remove(zip_path)
-            if gtfs_sub:
-                zip_name = f'{gtfs_sub}.zip'
-                zip_path = os.path.join(TMP, zip_name)
-                for entry in os.scandir(TMP):
-                    if entry.name != zip_name:
-                        os.remove(entry.path)            
-                with zipfile.ZipFile(zip_path) as zip:
-                    zip.extractall(TMP)
-                os.remove(zip_path)
-            path = TMP
-        else:
-            path = gtfs_path
+        wanted = _tables(tables, subset)
+        with stage('read'):
+            data = None
+            if mgtfs_path and os.path.exists(mgtfs_path):
+                with stage('read.json', mgtfs_path):
+                    with open(mgtfs_path, 'r') as file:
+                        data = json.load(file)
+                built = decode_fields(GTFS, data, ['profile'])['profile']
+                if profile is not None and built != resolve(profile).name:
+                    if not (gtfs_path or gtfs_uri):
+                        raise ValueError(
+                            f'the mGTFS dataset at {mgtfs_path} was built '
+                            f'with the {built!r} profile, not '
+                            f'{resolve(profile).name!r}'
+                        )
+                    data = None
+            if data is not None:
+                with stage('read.decode') as info:
+                    if tables is None and validate:
+                        g: GTFS = GTFS.SCHEMA.load(plain(GTFS, data))
+                    elif tables is None:
+                        g = decode(GTFS, data, slots)
+                    elif validate:
+                        data = plain(GTFS, data)
+                        g = GTFS(
+                            name=data['name'],
+                            profile=data.get('profile', 'full'),
+                            **{
+                                key: Unloaded(key) if key not in wanted
+                                    else None if data.get(key, None) is None
+                                    else table.SCHEMA.load(data[key])
+                                for key, table in TABLES.items()
+                            }
+                        )
+                    else:
+                        fields = decode_fields(
+                            GTFS,
+                            data,
+                            ['name', 'profile', *sorted(wanted)],
+                            slots
+                        )
+                        g = GTFS(**fields, **{
+                            key: Unloaded(key)
+                            for key in TABLES if key not in wanted
+                        })
+                    if 'trips' in wanted:
+                        if validate and slots: g.trips.slot()
+                        info['rows'] = len(g.trips.data)
+                if 'trips' in wanted:
+                    with stage('read.bind'):
+                        g.trips.bind(
+                            g.shapes if 'shapes' in wanted else None
+                        )
+                if subset is not None:
+                    with stage('read.subset'): g = g.subset(subset)
+                return g
+            
+            if gtfs_path:
+                g = GTFS.from_gtfs(
+                    name, gtfs_path, shape_tolerance, slots, tables, subset,
+                    profile, check
+                )
+            else:
+                with tempfile.TemporaryDirectory(
+                            prefix='railroaded-'
+                        ) as scratch:
+                    zip_path = os.path.join(scratch, f'{name}.zip')
+                    with stage('read.download', zip_path):
+                        download(gtfs_uri, zip_path)
+                    with stage('read.extract', zip_path):
+                        path = extract(zip_path, scratch, gtfs_sub)
+                    g = GTFS.from_gtfs(
+                        name, path, shape_tolerance, slots, tables, subset,
+                        profile, check
+                    )
 
-        g = GTFS(
-            name=name, 
-            feed=Feed.from_gtfs(path),
-            agencies=Agencies.from_gtfs(path), 
-            routes=Routes.from_gtfs(path), 
-            schedules=Schedules.from_gtfs(path),
-            stops=Stops.from_gtfs(path),
-            trips=Trips.from_gtfs(path)
-        )
-
-        if not gtfs_path: shutil.rmtree(TMP)
-        if mgtfs_path: GTFS.save(g, mgtfs_path)
+            if mgtfs_path and wanted == set(TABLES): GTFS.save(g, mgtfs_path)
 
         return g
 
 
     @classmethod
-    def save (cls, gtfs: GTFS, mgtfs_path: str):
+    def save (cls, gtfs: GTFS, mgtfs_path: str, compact: bool = False):
         '''
-        Writes a `GTFS` object to a `.json` file at `mgtfs_path`.
+        Writes a `GTFS` object to a `.json` file at `mgtfs_path`, serialized
+        with functions generated from the models rather than through the
+        schema.
+
+        In compact form, every ID and string is written once to a dataset-wide
+        string table and referenced everywhere else by its `int` ID, which
+        makes the file much smaller. `read` accepts either form.
 
         Parameters:
             gtfs (GTFS):
                 the `GTFS` to dump to file
             mgtfs_path (str):
                 the `.json` file to dump the `GTFS` object to
+            compact (bool):
+                whether to write the compact form
+        '''
+        with stage('save', mgtfs_path):
+            with stage('save.encode') as info:
+                data = encode(gtfs, compact)
+                info['rows'] = len(gtfs.trips.data)
+            with stage('save.json', mgtfs_path):
+                with open(mgtfs_path, 'w') as file:
+                    json.dump(data, file)
+
+
+    ### PROPERTIES ###
+    @property
+    def cache (self) -> Optional[QueryCache]:
+        '''
+        the `QueryCache` memoizing query results, if enabled with `memoize`
         '''
-        data = GTFS.SCHEMA.dump(gtfs)
-        with open(mgtfs_path, 'w') as file:
-            json.dump(data, file)
+        return getattr(self, '_cache', None)
+
+    @property
+    def index (self) -> StopTimeIndex:
+        '''
+        an array-based `StopTimeIndex` of every `StopTime` in `trips`, built
+        on first access
+        '''
+        if getattr(self, '_index', None) is None:
+            self._index = StopTimeIndex.from_trips(self.trips)
+        return self._index
+    
+    @property
+    def timeline (self) -> Timeline:
+        '''
+        a `Timeline` converting service days to instants in the timezone of
+        the first agency, built on first access
+        '''
+        if getattr(self, '_timeline', None) is None:
+            agencies = self.agencies.agencies
+            self._timeline = Timeline(
+                agencies[0].timezone if agencies else 'UTC',
+                self.schedules,
+                self.index.span
+            )
+        return self._timeline
 
 
     ### METHODS ###
+    def _connections (
+                self, 
+                date: pydate, 
+                first: int, 
+                last: int
+            ) -> Connections:
+        index, timeline = self.index, self.timeline
+        origin = timeline.origin(date)
+        rows: list[np.ndarray] = []
+        shifts: list[np.ndarray] = []
+        for d, s, e in timeline.days(
+                    timeline.instant(date, first), 
+                    timeline.instant(date, last)
+                ):
+            r, shift = index.instances(index.rows(timeline.active(d)), s, e)
+            rows.append(r)
+            shifts.append(
+                shift + int((timeline.origin(d) - origin).total_seconds())
+            )
+        footpaths = None
+        if Unloaded.loaded(self.transfers) and len(self.transfers) > 0:
+            footpaths = index.footpaths(self.transfers.footpaths)
+        if not rows: 
+            return index.connections(
+                np.zeros(0, dtype=np.int64), footpaths=footpaths
+            )
+        return index.connections(
+            np.concatenate(rows), np.concatenate(shifts), footpaths
+        )
+
+    def _coords (self) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        if getattr(self, '_coord_arrays', None) is None:
+            stops = [self.stops[sid] for sid in self.index.stop_ids]
+            lats = np.array([
+                np.nan if s is None or s.lat is None else s.lat 
+                for s in stops
+            ])
+            lons = np.array([
+                np.nan if s is None or s.lon is None else s.lon 
+                for s in stops
+            ])
+            self._coord_arrays = (lats, lons)
+        lats, lons = self._coord_arrays
+        return None if np.isnan(lats).all() else (lats, lons)
+
     def _ref (self, trips: Trips) -> GTFS:
-        return GTFS(
+        g = GTFS(
             self.name,
             self.feed,
             self.agencies,
             self.routes,
             self.schedules,
             self.stops,
-            trips
+            trips,
+            self.shapes,
+            self.transfers,
+            self.profile
         )
+        g._timeline = getattr(self, '_timeline', None)
+        g._cache = getattr(self, '_cache', None)
+        return g
     
-    def between (self, start: pydate, end: pydate) -> GTFS:
-        return self._ref(self.trips.between(start, end))
+    def _running (self, start: datetime, end: datetime) -> set[str]:
+        index, timeline = self.index, self.timeline
+        ids: set[str] = set()
+        for d, s, e in timeline.days(start, end):
+            rows, _ = index.instances(index.rows(timeline.active(d)), s, e)
+            ids.update(index.trip_ids[r] for r in np.unique(rows))
+        return ids
     
+    def _subset (self, ids: set[str]) -> GTFS:
+        data = self.trips.data
+        return self._ref(self.trips._ref({
+            id: data[id] for id in data if id in ids
+        }))
+    
+    @counted(_trips)
+    @memoized()
+    def between (self, start: datetime, end: datetime) -> GTFS:
+        '''
+        Returns a `GTFS` object containing only the trips running at any 
+        instant from `start` to `end`, including trips from earlier service
+        days that run past midnight.
+
+        Naive `datetime` values are interpreted in the agency timezone.
+
+        Parameters:
+            start (datetime):
+                the start of the window
+            end (datetime):
+                the end of the window
+
+        Returns:
+            gtfs (GTFS):
+                a `GTFS` object containing only the trips running between
+                `start` and `end`
+        '''
+        return self._subset(self._running(start, end))
+    
+    @counted(_trips)
+    @memoized()
     def connecting (self, stop_a_id: str, stop_b_id: str) -> GTFS:
         '''
         Returns a `GTFS` object containing only the trips connecting the stops
@@ -199,9 +612,189 @@ class GTFS(s.Seared):
         '''
         return self._ref(self.trips.connecting(stop_a_id, stop_b_id))
     
+    @counted(_stop_times)
+    @memoized()
+    def departures (
+                self, 
+                stop_id: str, 
+                start: datetime, 
+                end: datetime
+            ) -> list[tuple[datetime, Trip]]:
+        '''
+        Returns the departures from the stop corresponding to `stop_id` from
+        `start` to `end`, ordered by departure time.
+
+        Naive `datetime` values are interpreted in the agency timezone.
+
+        Parameters:
+            stop_id (str):
+                the unique ID of the stop
+            start (datetime):
+                the start of the window
+            end (datetime):
+                the end of the window
+
+        Returns:
+            departures (list[tuple[datetime, Trip]]):
+                the aware departure instant and `Trip` of each departure
+        '''
+        index, timeline = self.index, self.timeline
+        k = index.stop(stop_id)
+        if k is None: return []
+
+        pos = np.flatnonzero(index.stops == k)
+        owners = np.searchsorted(index.offsets, pos, side='right') - 1
+        keep = pos < index.offsets[owners + 1] - 1
+        pos, owners = pos[keep], owners[keep]
+
+        out: list[tuple[datetime, Trip]] = []
+        for d, s, e in timeline.days(start, end):
+            rows, shifts = index.instances(
+                index.rows(timeline.active(d)), s, e
+            )
+            lo = np.searchsorted(owners, rows, side='left')
+            runs, match = expand(
+                lo, np.searchsorted(owners, rows, side='right') - lo
+            )
+            times = index.departures[pos[match]] + shifts[runs]
+            mask = (times >= s) & (times <= e)
+            out.extend(
+                (timeline.instant(d, int(t)), self.trips[index.trip_ids[r]])
+                for t, r in zip(times[mask], rows[runs][mask])
+            )
+        return sorted(out, key=lambda dep: dep[0])
+
+    def invalidate (self):
+        '''
+        Discards every memoized query result and derived index, so that they
+        are rebuilt from the current tables. Must be called after records of
+        the dataset are modified in place; replacing a table outright is
+        detected automatically.
+        '''
+        if self.cache is not None: self.cache.clear()
+        self._index = None
+        self._timeline = None
+        self._coord_arrays = None
+
+    @counted(_stop_times)
+    @memoized()
+    def isochrones (
+                self,
+                origins: list[str],
+                date: pydate,
+                departure: time,
+                budgets: list[timedelta],
+                transfer: timedelta = timedelta(0),
+                processes: Optional[int] = None
+            ) -> list[dict[timedelta, set[str]]]:
+        '''
+        Returns, for each origin stop, the IDs of the stops reachable within
+        each travel time budget when departing at `departure` on `date`.
+
+        Parameters:
+            origins (list[str]):
+                the unique IDs of the origin stops
+            date (date):
+                the service date to travel on
+            departure (time):
+                the departure time from the origin stops
+            budgets (list[timedelta]):
+                the travel time budgets to find reachable stops for
+            transfer (timedelta):
+                the minimum time needed to change between trips
+            processes (Optional[int]):
+                the number of worker processes to spread origins across
+
+        Returns:
+            isochrones (list[dict[timedelta, set[str]]]):
+                a `dict` for each origin mapping each budget to the IDs of the
+                stops reachable within it
+        '''
+        index = self.index
+        start = time_secs(departure)
+        horizon = int(max(budgets).total_seconds()) if budgets else 0
+        arrivals = arrival_matrix(
+            self._connections(date, start, start + horizon),
+            [index.stop(o) for o in origins],
+            [start],
+            int(transfer.total_seconds()),
+            horizon,
+            processes
+        )[0] - start
+        return [
+            {
+                b: {
+                    index.stop_ids[i] 
+                    for i in np.flatnonzero(row <= b.total_seconds())
+                }
+                for b in budgets
+            }
+            for row in arrivals
+        ]
+    
+    def memoize (
+                self,
+                maxsize: Optional[int] = 1024,
+                max_bytes: Optional[int] = None,
+                ttl: Optional[float] = None,
+                relative_ttl: float = 60.0
+            ) -> QueryCache:
+        '''
+        Enables memoization of the filter and query methods of the `GTFS`
+        object and the `GTFS` objects derived from it, and returns the shared
+        `QueryCache`.
+
+        Results are keyed by the method and its normalized arguments, and by
+        the tables the queried object holds, so results are never reused once
+        a table is replaced. Results are shared between callers and must not
+        be modified.
+
+        Parameters:
+            maxsize (Optional[int]):
+                the maximum number of cached results
+            max_bytes (Optional[int]):
+                the maximum estimated memory in bytes of all cached results
+            ttl (Optional[float]):
+                the default time to live in seconds of each result
+            relative_ttl (float):
+                the time to live in seconds of results relative to the
+                current time, such as those of `today`
+
+        Returns:
+            cache (QueryCache):
+                the `QueryCache` memoizing query results
+        '''
+        self._cache = QueryCache(maxsize, max_bytes, ttl, relative_ttl)
+        return self._cache
+
+    def memory_report (self, sample: Optional[int] = 1000) -> MemoryReport:
+        '''
+        Returns a `MemoryReport` breaking down the memory used by the dataset
+        by table, by patterns, timetables and stop times, by the stop time
+        index and by the query cache, with record counts and bytes per
+        record.
+
+        By default only `sample` records of every part are measured and their
+        sizes scaled up, which is cheap enough to call on a live server.
+
+        Parameters:
+            sample (Optional[int]):
+                the number of records measured in every part, or `None` to
+                measure every record exactly
+
+        Returns:
+            report (MemoryReport):
+                the memory used by the dataset
+        '''
+        return MemoryReport.from_gtfs(self, sample)
+
+    @counted(_trips)
+    @memoized()
     def on_date (self, date: pydate) -> GTFS:
         '''
-        Returns a `GTFS` object containing only the trips occuring on `date`
+        Returns a `GTFS` object containing only the trips occuring on `date`:
+        the trips of the `date` service day, and the trips of earlier service
+        days that are still running after midnight on `date`.
 
         Parameters:
             date (date):
@@ -211,19 +804,226 @@ class GTFS(s.Seared):
             gtfs (GTFS):
                 a `GTFS` object containing only the trips occuring on `date`
         '''
-        return self._ref(self.trips.on_date(self.schedules.on_date(date)))
-    
+        index, timeline = self.index, self.timeline
+        ids = { index.trip_ids[r] for r in index.rows(timeline.active(date)) }
+        midnight = datetime.combine(date, time(0))
+        ids.update(self._running(
+            midnight, midnight + timedelta(days=1, seconds=-1)
+        ))
+        return self._subset(ids)
+
+    @counted(_trips)
+    @memoized()
     def on_route (self, route_id: str) -> GTFS:
         return self._ref(self.trips.on_route(route_id))
+    
+    @counted(_stop_times)
+    @memoized()
+    def positions (self, when: datetime) -> Positions:
+        '''
+        Returns the estimated `Positions` of every trip running at `when`,
+        including trips from earlier service days that run past midnight.
+
+        The previous and next stop of each trip and the fractional progress
+        between them are found with vectorized searches over the
+        `StopTimeIndex`. If the stops have coordinates, the position of each
+        trip is also interpolated between the two stops. Naive `datetime` 
+        values are interpreted in the agency timezone.
+
+        Parameters:
+            when (datetime):
+                the instant to estimate trip positions at
+
+        Returns:
+            positions (Positions):
+                the estimated `Positions` of every trip running at `when`
+        '''
+        index, timeline = self.index, self.timeline
+        parts: list[Positions] = []
+        for d, s, _ in timeline.days(when):
+            rows, shifts = index.instances(
+                index.rows(timeline.active(d)), s, s
+            )
+            parts.append(estimate(index, rows, s, self._coords(), shifts))
+        return Positions.join(parts)
+
+    def subset (self, subset: Subset) -> GTFS:
+        '''
+        Returns a smaller `GTFS` object holding only the trips selected by
+        `subset` and the records they refer to: their patterns, routes,
+        agencies, schedules (trimmed to the window), stops (with their parent
+        stations), shapes and the transfers between them. Unlike the other
+        queries, every table is rebuilt rather than shared, so the result can
+        be saved as a smaller mGTFS dataset (see `GTFS.save`).
+
+        Parameters:
+            subset (Subset):
+                the part of the dataset to keep
+
+        Returns:
+            gtfs (GTFS):
+                a `GTFS` object holding only the part of the dataset selected
+                by `subset`
+        '''
+        keep, area = _prefilter(subset, {
+            'routes': self.routes,
+            'schedules': self.schedules,
+            'stops': self.stops
+        })
+        visits: dict[Optional[str], bool] = {}
+        def visiting (trip: Trip) -> bool:
+            if area is None: return True
+            key = trip.pattern_id
+            if key is None or key not in visits:
+                visits[key] = not area.isdisjoint(trip.stop_ids)
+            return visits[key]
+        trips = {
+            t.id: t for t in self.trips.trips if keep(t) and visiting(t)
+        }
+
+        pattern_ids = { t.pattern_id for t in trips.values() }
+        route_ids = { t.route_id for t in trips.values() }
+        service_ids = { t.service_id for t in trips.values() }
+        shape_ids = { t.shape_id for t in trips.values() }
+        stop_ids: set[str] = set()
+        sequences = { t.pattern_id or t.id: t for t in trips.values() }
+        for trip in sequences.values(): stop_ids.update(trip.stop_ids)
+        parents = [self.stops[id] for id in stop_ids]
+        while parents:
+            stop = parents.pop()
+            if stop is None or stop.parent_id is None: continue
+            if stop.parent_id in stop_ids: continue
+            stop_ids.add(stop.parent_id)
+            parents.append(self.stops[stop.parent_id])
+        agency_ids = { self.routes[id].agency_id for id in route_ids }
+
+        def kept (id: Optional[str], ids: set[str]) -> bool:
+            return id is None or id in ids
 
+        shapes, transfers = self.shapes, self.transfers
+        if Unloaded.loaded(shapes):
+            shapes = Shapes({
+                id: shape for id, shape in shapes.data.items()
+                if id in shape_ids
+            })
+        if Unloaded.loaded(transfers):
+            transfers = Transfers([
+                t for t in transfers.data
+                if kept(t.from_stop_id, stop_ids)
+                and kept(t.to_stop_id, stop_ids)
+                and kept(t.from_route_id, route_ids)
+                and kept(t.to_route_id, route_ids)
+                and kept(t.from_trip_id, trips.keys())
+                and kept(t.to_trip_id, trips.keys())
+            ])
+        return GTFS(
+            self.name,
+            subset.clip(self.feed),
+            Agencies({
+                id: agency for id, agency in self.agencies.data.items()
+                if id in agency_ids or '' in agency_ids
+            }),
+            Routes({
+                id: route for id, route in self.routes.data.items()
+                if id in route_ids
+            }),
+            Schedules({
+                id: subset.trim(schedule)
+                for id, schedule in self.schedules.data.items()
+                if id in service_ids
+            }),
+            Stops({
+                id: stop for id, stop in self.stops.data.items()
+                if id in stop_ids
+            }),
+            Trips(trips, None if self.trips.patterns is None else {
+                id: pattern for id, pattern in self.trips.patterns.items()
+                if id in pattern_ids
+            }),
+            shapes,
+            transfers,
+            self.profile
+        )
+
+    @memoized(relative=True)
     def today (self) -> GTFS:
         '''
         Returns a `GTFS` object containing only the trips occuring on the
-        current date.'
+        current date in the agency timezone.
         
         Returns:
             gtfs (GTFS):
                 a `GTFS` object containing only the trips occuring on the
                 current date
         '''
-        return self.on_date(pydate.today())
\ No newline at end of file
+        return self.on_date(self.timeline.today())
+    
+    @counted(_stop_times)
+    @memoized()
+    def travel_times (
+                self,
+                origins: list[str],
+                destinations: list[str],
+                date: pydate,
+                departure: time,
+                until: Optional[time] = None,
+                step: timedelta = timedelta(minutes=1),
+                transfer: timedelta = timedelta(0),
+                processes: Optional[int] = None
+            ) -> np.ndarray:
+        '''
+        Returns a dense matrix of the earliest arrival times at each of
+        `destinations` when departing each of `origins` at `departure` on
+        `date`.
+
+        If `until` is provided, the matrix is computed for every departure
+        time from `departure` to `until` in increments of `step`, and the
+        matrices are stacked along a leading axis. Trips from adjacent service
+        days are included, so journeys may cross midnight.
+
+        Parameters:
+            origins (list[str]):
+                the unique IDs of the origin stops
+            destinations (list[str]):
+                the unique IDs of the destination stops
+            date (date):
+                the service date to travel on
+            departure (time):
+                the (first) departure time from the origin stops
+            until (Optional[time]):
+                the last departure time of a departure window
+            step (timedelta):
+                the increment between departure times of a departure window
+            transfer (timedelta):
+                the minimum time needed to change between trips
+            processes (Optional[int]):
+                the number of worker processes to spread origins across
+
+        Returns:
+            arrivals (np.ndarray):
+                a `(len(origins), len(destinations))` array, or a 
+                `(departures, len(origins), len(destinations))` array if
+                `until` is provided, of earliest arrival times in seconds after
+                the start of the `date` service day, with `np.inf` for 
+                unreachable destinations
+        '''
+        index = self.index
+        start = time_secs(departure)
+        end = start if until is None else time_secs(until)
+        departures = list(range(start, end + 1, int(step.total_seconds())))
+
+        arrivals = arrival_matrix(
+            self._connections(date, start, end + 86400),
+            [index.stop(o) for o in origins],
+            departures,
+            int(transfer.total_seconds()),
+            processes=processes
+        )
+
+        cols = [index.stop(d) for d in destinations]
+        known = [i for i, c in enumerate(cols) if c is not None]
+        out = np.full(
+            (len(departures), len(origins), len(destinations)), np.inf
+        )
+        out[:, :, known] = arrivals[:, :, [cols[i] for i in known]]
+        return out[0] if until is None else out
\ No newline at end of file
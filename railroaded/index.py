@@ -0,0 +1,499 @@
+from __future__ import annotations
+
+from typing import Optional, Union
+
+import numpy as np
+
+from .models import Frequency
+from .tables import Trips
+
+
+_SPAN = 1 << 20
+
+
+def expand (
+            starts: np.ndarray, 
+            counts: np.ndarray
+        ) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Expands runs of consecutive positions into flat arrays.
+
+    Parameters:
+        starts (np.ndarray):
+            the first position of each run
+        counts (np.ndarray):
+            the number of positions in each run
+
+    Returns:
+        expanded (tuple[np.ndarray, np.ndarray]):
+            the run number and the position of every expanded element
+    '''
+    owners = np.repeat(np.arange(len(starts)), counts)
+    firsts = np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, starts[owners] + np.arange(len(owners)) - firsts
+
+
+class Connections:
+    '''
+    A set of elementary connections (a vehicle departing one stop and arriving
+    at the next stop of the same trip) sorted by departure time.
+
+    Attributes:
+        arr_stops (np.ndarray):
+            the stop index of the arrival stop of each connection
+        arrivals (np.ndarray):
+            the arrival time of each connection in seconds
+        dep_stops (np.ndarray):
+            the stop index of the departure stop of each connection
+        departures (np.ndarray):
+            the departure time of each connection in seconds
+        footpaths (Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]):
+            the walking transfers between stops, as the offset of the first
+            transfer from each stop index (followed by the total number of
+            transfers), the target stop index of each transfer and its time
+            in seconds
+        n_stops (int):
+            the number of stops indexed by `dep_stops` and `arr_stops`
+        n_trips (int):
+            the number of vehicles indexed by `trips`
+        trips (np.ndarray):
+            the vehicle index of each connection
+    '''
+
+    def __init__ (
+                self,
+                dep_stops: np.ndarray,
+                arr_stops: np.ndarray,
+                departures: np.ndarray,
+                arrivals: np.ndarray,
+                trips: np.ndarray,
+                n_stops: int,
+                n_trips: int,
+                footpaths: Optional[
+                    tuple[np.ndarray, np.ndarray, np.ndarray]
+                ] = None
+            ):
+        order = np.lexsort((arrivals, departures))
+        self.dep_stops = np.ascontiguousarray(dep_stops[order], dtype=np.int64)
+        self.arr_stops = np.ascontiguousarray(arr_stops[order], dtype=np.int64)
+        self.departures = np.ascontiguousarray(
+            departures[order], dtype=np.int64
+        )
+        self.arrivals = np.ascontiguousarray(arrivals[order], dtype=np.int64)
+        self.trips = np.ascontiguousarray(trips[order], dtype=np.int64)
+        self.n_stops = n_stops
+        self.n_trips = n_trips
+        self.footpaths = footpaths
+
+    def __len__ (self) -> int:
+        return len(self.departures)
+
+
+class StopTimeIndex:
+    '''
+    A read-only, array-based index of every `StopTime` in a `Trips` table.
+
+    Stop times are stored trip by trip in stop sequence order, so the stop
+    times of the trip at row `r` occupy `offsets[r]:offsets[r+1]`. Times are
+    integer seconds after the start of the service day.
+
+    Trips with frequencies are stored once, as templates. Individual runs are
+    only produced by `StopTimeIndex.instances`, as a trip row and a shift in
+    seconds, for the time window of a query.
+
+    Attributes:
+        arrivals (np.ndarray):
+            the arrival time of each stop time in seconds
+        departures (np.ndarray):
+            the departure time of each stop time in seconds
+        frequencies (list[tuple[int, Frequency]]):
+            the trip row and `Frequency` of each frequency entry
+        span (int):
+            the latest stop time in seconds
+        keys (np.ndarray):
+            a sorted search key for each stop time combining its trip row and
+            departure time
+        offsets (np.ndarray):
+            the offset of the first stop time of each trip row, followed by
+            the total number of stop times
+        service_ids (list[str]):
+            the service ID of each trip row
+        stop_ids (list[str]):
+            the stop ID of each stop index
+        stops (np.ndarray):
+            the stop index of each stop time
+        trip_ids (list[str]):
+            the trip ID of each trip row
+    '''
+
+    def __init__ (
+                self,
+                trip_ids: list[str],
+                service_ids: list[str],
+                stop_ids: list[str],
+                offsets: np.ndarray,
+                stops: np.ndarray,
+                arrivals: np.ndarray,
+                departures: np.ndarray,
+                frequencies: list[tuple[int, Frequency]] = []
+            ):
+        self.trip_ids = trip_ids
+        self.service_ids = service_ids
+        self.stop_ids = stop_ids
+        self.offsets = offsets
+        self.stops = stops
+        self.arrivals = arrivals
+        self.departures = departures
+        self.frequencies = frequencies
+        self._frequent = np.zeros(len(trip_ids), dtype=bool)
+        self._frequent[[r for r, _ in frequencies]] = True
+        self._stop_index = { sid: i for i, sid in enumerate(stop_ids) }
+        self._trip_index = { tid: i for i, tid in enumerate(trip_ids) }
+        self._keys: Optional[np.ndarray] = None
+        self._services = { sid: i for i, sid in enumerate(set(service_ids)) }
+        self._service_codes = np.array(
+            [self._services[sid] for sid in service_ids], dtype=np.int32
+        )
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def from_trips (cls, trips: Trips) -> StopTimeIndex:
+        '''
+        Returns a `StopTimeIndex` built from every `Trip` in `trips`.
+
+        Missing arrival or departure times are filled from the other time of
+        the same stop, or carried forward from the previous stop.
+
+        Parameters:
+            trips (Trips):
+                the `Trips` table to index
+
+        Returns:
+            index (StopTimeIndex):
+                a `StopTimeIndex` of every `StopTime` in `trips`
+        '''
+        trip_ids: list[str] = []
+        service_ids: list[str] = []
+        stop_index: dict[str, int] = {}
+        offsets: list[int] = [0]
+        stops: list[int] = []
+        arrivals: list[int] = []
+        departures: list[int] = []
+        frequencies: list[tuple[int, Frequency]] = []
+
+        for row, trip in enumerate(trips.trips):
+            trip_ids.append(trip.id)
+            service_ids.append(trip.service_id)
+            frequencies.extend((row, f) for f in trip.frequencies or [])
+            last = 0
+            for stop_id, arr, dep in zip(trip.stop_ids, *trip.times()):
+                if arr is None: arr = last if dep is None else dep
+                if dep is None: dep = arr
+                last = dep
+                stops.append(stop_index.setdefault(stop_id, len(stop_index)))
+                arrivals.append(arr)
+                departures.append(dep)
+            offsets.append(len(stops))
+
+        return StopTimeIndex(
+            trip_ids,
+            service_ids,
+            list(stop_index.keys()),
+            np.array(offsets, dtype=np.int64),
+            np.array(stops, dtype=np.int32),
+            np.array(arrivals, dtype=np.int32),
+            np.array(departures, dtype=np.int32),
+            frequencies
+        )
+
+
+    ### PROPERTIES ###
+    @property
+    def keys (self) -> np.ndarray:
+        '''
+        a sorted search key for each stop time combining its trip row and
+        departure time
+        '''
+        if self._keys is None:
+            owners = np.repeat(
+                np.arange(len(self.trip_ids), dtype=np.int64), self.lengths
+            )
+            self._keys = np.maximum.accumulate(
+                owners * _SPAN + self.departures
+            )
+        return self._keys
+
+    @property
+    def lengths (self) -> np.ndarray:
+        '''the number of stop times of each trip row'''
+        return np.diff(self.offsets)
+
+    @property
+    def span (self) -> int:
+        '''the latest stop time in seconds, including frequency runs'''
+        if len(self.departures) == 0: return 0
+        span = int(max(self.arrivals.max(), self.departures.max()))
+        for row, f in self.frequencies:
+            first = self.departures[self.offsets[row]]
+            last = self.arrivals[self.offsets[row + 1] - 1]
+            span = max(span, int(f.end_secs + last - first))
+        return span
+
+
+    ### METHODS ###
+    def connections (
+                self, 
+                rows: np.ndarray,
+                shifts: Optional[np.ndarray] = None,
+                footpaths: Optional[
+                    tuple[np.ndarray, np.ndarray, np.ndarray]
+                ] = None
+            ) -> Connections:
+        '''
+        Returns the `Connections` made by the trips at `rows`.
+
+        A trip row may appear more than once (for example on consecutive 
+        service days) with a different entry in `shifts`; each appearance is
+        treated as a separate vehicle.
+
+        Parameters:
+            rows (np.ndarray):
+                the trip rows to collect connections from
+            shifts (Optional[np.ndarray]):
+                the number of seconds to add to the times of each entry in 
+                `rows`
+            footpaths (Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]):
+                the walking transfers between stops (see `footpaths`)
+
+        Returns:
+            connections (Connections):
+                the `Connections` made by the trips at `rows`
+        '''
+        if shifts is None: shifts = np.zeros(len(rows), dtype=np.int64)
+        starts = self.offsets[rows]
+        counts = np.maximum(self.offsets[rows + 1] - starts - 1, 0)
+        owners, pos = expand(starts, counts)
+        shift = shifts[owners]
+        return Connections(
+            self.stops[pos],
+            self.stops[pos + 1],
+            self.departures[pos] + shift,
+            self.arrivals[pos + 1] + shift,
+            owners,
+            len(self.stop_ids),
+            len(rows),
+            footpaths
+        )
+
+    def footpaths (
+                self, 
+                paths: list[tuple[str, str, int]]
+            ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+        Returns the walking transfers `paths` between indexed stops, grouped
+        by the stop index they start from. Transfers involving stops that no
+        trip serves are dropped.
+
+        Parameters:
+            paths (list[tuple[str, str, int]]):
+                the start and end stop IDs and time in seconds of each
+                transfer
+
+        Returns:
+            footpaths (tuple[np.ndarray, np.ndarray, np.ndarray]):
+                the offset of the first transfer from each stop index 
+                (followed by the total number of transfers), the target stop
+                index of each transfer and its time in seconds
+        '''
+        edges = [
+            (self._stop_index[a], self._stop_index[b], secs)
+            for a, b, secs in paths
+            if a in self._stop_index and b in self._stop_index
+        ]
+        edges.sort()
+        sources = np.array([e[0] for e in edges], dtype=np.int64)
+        offsets = np.searchsorted(
+            sources, np.arange(len(self.stop_ids) + 1), side='left'
+        )
+        return (
+            offsets.astype(np.int64),
+            np.array([e[1] for e in edges], dtype=np.int64),
+            np.array([e[2] for e in edges], dtype=np.int64)
+        )
+
+    def instances (
+                self, 
+                rows: np.ndarray, 
+                start: int, 
+                end: int
+            ) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Returns the runs of the trips at `rows` that are running at any time
+        from `start` to `end`, as trip rows and the shift in seconds to add to
+        the indexed times of each.
+
+        Trips without frequencies contribute a single run with a shift of `0`
+        (if they are running in the window), while each `Frequency` of a 
+        template trip contributes only the runs that overlap the window. Trips
+        without stop times never run.
+
+        Parameters:
+            rows (np.ndarray):
+                the candidate trip rows
+            start (int):
+                the start of the window in seconds after the start of the \
+                service day
+            end (int):
+                the end of the window in seconds after the start of the \
+                service day
+
+        Returns:
+            instances (tuple[np.ndarray, np.ndarray]):
+                the trip row and shift in seconds of each run
+        '''
+        rows = rows[self.offsets[rows + 1] > self.offsets[rows]]
+        plain = rows[~self._frequent[rows]]
+        first = self.arrivals[self.offsets[plain]]
+        last = self.departures[self.offsets[plain + 1] - 1]
+        plain = plain[(first <= end) & (last >= start)]
+        out_rows = [plain]
+        out_shifts = [np.zeros(len(plain), dtype=np.int64)]
+
+        if self.frequencies:
+            selected = set(rows[self._frequent[rows]].tolist())
+            for row, f in self.frequencies:
+                if row not in selected: continue
+                first = int(self.departures[self.offsets[row]])
+                last = int(self.arrivals[self.offsets[row + 1] - 1])
+                runs = np.array(
+                    f.runs(start, end, last - first), dtype=np.int64
+                )
+                out_rows.append(np.full(len(runs), row, dtype=np.int64))
+                out_shifts.append(runs - first)
+
+        return np.concatenate(out_rows), np.concatenate(out_shifts)
+
+    def locate (
+                self, 
+                rows: np.ndarray, 
+                t: Union[int, np.ndarray]
+            ) -> np.ndarray:
+        '''
+        Returns, for each trip row in `rows`, the offset of the last stop time
+        departing at or before `t`, clamped so that a following stop time
+        always exists.
+
+        Parameters:
+            rows (np.ndarray):
+                the trip rows to search, each with at least two stop times
+            t (Union[int, np.ndarray]):
+                the time in seconds to search for, or an array of times 
+                aligned with `rows`
+
+        Returns:
+            offsets (np.ndarray):
+                the offset of the stop time most recently departed by each trip
+        '''
+        found = np.searchsorted(self.keys, rows * _SPAN + t, side='right') - 1
+        return np.clip(found, self.offsets[rows], self.offsets[rows + 1] - 2)
+
+    def rows (self, service_ids: Optional[list[str]] = None) -> np.ndarray:
+        '''
+        Returns the trip rows belonging to any of `service_ids`, or every trip
+        row if `service_ids` is `None`.
+
+        Parameters:
+            service_ids (Optional[list[str]]):
+                the service IDs to select trip rows for
+
+        Returns:
+            rows (np.ndarray):
+                the selected trip rows
+        '''
+        if service_ids is None:
+            return np.arange(len(self.trip_ids))
+        codes = [
+            self._services[sid] for sid in service_ids 
+            if sid in self._services
+        ]
+        return np.flatnonzero(np.isin(self._service_codes, codes))
+
+    def stop (self, stop_id: str) -> Optional[int]:
+        '''
+        Returns the stop index of `stop_id`, or `None` if no indexed trip
+        serves it.
+
+        Parameters:
+            stop_id (str):
+                the unique ID of the stop
+
+        Returns:
+            index (Optional[int]):
+                the stop index of `stop_id` if it is served, otherwise `None`
+        '''
+        return self._stop_index.get(stop_id, None)
+
+    def trip (self, trip_id: str) -> Optional[int]:
+        '''
+        Returns the trip row of `trip_id`, or `None` if it is not indexed.
+
+        Parameters:
+            trip_id (str):
+                the unique ID of the trip
+
+        Returns:
+            row (Optional[int]):
+                the trip row of `trip_id` if it is indexed, otherwise `None`
+        '''
+        return self._trip_index.get(trip_id, None)
+
+    def update (self, removed: set[str], added: Trips) -> StopTimeIndex:
+        '''
+        Returns a new `StopTimeIndex` without the trips in `removed` and with
+        every `Trip` in `added`, reusing the arrays of every other trip 
+        instead of re-reading its stop times.
+
+        Parameters:
+            removed (set[str]):
+                the unique IDs of the trips to drop, including changed trips
+            added (Trips):
+                the new and changed trips to index
+
+        Returns:
+            index (StopTimeIndex):
+                the updated `StopTimeIndex`
+        '''
+        keep = np.array(
+            [tid not in removed for tid in self.trip_ids], dtype=bool
+        )
+        part = StopTimeIndex.from_trips(added)
+        mask = np.repeat(keep, self.lengths)
+
+        stop_ids = list(self.stop_ids)
+        stop_index = dict(self._stop_index)
+        for sid in part.stop_ids:
+            stop_index.setdefault(sid, len(stop_ids))
+            if stop_index[sid] == len(stop_ids): stop_ids.append(sid)
+        remap = np.array(
+            [stop_index[sid] for sid in part.stop_ids], dtype=np.int32
+        )
+
+        lengths = np.concatenate((self.lengths[keep], part.lengths))
+        rows = np.cumsum(keep) - 1
+        kept = int(keep.sum())
+        return StopTimeIndex(
+            [tid for tid, k in zip(self.trip_ids, keep) if k] 
+                + part.trip_ids,
+            [sid for sid, k in zip(self.service_ids, keep) if k] 
+                + part.service_ids,
+            stop_ids,
+            np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+            np.concatenate((
+                self.stops[mask], remap[part.stops]
+            )).astype(np.int32),
+            np.concatenate((self.arrivals[mask], part.arrivals)),
+            np.concatenate((self.departures[mask], part.departures)),
+            [(int(rows[r]), f) for r, f in self.frequencies if keep[r]] + 
+                [(r + kept, f) for r, f in part.frequencies]
+        )
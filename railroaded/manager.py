@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor
+)
+import functools
+import threading
+from typing import Callable, Optional
+
+from .delta import _dumped, digests, fingerprint
+from .gtfs import GTFS
+
+
+def _build (read: Callable[[], GTFS]) -> GTFS:
+    g = read()
+    g.index
+    g.timeline
+    return g
+
+
+def _fingerprint (gtfs: GTFS) -> str:
+    return fingerprint(digests(_dumped(gtfs)))
+
+
+def check (gtfs: GTFS):
+    '''
+    Raises a `ValueError` if `gtfs` is unfit to replace a feed being served:
+    if it has no trips, or if a trip references a missing route or service.
+
+    Parameters:
+        gtfs (GTFS):
+            the `GTFS` dataset to check
+    '''
+    if not gtfs.trips.data:
+        raise ValueError(f'feed {gtfs.name} has no trips')
+    for trip in gtfs.trips.trips:
+        if gtfs.routes[trip.route_id] is None:
+            raise ValueError(
+                f'trip {trip.id} references missing route {trip.route_id}'
+            )
+        if gtfs.schedules[trip.service_id] is None:
+            raise ValueError(
+                f'trip {trip.id} references missing service {trip.service_id}'
+            )
+
+
+class FeedManager:
+    '''
+    Serves the current version of a `GTFS` dataset and swaps in new versions
+    built in the background.
+
+    Readers take `current` once per request and query that snapshot, so a
+    request started before a swap finishes on the old version while later
+    requests see the new one. A new version is read, indexed and validated
+    off the request path, and only swapped in once it is fully ready, so a
+    reload never stalls queries. A reload that reads the same content as the
+    current version (by the content hash of every record, as `delta.diff`
+    compares them) is not swapped in, so indexes and caches are kept. If
+    memoization is enabled on the current
+    version, the new version gets a fresh cache with the same limits.
+
+    Attributes:
+        current (Optional[GTFS]):
+            the `GTFS` dataset currently being served
+        version (int):
+            the number of versions swapped in so far
+    '''
+
+    def __init__ (
+                self,
+                gtfs: Optional[GTFS] = None,
+                validate: Optional[Callable[[GTFS], None]] = check,
+                processes: bool = False
+            ):
+        self._current = gtfs
+        self._validate = validate
+        self._processes = processes
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[str] = None
+        self.version = 0 if gtfs is None else 1
+
+
+    ### PROPERTIES ###
+    @property
+    def current (self) -> Optional[GTFS]:
+        '''the `GTFS` dataset currently being served'''
+        return self._current
+
+
+    ### METHODS ###
+    def _finish (self, build: Future, done: Future):
+        try:
+            g: GTFS = build.result()
+            if self._validate is not None: self._validate(g)
+            current = self._current
+            new = _fingerprint(g)
+            if current is not None and self._fingerprint is None:
+                self._fingerprint = _fingerprint(current)
+            if current is not None and new == self._fingerprint:
+                g = current
+            else:
+                self.swap(g)
+                if self._current is g: self._fingerprint = new
+        except BaseException as e:
+            done.set_exception(e)
+        else:
+            done.set_result(g)
+
+    def reload (self, **kwargs) -> Future:
+        '''
+        Starts reading a new version of the dataset with `GTFS.read` in the
+        background, and returns a `Future` resolving to it once it has been
+        validated and swapped in, or to the current version if the content is
+        unchanged. If reading or validation fails, the `Future` raises and the
+        current version keeps being served.
+
+        Parameters:
+            **kwargs:
+                the arguments to pass to `GTFS.read`
+
+        Returns:
+            future (Future):
+                a `Future` resolving to the new `GTFS` dataset
+        '''
+        return self.reload_with(functools.partial(GTFS.read, **kwargs))
+
+    def reload_with (self, read: Callable[[], GTFS]) -> Future:
+        '''
+        Starts building a new version of the dataset by calling `read` in the
+        background, and returns a `Future` resolving to it once it has been
+        validated and swapped in, or to the current version if the content is
+        unchanged. Reloads run one at a time, in order.
+
+        With `processes`, `read` runs in a worker process and must be
+        picklable.
+
+        Parameters:
+            read (Callable[[], GTFS]):
+                a function returning the new `GTFS` dataset
+
+        Returns:
+            future (Future):
+                a `Future` resolving to the new `GTFS` dataset
+        '''
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(1) \
+                    if self._processes else ThreadPoolExecutor(1)
+            build = self._executor.submit(_build, read)
+        done: Future = Future()
+        build.add_done_callback(lambda f: self._finish(f, done))
+        return done
+
+    def shutdown (self, wait: bool = True):
+        '''
+        Stops the background worker used for reloads.
+
+        Parameters:
+            wait (bool):
+                whether to wait for pending reloads to finish
+        '''
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    def swap (self, gtfs: GTFS):
+        '''
+        Atomically replaces the `GTFS` dataset being served with `gtfs`,
+        building its indexes first if needed.
+
+        Parameters:
+            gtfs (GTFS):
+                the new `GTFS` dataset to serve
+        '''
+        gtfs.index
+        gtfs.timeline
+        with self._lock:
+            old = self._current
+            cache = None if old is None else old.cache
+            if cache is not None and gtfs.cache is None:
+                gtfs.memoize(
+                    cache.maxsize,
+                    cache.max_bytes,
+                    cache.ttl,
+                    cache.relative_ttl
+                )
+            self._current = gtfs
+            self._fingerprint = None
+            self.version += 1
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from .index import Connections
+
+
+_CONNECTIONS: Optional[Connections] = None
+
+
+def earliest_arrivals (
+            connections: Connections,
+            origin: int,
+            departure: int,
+            transfer: int = 0,
+            horizon: Optional[int] = None
+        ) -> np.ndarray:
+    '''
+    Returns the earliest arrival time at every stop when leaving the stop at
+    `origin` at `departure`, computed with a single connection scan. If
+    `connections` has footpaths, each improved arrival is relaxed along them.
+
+    Parameters:
+        connections (Connections):
+            the `Connections` available for travel
+        origin (int):
+            the stop index of the origin stop
+        departure (int):
+            the departure time from the origin in seconds
+        transfer (int):
+            the minimum time in seconds needed to change between trips
+        horizon (Optional[int]):
+            the maximum travel time in seconds to search, or `None` to scan
+            every remaining connection
+
+    Returns:
+        arrivals (np.ndarray):
+            the earliest arrival time in seconds at every stop index, with
+            `np.inf` for unreachable stops
+    '''
+    inf = float('inf')
+    arrivals = [inf] * connections.n_stops
+    ready = [inf] * connections.n_stops
+    arrivals[origin] = departure
+    ready[origin] = departure
+    boarded = bytearray(connections.n_trips)
+
+    deps = memoryview(connections.departures)
+    arrs = memoryview(connections.arrivals)
+    dep_stops = memoryview(connections.dep_stops)
+    arr_stops = memoryview(connections.arr_stops)
+    trips = memoryview(connections.trips)
+
+    if connections.footpaths is None:
+        walk_offsets = walk_targets = walk_times = None
+    else:
+        walk_offsets, walk_targets, walk_times = (
+            memoryview(a) for a in connections.footpaths
+        )
+        for w in range(walk_offsets[origin], walk_offsets[origin + 1]):
+            u, a = walk_targets[w], departure + walk_times[w]
+            if a < arrivals[u]:
+                arrivals[u] = a
+                ready[u] = a
+
+    last = inf if horizon is None else departure + horizon
+    for k in range(bisect_left(deps, departure), len(deps)):
+        d = deps[k]
+        if d > last: break
+        t = trips[k]
+        if boarded[t] or ready[dep_stops[k]] <= d:
+            boarded[t] = 1
+            a, s = arrs[k], arr_stops[k]
+            if a < arrivals[s]:
+                arrivals[s] = a
+                ready[s] = a + transfer
+                if walk_offsets is None: continue
+                for w in range(walk_offsets[s], walk_offsets[s + 1]):
+                    u, b = walk_targets[w], a + walk_times[w]
+                    if b < arrivals[u]:
+                        arrivals[u] = b
+                        ready[u] = b
+
+    return np.array(arrivals, dtype=np.float64)
+
+
+def _init_worker (connections: Connections):
+    global _CONNECTIONS
+    _CONNECTIONS = connections
+
+
+def _solve (
+            origins: list[Optional[int]],
+            departures: list[int],
+            transfer: int,
+            horizon: Optional[int],
+            connections: Optional[Connections] = None
+        ) -> np.ndarray:
+    # Pool workers read the `Connections` set by `_init_worker`.
+    if connections is None: connections = _CONNECTIONS
+    out = np.full(
+        (len(departures), len(origins), connections.n_stops), np.inf
+    )
+    for i, departure in enumerate(departures):
+        for j, origin in enumerate(origins):
+            if origin is None: continue
+            out[i, j] = earliest_arrivals(
+                connections, origin, departure, transfer, horizon
+            )
+    return out
+
+
+def arrival_matrix (
+            connections: Connections,
+            origins: list[Optional[int]],
+            departures: list[int],
+            transfer: int = 0,
+            horizon: Optional[int] = None,
+            processes: Optional[int] = None
+        ) -> np.ndarray:
+    '''
+    Returns the earliest arrival time at every stop for every pair of
+    departure time and origin stop.
+
+    When `processes` is greater than `1`, origins are split across a process
+    pool. Each worker receives `connections` once when it starts, and on
+    platforms that fork the arrays are shared read-only with the parent.
+
+    Parameters:
+        connections (Connections):
+            the `Connections` available for travel
+        origins (list[Optional[int]]):
+            the stop indices of the origin stops, with `None` for origins that
+            no trip serves
+        departures (list[int]):
+            the departure times from the origins in seconds
+        transfer (int):
+            the minimum time in seconds needed to change between trips
+        horizon (Optional[int]):
+            the maximum travel time in seconds to search
+        processes (Optional[int]):
+            the number of worker processes to use, or `None` to search in the
+            current process
+
+    Returns:
+        arrivals (np.ndarray):
+            a `(len(departures), len(origins), connections.n_stops)` array of
+            earliest arrival times in seconds, with `np.inf` for unreachable
+            stops
+    '''
+    if not processes or processes < 2 or len(origins) < 2:
+        return _solve(origins, departures, transfer, horizon, connections)
+
+    size = -(-len(origins) // processes)
+    chunks = [
+        origins[i:i+size]
+        for i in range(0, len(origins), size)
+    ]
+    with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=(connections,)
+            ) as pool:
+        parts = pool.map(
+            _solve,
+            chunks,
+            [departures] * len(chunks),
+            [transfer] * len(chunks),
+            [horizon] * len(chunks)
+        )
+        return np.concatenate(list(parts), axis=1)
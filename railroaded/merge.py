@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import copy
+import math
+import re
+import sys
+from typing import Optional
+
+import numpy as np
+
+from .gtfs import GTFS, TABLES
+from .models import Pattern, Shape, Stop, StopTime, Timetable, Transfer, Trip
+from .models.shape import RADIUS
+from .models.transfer import TransferType
+from .tables import (
+    Agencies,
+    Routes,
+    Schedules,
+    Shapes,
+    Stops,
+    Transfers,
+    Trips,
+    Unloaded
+)
+
+
+WALK_SPEED = 1.3
+'''the walking speed in meters per second used to time linked stops'''
+
+
+def _ns (ns: str, value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(f'{ns}:{value}')
+
+
+def _name_key (name: Optional[str]) -> str:
+    return re.sub(r'[^0-9a-z]', '', (name or '').lower())
+
+
+def _stop_time (ns: str, st: StopTime) -> StopTime:
+    st = copy.copy(st)
+    st.trip_id = _ns(ns, st.trip_id)
+    st.stop_id = _ns(ns, st.stop_id)
+    st.location_id = _ns(ns, st.location_id)
+    st.location_group_id = _ns(ns, st.location_group_id)
+    st.dropoff_booking_id = _ns(ns, st.dropoff_booking_id)
+    st.pickup_booking_id = _ns(ns, st.pickup_booking_id)
+    return st
+
+
+def _trip (ns: str, trip: Trip) -> Trip:
+    t = copy.copy(trip)
+    t.id = _ns(ns, trip.id)
+    t.block_id = _ns(ns, trip.block_id)
+    t.pattern_id = _ns(ns, trip.pattern_id)
+    t.route_id = _ns(ns, trip.route_id)
+    t.service_id = _ns(ns, trip.service_id)
+    t.shape_id = _ns(ns, trip.shape_id)
+    t.pattern = None
+    t.shape = None
+    if trip.frequencies:
+        t.frequencies = []
+        for f in trip.frequencies:
+            f = copy.copy(f)
+            f.trip_id = t.id
+            t.frequencies.append(f)
+    if trip.pattern_id is None:
+        t.timetable = Timetable.from_gtfs([
+            _stop_time(ns, st) for st in trip.timetable.stops
+        ])
+    return t
+
+
+def _namespace (ns: str, g: GTFS) -> dict[str, dict]:
+    agencies = {}
+    for a in g.agencies.agencies:
+        a = copy.copy(a)
+        a.id = _ns(ns, a.id)
+        agencies[a.id] = a
+    routes = {}
+    for r in g.routes.routes:
+        r = copy.copy(r)
+        r.id = _ns(ns, r.id)
+        r.agency_id = _ns(ns, r.agency_id)
+        r.network_id = _ns(ns, r.network_id)
+        routes[r.id] = r
+    schedules = {}
+    for sch in g.schedules.schedules:
+        sch = copy.copy(sch)
+        sch.service_id = _ns(ns, sch.service_id)
+        schedules[sch.service_id] = sch
+    stops = {}
+    for st in g.stops.stops:
+        st = copy.copy(st)
+        st.id = _ns(ns, st.id)
+        st.level_id = _ns(ns, st.level_id)
+        st.parent_id = _ns(ns, st.parent_id)
+        st.zone_id = _ns(ns, st.zone_id)
+        stops[st.id] = st
+    patterns = {
+        _ns(ns, p.id): Pattern(
+            _ns(ns, p.id),
+            p.arrivals,
+            p.departures,
+            [_stop_time(ns, st) for st in p.stops]
+        )
+        for p in (g.trips.patterns or {}).values()
+    }
+    trips = { _ns(ns, t.id): _trip(ns, t) for t in g.trips.trips }
+    shapes = {
+        _ns(ns, sh.id): Shape.from_steps(_ns(ns, sh.id), sh.lats, sh.lons)
+        for sh in (g.shapes.shapes if g.shapes is not None else [])
+    }
+    transfers = []
+    for t in (g.transfers.data if g.transfers is not None else []):
+        t = copy.copy(t)
+        for attr in (
+                    'from_route_id', 'from_stop_id', 'from_trip_id',
+                    'to_route_id', 'to_stop_id', 'to_trip_id'
+                ):
+            setattr(t, attr, _ns(ns, getattr(t, attr)))
+        transfers.append(t)
+    return {
+        'agencies': agencies,
+        'routes': routes,
+        'schedules': schedules,
+        'stops': stops,
+        'patterns': patterns,
+        'trips': trips,
+        'shapes': shapes,
+        'transfers': transfers
+    }
+
+
+def link_stops (
+            stops: list[Stop],
+            owners: list[int],
+            radius: float,
+            names: bool = True
+        ) -> list[Transfer]:
+    '''
+    Returns walking `Transfer` records in both directions between stops of
+    different feeds that are within `radius` meters of each other and, if
+    `names`, have the same name once case, spacing and punctuation are
+    ignored.
+
+    Parameters:
+        stops (list[Stop]):
+            the stops to link
+        owners (list[int]):
+            the feed each stop belongs to
+        radius (float):
+            the maximum distance in meters between linked stops
+        names (bool):
+            whether linked stops must also have matching names
+
+    Returns:
+        transfers (list[Transfer]):
+            a `Transfer` record for each direction of each linked pair, timed
+            at `WALK_SPEED`
+    '''
+    located = [
+        i for i, st in enumerate(stops)
+        if st.lat is not None and st.lon is not None
+    ]
+    if not located: return []
+    lats = np.array([stops[i].lat for i in located])
+    lons = np.array([stops[i].lon for i in located])
+    k = np.pi / 180 * RADIUS
+    xs = lons * k * np.cos(np.radians(lats.mean()))
+    ys = lats * k
+
+    cells: dict[tuple[int, int], list[int]] = {}
+    for j in range(len(located)):
+        cell = (int(xs[j] // radius), int(ys[j] // radius))
+        cells.setdefault(cell, []).append(j)
+
+    transfers: list[Transfer] = []
+    for (cx, cy), members in cells.items():
+        for j in members:
+            a = located[j]
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for m in cells.get((cx + dx, cy + dy), []):
+                        b = located[m]
+                        if owners[a] >= owners[b]: continue
+                        dist = math.hypot(xs[j] - xs[m], ys[j] - ys[m])
+                        if dist > radius: continue
+                        if names and _name_key(stops[a].name) != \
+                                _name_key(stops[b].name):
+                            continue
+                        secs = math.ceil(dist / WALK_SPEED)
+                        for x, y in ((a, b), (b, a)):
+                            transfers.append(Transfer(
+                                from_stop_id=stops[x].id,
+                                to_stop_id=stops[y].id,
+                                type=TransferType.MINIMUM_TIME,
+                                min_time=secs
+                            ))
+    return transfers
+
+
+def merge (
+            feeds: list[GTFS],
+            name: str,
+            namespaces: Optional[list[str]] = None,
+            radius: Optional[float] = None,
+            names: bool = True
+        ) -> GTFS:
+    '''
+    Returns a single `GTFS` dataset combining every dataset in `feeds`, so
+    that queries and routing run over the whole network at once.
+
+    Every ID is prefixed with the namespace of its feed (`namespace:id`), so
+    IDs can not collide, and the prefixed IDs are interned so that every
+    record referencing an ID shares one string. The datasets must share a
+    timezone, since stop times are measured from the service day of their
+    agency, and must have been read with the same `Profile` of columns and
+    with every table loaded.
+
+    If `radius` is provided, stops of different feeds within `radius` meters
+    of each other (and with matching names, if `names`) are linked with
+    walking `Transfer` records, which routing uses to change between feeds.
+
+    Parameters:
+        feeds (list[GTFS]):
+            the `GTFS` datasets to merge
+        name (str):
+            the name of the merged dataset
+        namespaces (Optional[list[str]]):
+            the namespace of each dataset, by default its name
+        radius (Optional[float]):
+            the maximum distance in meters between linked stops, or `None` to
+            skip linking
+        names (bool):
+            whether linked stops must also have matching names
+
+    Returns:
+        gtfs (GTFS):
+            a `GTFS` dataset combining every dataset in `feeds`
+    '''
+    for g in feeds:
+        unloaded = [
+            key for key in TABLES if isinstance(getattr(g, key), Unloaded)
+        ]
+        if unloaded:
+            raise ValueError(
+                f'feed {g.name!r} can not be merged without its unloaded '
+                f'tables {unloaded}; read it with every table'
+            )
+    if namespaces is None: namespaces = [g.name for g in feeds]
+    if len(set(namespaces)) != len(namespaces):
+        raise ValueError(f'namespaces must be unique: {namespaces}')
+    zones = { a.timezone for g in feeds for a in g.agencies.agencies }
+    if len(zones) > 1:
+        raise ValueError(f'feeds must share a timezone, found {zones}')
+    profiles = { g.profile for g in feeds }
+    if len(profiles) > 1:
+        raise ValueError(f'feeds must share a profile, found {profiles}')
+
+    parts = [_namespace(ns, g) for ns, g in zip(namespaces, feeds)]
+    merged = { key: {} for key in parts[0] } if parts else {}
+    transfers: list[Transfer] = []
+    owners: list[int] = []
+    for i, part in enumerate(parts):
+        for key, records in part.items():
+            if key == 'transfers': transfers.extend(records)
+            else: merged[key].update(records)
+        owners.extend([i] * len(part['stops']))
+    if radius is not None:
+        transfers.extend(link_stops(
+            list(merged['stops'].values()), owners, radius, names
+        ))
+
+    sources = [g.feed for g in feeds if g.feed is not None]
+    feed = None
+    if sources:
+        feed = copy.copy(sources[0])
+        feed.publisher_name = ' + '.join(f.publisher_name for f in sources)
+        starts = [f.start_date for f in sources if f.start_date is not None]
+        ends = [f.end_date for f in sources if f.end_date is not None]
+        feed.start_date = min(starts) if starts else None
+        feed.end_date = max(ends) if ends else None
+        feed.version = ';'.join(
+            f'{ns}:{g.feed.version}'
+            for ns, g in zip(namespaces, feeds)
+            if g.feed is not None and g.feed.version is not None
+        ) or None
+
+    g = GTFS(
+        name,
+        feed,
+        Agencies(merged.get('agencies', {})),
+        Routes(merged.get('routes', {})),
+        Schedules(merged.get('schedules', {})),
+        Stops(merged.get('stops', {})),
+        Trips(merged.get('trips', {}), merged.get('patterns', {})),
+        Shapes(merged.get('shapes', {})),
+        Transfers(transfers),
+        profiles.pop() if profiles else 'full'
+    )
+    g.trips.bind(g.shapes)
+    return g
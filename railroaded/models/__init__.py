@@ -2,9 +2,13 @@ from .agency import Agency
 from .calendar import Calendar
 from .calendar_date import CalendarDate
 from .feed import Feed
+from .frequency import Frequency
+from .pattern import Pattern
 from .route import Route
 from .schedule import Schedule
+from .shape import Shape
 from .stop import Stop
 from .stop_time import StopTime
 from .timetable import Timetable
+from .transfer import Transfer
 from .trip import Trip
\ No newline at end of file
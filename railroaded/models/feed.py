@@ -6,6 +6,7 @@ from typing import Optional
 
 import seared as s
 
+from ..profiles import Profile
 from ..util import load_list
 
 
@@ -66,13 +67,20 @@ class Feed(s.Seared):
 
     ### CLASS METHODS ###
     @classmethod
-    def from_gtfs (self, path: str) -> Feed:
+    def from_gtfs (
+                self,
+                path: str,
+                profile: Optional[Profile] = None
+            ) -> Feed:
         '''
         Returns a `Feed` record populated from the GTFS data at `path`.
 
         Parameters:
             path (str):
                 the path to the GTFS dataset
+            profile (Optional[Profile]):
+                the `Profile` selecting the columns to read, or `None` to read
+                every column
 
         Returns:
             feed (Feed):
@@ -80,5 +88,6 @@ class Feed(s.Seared):
         '''
         return load_list(
             os.path.join(path, 'feed_info.txt'), 
-            Feed.SCHEMA
+            Feed.SCHEMA,
+            profile=profile
         )[0]
\ No newline at end of file
@@ -0,0 +1,106 @@
+from enum import Enum
+
+import seared as s
+
+from ..util import parse_time
+
+
+class ExactTimes(Enum):
+    '''
+    An `Enum` indicating if a frequency-based trip runs on an exact schedule.
+    '''
+    FREQUENCY_BASED = 0
+    SCHEDULE_BASED = 1
+
+
+@s.seared
+class Frequency(s.Seared):
+    '''
+    A GTFS dataclass model for records found in `frequencies.txt`. Describes 
+    headway-based service for a template trip, whose `Timetable` gives the 
+    running times of every run relative to its first departure.
+
+    Attributes:
+        trip_id (str):
+            the unique ID of the template trip
+        end_secs (int):
+            the end of the service window in seconds after the start of the \
+            service day
+        end_time (str):
+            the time at which service changes or stops
+        exact (ExactTimes):
+            the `ExactTimes` of the service
+        headway (int):
+            the time in seconds between departures from the same stop
+        start_secs (int):
+            the start of the service window in seconds after the start of the \
+            service day
+        start_time (str):
+            the time at which the first run departs
+    '''
+
+    ### ATTRIBUTES ###
+    # Foreign IDs
+    trip_id: str = s.Str(required=True)
+    '''the unique ID of the template trip'''
+
+    # Required fields
+    end_time: str = s.Str(required=True)
+    '''the time at which service changes or stops'''
+    headway: int = s.Int(data_key='headway_secs', required=True)
+    '''the time in seconds between departures from the same stop'''
+    start_time: str = s.Str(required=True)
+    '''the time at which the first run departs'''
+
+    # Optional fields
+    exact: ExactTimes = s.Enum(
+        data_key='exact_times', 
+        enum=ExactTimes, 
+        missing=ExactTimes.FREQUENCY_BASED
+    )
+    '''the `ExactTimes` of the service'''
+
+
+    ### PROPERTIES ###
+    @property
+    def end_secs (self) -> int:
+        '''
+        the end of the service window in seconds after the start of the 
+        service day
+        '''
+        return parse_time(self.end_time)
+    
+    @property
+    def start_secs (self) -> int:
+        '''
+        the start of the service window in seconds after the start of the 
+        service day
+        '''
+        return parse_time(self.start_time)
+
+
+    ### METHODS ###
+    def runs (self, start: int, end: int, duration: int) -> range:
+        '''
+        Returns the first departure time of every run that is running at any
+        time from `start` to `end`.
+
+        Parameters:
+            start (int):
+                the start of the window in seconds after the start of the \
+                service day
+            end (int):
+                the end of the window in seconds after the start of the \
+                service day
+            duration (int):
+                the time in seconds from the first departure to the last 
+                arrival of a run
+
+        Returns:
+            runs (range):
+                the first departure time in seconds of every overlapping run
+        '''
+        first, headway = self.start_secs, max(self.headway, 1)
+        last = min(self.end_secs - 1, end)
+        k = max(0, -(-(start - duration - first) // headway))
+        return range(first + k * headway, last + 1, headway)
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import copy
+from typing import Optional
+
+import seared as s
+
+from ..util import format_time
+from .stop_time import StopTime
+from .timetable import Timetable
+
+
+BLANK = -1
+'''the relative time stored for arrival or departure times left blank'''
+
+SHARED = (
+    'index',
+    'stop_id',
+    'dropoff_booking_id',
+    'location_id',
+    'location_group_id',
+    'pickup_booking_id',
+    'dist_traveled',
+    'dropoff_continuity',
+    'dropoff_type',
+    'end_pickup_dropoff',
+    'headsign',
+    'pickup_continuity',
+    'pickup_type',
+    'start_pickup_dropoff',
+    'timepoint'
+)
+'''the `StopTime` attributes that must match for trips to share a pattern'''
+
+
+@s.seared
+class Pattern(s.Seared):
+    '''
+    A dataclass model for a stop pattern shared by many trips: the ordered
+    `StopTime` records of a trip without their times, and a reference profile
+    of arrival and departure times relative to the first stop.
+
+    Each `Trip` of the pattern stores only its start time, and the
+    differences from the reference profile if its running times differ.
+
+    Attributes:
+        id (str):
+            the unique ID of the pattern
+        arrivals (list[int]):
+            the reference arrival time at each stop in seconds after the
+            start time, or `BLANK`
+        departures (list[int]):
+            the reference departure time from each stop in seconds after the
+            start time, or `BLANK`
+        stop_ids (list[str]):
+            the unique ID of each stop of the pattern in order
+        stops (list[StopTime]):
+            the `StopTime` records of the pattern, in order, without trip IDs
+            or times
+    '''
+
+    ### ATTRIBUTES ###
+    # Model ID
+    id: str = s.Str(data_key='pattern_id', required=True)
+    '''the unique ID of the pattern'''
+
+    # Required fields
+    arrivals: list[int] = s.Int(many=True, required=True)
+    '''
+    the reference arrival time at each stop in seconds after the start time,
+    or `BLANK`
+    '''
+    departures: list[int] = s.Int(many=True, required=True)
+    '''
+    the reference departure time from each stop in seconds after the start
+    time, or `BLANK`
+    '''
+    stops: list[StopTime] = s.T(
+        schema=StopTime.SCHEMA, many=True, required=True
+    )
+    '''
+    the `StopTime` records of the pattern, in order, without trip IDs or times
+    '''
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def from_gtfs (cls, id: str, stops: list[StopTime]) -> Pattern:
+        '''
+        Returns a `Pattern` using the ordered `stops` of a trip as its
+        reference.
+
+        Parameters:
+            id (str):
+                the unique ID of the pattern
+            stops (list[StopTime]):
+                the ordered `StopTime` records of the reference trip
+
+        Returns:
+            pattern (Pattern):
+                a `Pattern` using `stops` as its reference
+        '''
+        start, arrivals, departures = Pattern.profile(stops)
+        templates: list[StopTime] = []
+        for st in stops:
+            template = copy.copy(st)
+            template.trip_id = None
+            template.arrival_time = None
+            template.departure_time = None
+            templates.append(template)
+        return Pattern(id, arrivals, departures, templates)
+
+    @classmethod
+    def profile (
+                cls,
+                stops: list[StopTime]
+            ) -> tuple[int, list[int], list[int]]:
+        '''
+        Returns the start time of the ordered `stops` of a trip, and their
+        arrival and departure times relative to it.
+
+        Parameters:
+            stops (list[StopTime]):
+                the ordered `StopTime` records of a trip
+
+        Returns:
+            profile (tuple[int, list[int], list[int]]):
+                the start time in seconds and the relative arrival and
+                departure times, with `BLANK` for blank times
+        '''
+        first = stops[0]
+        start = first.start_secs if first.start_secs is not None \
+            else first.end_secs
+        arrivals, departures = [], []
+        for st in stops:
+            arr, dep = st.start_secs, st.end_secs
+            arrivals.append(BLANK if arr is None else arr - start)
+            departures.append(BLANK if dep is None else dep - start)
+        return start, arrivals, departures
+
+    @classmethod
+    def signature (
+                cls, 
+                route_id: str, 
+                shape_id: Optional[str], 
+                stops: list[StopTime]
+            ) -> tuple:
+        '''
+        Returns a hashable signature of the ordered `stops` of a trip on the
+        route corresponding to `route_id` following the shape corresponding to
+        `shape_id`. Trips with equal signatures can share a `Pattern`.
+
+        Parameters:
+            route_id (str):
+                the unique ID of the route of the trip
+            shape_id (Optional[str]):
+                the unique ID of the shape of the trip
+            stops (list[StopTime]):
+                the ordered `StopTime` records of the trip
+
+        Returns:
+            signature (tuple):
+                a hashable signature of the stops of the trip
+        '''
+        return (route_id, shape_id) + tuple(
+            tuple(getattr(st, attr) for attr in SHARED) + (
+                st.start_secs is None,
+                st.end_secs is None
+            )
+            for st in stops
+        )
+
+
+    ### PROPERTIES ###
+    @property
+    def stop_ids (self) -> list[str]:
+        '''the unique ID of each stop of the pattern in order'''
+        return [st.stop_id for st in self.stops]
+
+
+    ### METHODS ###
+    def connects (self, stop_a_id: str, stop_b_id: str) -> bool:
+        '''
+        Returns a `bool` indicating if the pattern visits `stop_a_id` and
+        later `stop_b_id`.
+
+        Parameters:
+            stop_a_id (str):
+                the unique ID associated with the first stop
+            stop_b_id (str):
+                the unique ID associated with the second stop
+
+        Returns:
+            a `bool` indicating if the pattern visits `stop_a_id` and later
+            `stop_b_id`
+        '''
+        positions = getattr(self, '_positions', None)
+        if positions is None:
+            positions = { sid: i for i, sid in enumerate(self.stop_ids) }
+            self._positions = positions
+        return stop_a_id in positions and stop_b_id in positions and \
+            positions[stop_a_id] < positions[stop_b_id]
+
+    def fit (
+                self,
+                stops: list[StopTime]
+            ) -> tuple[int, Optional[list[int]]]:
+        '''
+        Returns the start time of the ordered `stops` of a trip sharing the
+        pattern, and the differences of its times from the reference profile.
+
+        Parameters:
+            stops (list[StopTime]):
+                the ordered `StopTime` records of a trip with the same
+                signature as the pattern
+
+        Returns:
+            fit (tuple[int, Optional[list[int]]]):
+                the start time in seconds, and the interleaved arrival and
+                departure differences in seconds, or `None` if the trip
+                follows the reference profile exactly
+        '''
+        start, arrivals, departures = Pattern.profile(stops)
+        if arrivals == self.arrivals and departures == self.departures:
+            return start, None
+        deltas: list[int] = []
+        for i in range(len(arrivals)):
+            deltas.append(arrivals[i] - self.arrivals[i])
+            deltas.append(departures[i] - self.departures[i])
+        return start, deltas
+
+    def times (
+                self,
+                offset: int,
+                deltas: Optional[list[int]] = None
+            ) -> tuple[list[Optional[int]], list[Optional[int]]]:
+        '''
+        Returns the arrival and departure times of a trip following the
+        pattern.
+
+        Parameters:
+            offset (int):
+                the start time of the trip in seconds
+            deltas (Optional[list[int]]):
+                the interleaved arrival and departure differences of the trip
+                from the reference profile
+
+        Returns:
+            times (tuple[list[Optional[int]], list[Optional[int]]]):
+                the arrival and departure times in seconds, with `None` for
+                blank times
+        '''
+        arrivals, departures = [], []
+        for i in range(len(self.stops)):
+            arr, dep = self.arrivals[i], self.departures[i]
+            if deltas is not None:
+                arr, dep = arr + deltas[2*i], dep + deltas[2*i+1]
+            arrivals.append(None if arr == BLANK else arr + offset)
+            departures.append(None if dep == BLANK else dep + offset)
+        return arrivals, departures
+
+    def timetable (
+                self,
+                trip_id: str,
+                offset: int,
+                deltas: Optional[list[int]] = None
+            ) -> Timetable:
+        '''
+        Returns the `Timetable` of a trip following the pattern.
+
+        Parameters:
+            trip_id (str):
+                the unique ID of the trip
+            offset (int):
+                the start time of the trip in seconds
+            deltas (Optional[list[int]]):
+                the interleaved arrival and departure differences of the trip
+                from the reference profile
+
+        Returns:
+            timetable (Timetable):
+                the `Timetable` of the trip
+        '''
+        arrivals, departures = self.times(offset, deltas)
+        stops: list[StopTime] = []
+        for st, arr, dep in zip(self.stops, arrivals, departures):
+            stop = copy.copy(st)
+            stop.trip_id = trip_id
+            stop.arrival_time = None if arr is None else format_time(arr)
+            stop.departure_time = None if dep is None else format_time(dep)
+            stops.append(stop)
+        return Timetable.from_gtfs(stops)
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import base64
+from typing import Optional, Union
+
+import numpy as np
+import seared as s
+
+
+PRECISION = 1e5
+'''the number of encoded integer units per degree of latitude or longitude'''
+
+RADIUS = 6371008.8
+'''the mean radius of the Earth in meters'''
+
+
+def _decode (steps: Union[str, list[int]]) -> np.ndarray:
+    '''
+    Returns the `int32` steps encoded in `steps`, accepting the `list` form
+    written by earlier versions.
+    '''
+    if not isinstance(steps, str): return np.asarray(steps, dtype='<i4')
+    return np.frombuffer(base64.b64decode(steps), dtype='<i4')
+
+
+def _encode (steps: np.ndarray) -> str:
+    '''
+    Returns the base64 text of the little-endian `int32` values of `steps`.
+    '''
+    return base64.b64encode(
+        np.ascontiguousarray(steps, dtype='<i4').tobytes()
+    ).decode('ascii')
+
+
+def _planar (lats: np.ndarray, lons: np.ndarray, lat0: float) -> np.ndarray:
+    '''
+    Returns an equirectangular projection in meters of `lats` and `lons`
+    around the reference latitude `lat0`.
+    '''
+    k = np.pi / 180 * RADIUS
+    return np.column_stack((lons * k * np.cos(np.radians(lat0)), lats * k))
+
+
+def simplify (xy: np.ndarray, tolerance: float) -> np.ndarray:
+    '''
+    Returns a mask of the points of the polyline `xy` kept by Douglas-Peucker
+    simplification.
+
+    Parameters:
+        xy (np.ndarray):
+            an `(n, 2)` array of planar coordinates in meters
+        tolerance (float):
+            the maximum distance in meters between the polyline and its
+            simplification
+
+    Returns:
+        keep (np.ndarray):
+            a `bool` mask of the points to keep
+    '''
+    keep = np.zeros(len(xy), dtype=bool)
+    if len(xy) == 0: return keep
+    keep[0] = keep[-1] = True
+    stack = [(0, len(xy) - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2: continue
+        seg = xy[b] - xy[a]
+        rel = xy[a+1:b] - xy[a]
+        norm = np.hypot(*seg)
+        if norm == 0:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            keep[a + 1 + i] = True
+            stack.append((a, a + 1 + i))
+            stack.append((a + 1 + i, b))
+    return keep
+
+
+@s.seared
+class Shape(s.Seared):
+    '''
+    A GTFS dataclass model for records found in `shapes.txt`. Describes the
+    path a vehicle travels along for a trip.
+
+    Coordinates are stored as `int32` steps of `1 / PRECISION` degrees, each
+    relative to the previous point, and serialized as base64 text, so reading
+    a mGTFS dataset creates one string per shape rather than an `int` per
+    point. The steps are only decoded into `numpy` arrays on first access.
+
+    Attributes:
+        id (str):
+            the unique ID of the shape
+        coords (np.ndarray):
+            an `(n, 2)` array of the latitude and longitude of each point
+        distances (np.ndarray):
+            the distance in meters along the shape to each point
+        lats (np.ndarray):
+            the delta-encoded latitude of each point, as `int32` steps
+        lons (np.ndarray):
+            the delta-encoded longitude of each point, as `int32` steps
+    '''
+
+    ### ATTRIBUTES ###
+    # Model ID
+    id: str = s.Str(data_key='shape_id', required=True)
+    '''the unique ID of the shape'''
+
+    # Required fields
+    _lats: str = s.Str(data_key='lats', required=True)
+    '''the base64 text of the delta-encoded latitude of each point'''
+    _lons: str = s.Str(data_key='lons', required=True)
+    '''the base64 text of the delta-encoded longitude of each point'''
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def from_points (
+                cls,
+                id: str,
+                lats: np.ndarray,
+                lons: np.ndarray,
+                tolerance: Optional[float] = None
+            ) -> Shape:
+        '''
+        Returns a `Shape` encoding the ordered points `lats` and `lons`,
+        optionally simplified.
+
+        Parameters:
+            id (str):
+                the unique ID of the shape
+            lats (np.ndarray):
+                the latitude of each point
+            lons (np.ndarray):
+                the longitude of each point
+            tolerance (Optional[float]):
+                the Douglas-Peucker tolerance in meters to simplify the shape
+                with, or `None` to keep every point
+
+        Returns:
+            shape (Shape):
+                a `Shape` encoding the points
+        '''
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if tolerance and len(lats) > 2:
+            keep = simplify(_planar(lats, lons, lats.mean()), tolerance)
+            lats, lons = lats[keep], lons[keep]
+        ilats = np.round(lats * PRECISION).astype(np.int64)
+        ilons = np.round(lons * PRECISION).astype(np.int64)
+        return Shape.from_steps(
+            id, np.diff(ilats, prepend=0), np.diff(ilons, prepend=0)
+        )
+
+    @classmethod
+    def from_steps (
+                cls,
+                id: str,
+                lats: np.ndarray,
+                lons: np.ndarray
+            ) -> Shape:
+        '''
+        Returns a `Shape` holding the delta-encoded points `lats` and `lons`.
+
+        Parameters:
+            id (str):
+                the unique ID of the shape
+            lats (np.ndarray):
+                the latitude step of each point (see `Shape.lats`)
+            lons (np.ndarray):
+                the longitude step of each point (see `Shape.lons`)
+
+        Returns:
+            shape (Shape):
+                a `Shape` holding the points
+        '''
+        return Shape(id, _encode(lats), _encode(lons))
+
+
+    ### PROPERTIES ###
+    @property
+    def coords (self) -> np.ndarray:
+        '''an `(n, 2)` array of the latitude and longitude of each point'''
+        coords = getattr(self, '_coords', None)
+        if coords is None:
+            coords = np.column_stack((
+                np.cumsum(self.lats, dtype=np.int64) / PRECISION,
+                np.cumsum(self.lons, dtype=np.int64) / PRECISION
+            ))
+            self._coords = coords
+        return coords
+
+    @property
+    def distances (self) -> np.ndarray:
+        '''the distance in meters along the shape to each point'''
+        xy = self._xy
+        steps = np.hypot(*np.diff(xy, axis=0).T) if len(xy) else xy[:, 0]
+        return np.concatenate(([0.0], np.cumsum(steps)))[:len(xy)]
+
+    @property
+    def lats (self) -> np.ndarray:
+        '''the delta-encoded latitude of each point, as `int32` steps'''
+        return self._decoded()[0]
+
+    @property
+    def lons (self) -> np.ndarray:
+        '''the delta-encoded longitude of each point, as `int32` steps'''
+        return self._decoded()[1]
+
+    @property
+    def _xy (self) -> np.ndarray:
+        coords = self.coords
+        lat0 = coords[:, 0].mean() if len(coords) else 0.0
+        return _planar(coords[:, 0], coords[:, 1], lat0)
+
+
+    ### METHODS ###
+    def _decoded (self) -> tuple[np.ndarray, np.ndarray]:
+        steps = getattr(self, '_steps', None)
+        if steps is None:
+            steps = (_decode(self._lats), _decode(self._lons))
+            self._steps = steps
+        return steps
+
+    def project (self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        '''
+        Returns the distance in meters along the shape of each of the ordered
+        points `lats` and `lons`, found by projecting each point onto the
+        nearest segment at or after the segment of the previous point.
+
+        Parameters:
+            lats (np.ndarray):
+                the latitude of each point
+            lons (np.ndarray):
+                the longitude of each point
+
+        Returns:
+            distances (np.ndarray):
+                the distance in meters along the shape of each point
+        '''
+        coords = self.coords
+        if len(coords) < 2: return np.zeros(len(lats))
+        lat0 = coords[:, 0].mean()
+        xy = _planar(coords[:, 0], coords[:, 1], lat0)
+        pts = _planar(np.asarray(lats), np.asarray(lons), lat0)
+        starts, seg = xy[:-1], np.diff(xy, axis=0)
+        lengths = np.hypot(seg[:, 0], seg[:, 1])
+        cum = np.concatenate(([0.0], np.cumsum(lengths)))
+        sq = np.maximum(lengths ** 2, 1e-12)
+
+        out = np.zeros(len(pts))
+        first = 0
+        for i, p in enumerate(pts):
+            rel = p - starts[first:]
+            t = np.clip((rel * seg[first:]).sum(axis=1) / sq[first:], 0, 1)
+            near = starts[first:] + seg[first:] * t[:, None]
+            j = int(np.argmin(np.hypot(*(near - p).T)))
+            out[i] = cum[first + j] + t[j] * lengths[first + j]
+            first += j
+        return out
@@ -6,6 +6,7 @@ from typing import Optional
 
 import seared as s
 
+from ..util import parse_time
 from .stop_continuity import StopContinuity
 
 
@@ -59,11 +60,14 @@ class StopTime(s.Seared):
         dropoff_type (Optional[StopType]):
             the `StopType` for dropoffs at the stop
         end_time (time):
-            the end time of the stop
+            the end time of the stop as a time of day
         end_offset (bool):
             a `bool` indicating if the stop date should be offset
         end_pickup_dropoff (Optional[str]):
             the end time for pickup and dropoff
+        end_secs (Optional[int]):
+            the end time of the stop in seconds after the start of the \
+            service day
         headsign (Optional[str]):
             the headsign to display when this stop is the destination
         pickup_continuity (Optional[StopContinuity]):
@@ -74,8 +78,11 @@ class StopTime(s.Seared):
             a `bool` indicating if the start date should be offset
         start_pickup_dropoff (Optional[str]):
             the start time for pickup and dropoff
+        start_secs (Optional[int]):
+            the start time of the stop in seconds after the start of the \
+            service day
         start_time (time):
-            the start time of the stop
+            the start time of the stop as a time of day
         timepoint (Timepoint):
             the timepoint of the stop
     '''
@@ -144,14 +151,22 @@ class StopTime(s.Seared):
         '''a `bool` indicating if the end date should be offset'''
         return int(self._end_time_str[:2]) >= 24
     
+    @property
+    def end_secs (self) -> Optional[int]:
+        '''
+        the end time of the stop in seconds after the start of the service day
+        '''
+        t = self._end_time_str
+        return None if t is None else parse_time(t)
+
     @property
     def end_time (self) -> time:
-        '''the end time of the stop'''
+        '''the end time of the stop as a time of day'''
         t = self._end_time_str
         return time(
-            hour = 0 if int(t[:2]) >= 24 else int(t[:2]),
+            hour = int(t[:2]) % 24,
             minute = int(t[3:5]),
-            seconds = int(t[6:8])
+            second = int(t[6:8])
         )
         
     @property
@@ -166,15 +181,24 @@ class StopTime(s.Seared):
     def start_offset (self) -> bool:
         '''a `bool` indicating if the start date should be offset'''
         return int(self._start_time_str[:2]) >= 24
+    
+    @property
+    def start_secs (self) -> Optional[int]:
+        '''
+        the start time of the stop in seconds after the start of the service \
+        day
+        '''
+        t = self._start_time_str
+        return None if t is None else parse_time(t)
         
     @property
     def start_time (self) -> time:
-        '''the start time of the stop'''
+        '''the start time of the stop as a time of day'''
         t = self._start_time_str
         return time(
-            hour = 0 if int(t[:2]) >= 24 else int(t[:2]),
+            hour = int(t[:2]) % 24,
             minute = int(t[3:5]),
-            seconds = int(t[6:8])
+            second = int(t[6:8])
         )
         
     @property
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime, time
+from datetime import datetime
 from typing import Optional
+import warnings
 
 import seared as s
 
+from ..util import time_secs
 from .stop_time import StopTime
 
 
@@ -96,8 +98,25 @@ class Timetable(s.Seared):
     
 
     ### METHODS ###
-    def between (self, start: time, end: time) -> bool:
-        return self.start <= end and self.end >= start
+    def between (self, start: int, end: int) -> bool:
+        '''
+        Returns a `bool` indicating if the `Timetable` runs at any time from
+        `start` to `end`, both in seconds after the start of the service day.
+
+        Parameters:
+            start (int):
+                the start of the window in seconds after the start of the \
+                service day
+            end (int):
+                the end of the window in seconds after the start of the \
+                service day
+
+        Returns:
+            a `bool` indicating if the `Timetable` runs at any time from
+            `start` to `end`
+        '''
+        if not self.data: return False
+        return self.start.start_secs <= end and self.end.end_secs >= start
 
     def connects (self, stop_a_id: str, stop_b_id: str) -> bool:
         '''
@@ -119,24 +138,48 @@ class Timetable(s.Seared):
         
     @property
     def location (self) -> tuple[Optional[StopTime], Optional[StopTime]]:
-        t = datetime.now().time()
-        if (self.start.start_time <= t and t <= self.end.end_time) or \
-                (self.start.start_time <= t and self.end.end_offset) or \
-                (self.end.end_offset and t <= self.end.end_time):
-            stops = self.stops
-            for i in range(len(stops - 1)):
-                a, b = stops[i], stops[i+1]
-                if (a.start_time <= t and t <= b.end_time) or \
-                        (a.start_time <= t and b.end_offset) or \
-                        (b.end_offset and t <= b.end_time):
-                    return a, b
-        else:
-            tm = t.hour * 60 + t.minute
-            sm = self.start.start_time.hour * 60 + self.start.start_time.minute
-            em = self.end.end_time.hour * 60 + self.end.end_time.minute
-            tts = abs(tm - sm)
-            tte = abs(tm - em)
-            if tts < tte:
-                return None, self.start
-            else:
-                return self.end, None
\ No newline at end of file
+        '''
+        the `StopTime` records on either side of the current wall clock time,
+        read as seconds after the start of the service day (see
+        `Timetable.location_at`); deprecated, since times past midnight of
+        the previous service day are never matched
+        '''
+        warnings.warn(
+            'Timetable.location is deprecated; use Timetable.location_at',
+            DeprecationWarning,
+            stacklevel=2
+        )
+        return self.location_at(time_secs(datetime.now().time()))
+
+    def location_at (
+                self, 
+                secs: int
+            ) -> tuple[Optional[StopTime], Optional[StopTime]]:
+        '''
+        Returns the `StopTime` records on either side of `secs`, in seconds
+        after the start of the service day. If `secs` is before the first
+        stop, the first element is `None`; if `secs` is after the last stop,
+        the second element is `None`. Stops without times are skipped.
+
+        Parameters:
+            secs (int):
+                the time to locate in seconds after the start of the service
+                day
+
+        Returns:
+            location (tuple[Optional[StopTime], Optional[StopTime]]):
+                the `StopTime` records on either side of `secs`
+        '''
+        stops = [
+            st for st in self.stops
+            if st.start_secs is not None or st.end_secs is not None
+        ]
+        if not stops: return None, None
+        first = stops[0]
+        arrival = first.end_secs if first.start_secs is None \
+            else first.start_secs
+        if secs < arrival: return None, first
+        for a, b in zip(stops, stops[1:]):
+            departure = b.start_secs if b.end_secs is None else b.end_secs
+            if secs <= departure: return a, b
+        return stops[-1], None
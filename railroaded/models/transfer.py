@@ -0,0 +1,70 @@
+from enum import Enum
+from typing import Optional
+
+import seared as s
+
+
+class TransferType(Enum):
+    '''
+    An `Enum` describing the kind of connection between two stops.
+    '''
+    RECOMMENDED = 0
+    TIMED = 1
+    MINIMUM_TIME = 2
+    IMPOSSIBLE = 3
+    IN_SEAT = 4
+    RE_BOARD = 5
+
+
+@s.seared
+class Transfer(s.Seared):
+    '''
+    A GTFS dataclass model for records found in `transfers.txt`. Describes a
+    connection between two stops, optionally limited to specific routes or
+    trips.
+
+    Attributes:
+        from_route_id (Optional[str]):
+            the unique ID of the route the transfer starts from
+        from_stop_id (Optional[str]):
+            the unique ID of the stop the transfer starts from
+        from_trip_id (Optional[str]):
+            the unique ID of the trip the transfer starts from
+        to_route_id (Optional[str]):
+            the unique ID of the route the transfer ends on
+        to_stop_id (Optional[str]):
+            the unique ID of the stop the transfer ends at
+        to_trip_id (Optional[str]):
+            the unique ID of the trip the transfer ends on
+        min_time (Optional[int]):
+            the time in seconds needed to make the transfer
+        type (TransferType):
+            the `TransferType` of the transfer
+    '''
+
+    ### ATTRIBUTES ###
+    # Foreign IDs
+    from_route_id: Optional[str] = s.Str()
+    '''the unique ID of the route the transfer starts from'''
+    from_stop_id: Optional[str] = s.Str()
+    '''the unique ID of the stop the transfer starts from'''
+    from_trip_id: Optional[str] = s.Str()
+    '''the unique ID of the trip the transfer starts from'''
+    to_route_id: Optional[str] = s.Str()
+    '''the unique ID of the route the transfer ends on'''
+    to_stop_id: Optional[str] = s.Str()
+    '''the unique ID of the stop the transfer ends at'''
+    to_trip_id: Optional[str] = s.Str()
+    '''the unique ID of the trip the transfer ends on'''
+
+    # Required fields
+    type: TransferType = s.Enum(
+        data_key='transfer_type',
+        enum=TransferType,
+        missing=TransferType.RECOMMENDED
+    )
+    '''the `TransferType` of the transfer'''
+
+    # Optional fields
+    min_time: Optional[int] = s.Int(data_key='min_transfer_time')
+    '''the time in seconds needed to make the transfer'''
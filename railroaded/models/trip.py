@@ -1,13 +1,23 @@
-from datetime import time
+from __future__ import annotations
+
+from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+import warnings
 
 import seared as s
 
+from ..util import time_secs
 from .accessibility import Accessibility
+from .frequency import Frequency
+from .pattern import Pattern
+from .shape import Shape
 from .stop_time import StopTime
 from .timetable import Timetable
 
+if TYPE_CHECKING:
+    from ..timeline import Timeline
+
 
 class BikesAllowed(Enum):
     '''
@@ -29,6 +39,8 @@ class Trip(s.Seared):
             the unique ID of the trip
         block_id (Optional[str]):
             the unique ID of the block the trip belongs to
+        pattern_id (Optional[str]):
+            the unique ID of the `Pattern` the trip follows
         route_id (str):
             the unique ID of the route the trip belongs to
         service_id (str):
@@ -39,14 +51,31 @@ class Trip(s.Seared):
             the `Accessibility` of the trip
         bikes (BikesAllowed):
             the `BikesAllowed` of the trip
+        deltas (Optional[list[int]]):
+            the interleaved arrival and departure differences in seconds of \
+            the trip from the reference profile of its `Pattern`, if its \
+            running times differ
         direction (Optional[bool]):
             the direction of the trip
+        frequencies (Optional[list[Frequency]]):
+            the `Frequency` records describing headway-based runs of the trip, \
+            if the trip is a template for frequency-based service
         headsign (Optional[str]):
             the headsign to display for the trip
+        offset (Optional[int]):
+            the start time of the trip in seconds after the start of the \
+            service day, if it follows a `Pattern`
+        pattern (Optional[Pattern]):
+            the `Pattern` the trip follows, once bound by its `Trips` table
+        shape (Optional[Shape]):
+            the `Shape` of the trip, once bound by its `Trips` table
         short_name (Optional[str]):
             a short name for the trip
+        stop_ids (list[str]):
+            the unique ID of each stop of the trip in order
         timetable (Timetable):
-            the `Timetable` associated with the trip
+            the `Timetable` associated with the trip, built from its \
+            `Pattern` on access if the trip follows one
     '''
 
     ### ATTRIBUTES ###
@@ -57,6 +86,8 @@ class Trip(s.Seared):
     # Foreign IDs
     block_id: Optional[str] = s.Str()
     '''the unique ID of the block the trip belongs to'''
+    pattern_id: Optional[str] = s.Str()
+    '''the unique ID of the `Pattern` the trip follows'''
     route_id: str = s.Str(required=True)
     '''the unique ID of the route the trip belongs to'''
     service_id: str = s.Str(required=True)
@@ -77,21 +108,98 @@ class Trip(s.Seared):
         missing=BikesAllowed.UNKNOWN
     )
     '''the `BikesAllowed` of the trip'''
-    timetable: Timetable = s.T(schema=Timetable.SCHEMA)
-    '''the `Timetable` associated with the trip'''
 
     # Optional fields
+    deltas: Optional[list[int]] = s.Int(many=True)
+    '''
+    the interleaved arrival and departure differences in seconds of the trip
+    from the reference profile of its `Pattern`, if its running times differ
+    '''
     direction: Optional[bool] = s.Str(data_key='direction_id')
     '''the direction of the trip'''
+    frequencies: Optional[list[Frequency]] = s.T(
+        schema=Frequency.SCHEMA, many=True
+    )
+    '''
+    the `Frequency` records describing headway-based runs of the trip, if the
+    trip is a template for frequency-based service
+    '''
     headsign: Optional[str] = s.Str(data_key='trip_headsign')
     '''the headsign to display for the trip'''
+    offset: Optional[int] = s.Int()
+    '''
+    the start time of the trip in seconds after the start of the service day,
+    if it follows a `Pattern`
+    '''
     short_name: Optional[str] = s.Str(data_key='trip_short_name')
     '''a short name for the trip'''
+    _timetable: Optional[Timetable] = s.T(
+        data_key='timetable', schema=Timetable.SCHEMA
+    )
+    '''the stored `Timetable` of a trip that does not follow a `Pattern`'''
+
+
+    ### PROPERTIES ###
+    @property
+    def pattern (self) -> Optional[Pattern]:
+        '''the `Pattern` the trip follows, once bound by its `Trips` table'''
+        return getattr(self, '_pattern', None)
+    
+    @pattern.setter
+    def pattern (self, pattern: Optional[Pattern]):
+        self._pattern = pattern
+
+    @property
+    def shape (self) -> Optional[Shape]:
+        '''
+        the `Shape` of the trip, once bound by its `Trips` table; its points
+        are only decoded on first access
+        '''
+        return getattr(self, '_shape', None)
+
+    @shape.setter
+    def shape (self, shape: Optional[Shape]):
+        self._shape = shape
+    
+    @property
+    def stop_ids (self) -> list[str]:
+        '''the unique ID of each stop of the trip in order'''
+        if self._timetable is None: return self.pattern.stop_ids
+        return [st.stop_id for st in self._timetable.stops]
+
+    @property
+    def timetable (self) -> Timetable:
+        '''
+        the `Timetable` associated with the trip, built from its `Pattern` on
+        access if the trip follows one
+        '''
+        if self._timetable is not None: return self._timetable
+        return self.pattern.timetable(self.id, self.offset, self.deltas)
+    
+    @timetable.setter
+    def timetable (self, timetable: Timetable):
+        self._timetable = timetable
 
 
     ### METHODS ###
-    def between (self, start: time, end: time) -> bool:
-        return self.timetable.between(start, end)
+    def between (self, start: int, end: int) -> bool:
+        '''
+        Returns a `bool` indicating if the `Trip` runs at any time from
+        `start` to `end`, both in seconds after the start of the service day.
+
+        Parameters:
+            start (int):
+                the start of the window in seconds after the start of the \
+                service day
+            end (int):
+                the end of the window in seconds after the start of the \
+                service day
+
+        Returns:
+            a `bool` indicating if the `Trip` runs at any time from `start` to
+            `end`
+        '''
+        return len(self.runs(start, end)) > 0
 
     def connects (self, stop_a_id: str, stop_b_id: str) -> bool:
         '''
@@ -110,8 +218,113 @@ class Trip(s.Seared):
             contains chronologically ordered entries for both `stop_a_id` and 
             `stop_b_id`.
         '''
-        return self.timetable.connects(stop_a_id, stop_b_id)
+        if self._timetable is None: 
+            return self.pattern.connects(stop_a_id, stop_b_id)
+        return self._timetable.connects(stop_a_id, stop_b_id)
     
     @property
     def location (self) -> tuple[Optional[StopTime], Optional[StopTime]]:
-        return self.timetable.location
\ No newline at end of file
+        '''
+        the `StopTime` records of the trip on either side of the current wall
+        clock time, read as seconds after the start of the service day;
+        deprecated, since it ignores the service calendar and times past
+        midnight of the previous service day (use `location_at` with the
+        `Timeline` of the dataset)
+        '''
+        warnings.warn(
+            'Trip.location is deprecated; use Trip.location_at with '
+            'gtfs.timeline',
+            DeprecationWarning,
+            stacklevel=2
+        )
+        secs = time_secs(datetime.now().time())
+        offset = (self.runs(secs, secs) or [0])[0]
+        return self.timetable.location_at(secs - offset)
+
+    def location_at (
+                self, 
+                when: datetime,
+                timeline: Timeline
+            ) -> tuple[Optional[StopTime], Optional[StopTime]]:
+        '''
+        Returns the `StopTime` records of the trip on either side of `when`.
+
+        `when` is converted through `timeline` to seconds after the start of
+        each service day that can overlap it, and the trip is located on the
+        first of those days on which its service is active and one of its
+        runs (see `runs`) is in progress. A trip with frequencies returns
+        the records of its template `Timetable`. If no run is in progress,
+        the trip is located against the run of the service day of `when`
+        that last started before it, or else its first run.
+
+        Parameters:
+            when (datetime):
+                the instant to locate, in the agency timezone if naive
+            timeline (Timeline):
+                the `Timeline` of the dataset holding the trip
+
+        Returns:
+            location (tuple[Optional[StopTime], Optional[StopTime]]):
+                the `StopTime` records on either side of `when`
+        '''
+        timetable = self.timetable
+        for d, secs, _ in timeline.days(when):
+            if self.service_id not in timeline.active(d): continue
+            for offset in self.runs(secs, secs):
+                return timetable.location_at(secs - offset)
+        when = timeline.localize(when)
+        secs = int((when - timeline.origin(when.date())).total_seconds())
+        past = self.runs(0, secs)
+        offset = past[-1] if past \
+            else (self.runs(secs, timeline.span) or [0])[0]
+        return timetable.location_at(secs - offset)
+    
+    def runs (self, start: int, end: int) -> list[int]:
+        '''
+        Returns the offset in seconds to add to the `Timetable` of the `Trip`
+        for each run that is running at any time from `start` to `end`.
+
+        A trip without frequencies has a single run with an offset of `0`,
+        and a trip without stop times has no runs.
+
+        Parameters:
+            start (int):
+                the start of the window in seconds after the start of the \
+                service day
+            end (int):
+                the end of the window in seconds after the start of the \
+                service day
+
+        Returns:
+            offsets (list[int]):
+                the offset in seconds of each overlapping run
+        '''
+        arrivals, departures = self.times()
+        if not arrivals: return []
+        if not self.frequencies:
+            first = departures[0] if arrivals[0] is None else arrivals[0]
+            last = arrivals[-1] if departures[-1] is None else departures[-1]
+            return [0] if first <= end and last >= start else []
+        first = arrivals[0] if departures[0] is None else departures[0]
+        last = departures[-1] if arrivals[-1] is None else arrivals[-1]
+        duration = last - first
+        return [
+            run - first
+            for f in self.frequencies
+            for run in f.runs(start, end, duration)
+        ]
+    
+    def times (self) -> tuple[list[Optional[int]], list[Optional[int]]]:
+        '''
+        Returns the arrival and departure time of each stop of the trip in
+        order, without building its `Timetable`.
+
+        Returns:
+            times (tuple[list[Optional[int]], list[Optional[int]]]):
+                the arrival and departure times in seconds after the start of
+                the service day, with `None` for blank times
+        '''
+        if self._timetable is None:
+            return self.pattern.times(self.offset, self.deltas)
+        stops = self._timetable.stops
+        return [st.start_secs for st in stops], [st.end_secs for st in stops]
\ No newline at end of file
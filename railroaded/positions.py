@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from .index import StopTimeIndex
+
+
+class Positions:
+    '''
+    The estimated positions of a set of active trips at a single instant.
+
+    Each attribute is aligned so that position `i` of every array describes
+    the same trip.
+
+    Attributes:
+        trip_ids (list[str]):
+            the unique ID of each active trip
+        departures (np.ndarray):
+            the departure time of each trip from its first stop in seconds 
+            after the start of its service day, which distinguishes runs of
+            frequency-based trips
+        prev_stop_ids (list[str]):
+            the unique ID of the stop each trip most recently departed or is
+            dwelling at
+        next_stop_ids (list[str]):
+            the unique ID of the next stop of each trip
+        progress (np.ndarray):
+            the fraction of the time between the previous and next stop that
+            each trip has completed
+        lat (Optional[np.ndarray]):
+            the interpolated latitude of each trip, if stop coordinates were
+            available
+        lon (Optional[np.ndarray]):
+            the interpolated longitude of each trip, if stop coordinates were
+            available
+    '''
+
+    def __init__ (
+                self,
+                trip_ids: list[str],
+                departures: np.ndarray,
+                prev_stop_ids: list[str],
+                next_stop_ids: list[str],
+                progress: np.ndarray,
+                lat: Optional[np.ndarray] = None,
+                lon: Optional[np.ndarray] = None
+            ):
+        self.trip_ids = trip_ids
+        self.departures = departures
+        self.prev_stop_ids = prev_stop_ids
+        self.next_stop_ids = next_stop_ids
+        self.progress = progress
+        self.lat = lat
+        self.lon = lon
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def join (cls, parts: list[Positions]) -> Positions:
+        '''
+        Returns a single `Positions` containing every trip in `parts`.
+
+        Parameters:
+            parts (list[Positions]):
+                the `Positions` to join
+
+        Returns:
+            positions (Positions):
+                a `Positions` containing every trip in `parts`
+        '''
+        coords = len(parts) > 0 and all(p.lat is not None for p in parts)
+        return Positions(
+            [tid for p in parts for tid in p.trip_ids],
+            np.concatenate([p.departures for p in parts]) \
+                if parts else np.zeros(0, dtype=np.int64),
+            [sid for p in parts for sid in p.prev_stop_ids],
+            [sid for p in parts for sid in p.next_stop_ids],
+            np.concatenate([p.progress for p in parts]) \
+                if parts else np.zeros(0),
+            np.concatenate([p.lat for p in parts]) if coords else None,
+            np.concatenate([p.lon for p in parts]) if coords else None
+        )
+
+
+    ### MAGIC METHODS ###
+    def __len__ (self) -> int:
+        return len(self.trip_ids)
+
+
+def estimate (
+            index: StopTimeIndex,
+            rows: np.ndarray,
+            t: int,
+            coords: Optional[tuple[np.ndarray, np.ndarray]] = None,
+            shifts: Optional[np.ndarray] = None
+        ) -> Positions:
+    '''
+    Returns the estimated `Positions` at `t` of the trips at `rows` that are
+    running at `t`.
+
+    Parameters:
+        index (StopTimeIndex):
+            the `StopTimeIndex` containing the trips
+        rows (np.ndarray):
+            the candidate trip rows, typically every run active on the
+            service day
+        t (int):
+            the time in seconds after the start of the service day
+        coords (Optional[tuple[np.ndarray, np.ndarray]]):
+            the latitude and longitude of each stop index, used to
+            interpolate trip coordinates
+        shifts (Optional[np.ndarray]):
+            the shift in seconds of each entry in `rows` (see
+            `StopTimeIndex.instances`)
+
+    Returns:
+        positions (Positions):
+            the estimated `Positions` of the trips running at `t`
+    '''
+    if shifts is None: shifts = np.zeros(len(rows), dtype=np.int64)
+    timed = index.offsets[rows + 1] - index.offsets[rows] > 1
+    rows, shifts = rows[timed], shifts[timed]
+    local = t - shifts
+    starts = index.offsets[rows]
+    ends = index.offsets[rows + 1] - 1
+    running = \
+        (index.arrivals[starts] <= local) & (local <= index.arrivals[ends])
+    rows, local = rows[running], local[running]
+    shifts = shifts[running]
+
+    prev = index.locate(rows, local)
+    leave = index.departures[prev]
+    travel = np.maximum(index.arrivals[prev + 1] - leave, 1)
+    progress = np.clip((local - leave) / travel, 0.0, 1.0)
+
+    stop_ids = index.stop_ids
+    a, b = index.stops[prev], index.stops[prev + 1]
+    lat = lon = None
+    if coords is not None:
+        lats, lons = coords
+        lat = lats[a] + (lats[b] - lats[a]) * progress
+        lon = lons[a] + (lons[b] - lons[a]) * progress
+
+    return Positions(
+        [index.trip_ids[r] for r in rows],
+        index.departures[index.offsets[rows]] + shifts,
+        [stop_ids[i] for i in a],
+        [stop_ids[i] for i in b],
+        progress,
+        lat,
+        lon
+    )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+from typing import Optional, Union
+
+
+class Profile:
+    '''
+    A named selection of the columns read from each GTFS file. Columns left
+    out of a profile are never parsed or stored, so the fields they hold keep
+    their defaults. Files a profile does not list are read in full.
+
+    Attributes:
+        name (str):
+            the name of the profile, recorded in every mGTFS dataset built
+            with it
+        columns (dict[str, frozenset[str]]):
+            the columns read from each GTFS file, by file name
+    '''
+
+    def __init__ (
+                self,
+                name: str,
+                columns: Optional[dict[str, set[str]]] = None
+            ):
+        self.name = name
+        self.columns = {
+            file: frozenset(cols) for file, cols in (columns or {}).items()
+        }
+
+
+    ### MAGIC METHODS ###
+    def __repr__ (self) -> str:
+        return f'Profile({self.name!r})'
+
+
+    ### METHODS ###
+    def usecols (self, path: str) -> Optional[frozenset[str]]:
+        '''
+        Returns the columns to read from the GTFS file at `path`.
+
+        Parameters:
+            path (str):
+                the path of the GTFS file
+
+        Returns:
+            columns (Optional[frozenset[str]]):
+                the columns to read, or `None` to read every column
+        '''
+        return self.columns.get(os.path.basename(path), None)
+
+
+FULL = Profile('full')
+'''reads every column of every GTFS file'''
+
+ROUTING = Profile('routing', {
+    'agency.txt': {
+        'agency_id', 'agency_name', 'agency_timezone', 'agency_url'
+    },
+    'routes.txt': {
+        'agency_id', 'route_id', 'route_long_name', 'route_short_name',
+        'route_type'
+    },
+    'stop_times.txt': {
+        'arrival_time', 'departure_time', 'drop_off_type', 'pickup_type',
+        'shape_dist_traveled', 'stop_id', 'stop_sequence', 'trip_id'
+    },
+    'stops.txt': {
+        'location_type', 'parent_id', 'stop_id', 'stop_lat', 'stop_lon',
+        'stop_name'
+    },
+    'trips.txt': {
+        'direction_id', 'route_id', 'service_id', 'shape_id', 'trip_id'
+    }
+})
+'''
+reads only the columns needed to route and to place trips: IDs, names,
+coordinates, stop times and pickup and drop off types
+'''
+
+PROFILES: dict[str, Profile] = { p.name: p for p in (FULL, ROUTING) }
+'''every built-in `Profile`, by name'''
+
+
+def resolve (profile: Union[str, Profile, None]) -> Profile:
+    '''
+    Returns the `Profile` named `profile`, `profile` itself if it is already a
+    `Profile`, or `FULL` if it is `None`.
+
+    Parameters:
+        profile (Union[str, Profile, None]):
+            the `Profile` or the name of a built-in `Profile`
+
+    Returns:
+        profile (Profile):
+            the resolved `Profile`
+    '''
+    if profile is None: return FULL
+    if isinstance(profile, Profile): return profile
+    if profile not in PROFILES:
+        raise ValueError(
+            f'unknown profile {profile!r}; expected one of '
+            f'{", ".join(sorted(PROFILES))}'
+        )
+    return PROFILES[profile]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+from .models import StopTime, Trip
+
+
+def slotted (cls: type, name: str, extra: tuple[str, ...] = ()) -> type:
+    '''
+    Returns a `__slots__` variant of the seared dataclass model `cls`, built
+    from the same field declarations. Its records have no per-instance
+    `__dict__`, but keep the fields, properties, methods and `SCHEMA` of
+    `cls`, so they are read, written and serialized exactly like `cls`
+    records.
+
+    Parameters:
+        cls (type):
+            the seared dataclass model to build the variant of
+        name (str):
+            the name of the variant, which must be a global of this module so
+            that its records can be pickled
+        extra (tuple[str, ...]):
+            the names of the private attributes set on `cls` records besides
+            their fields
+
+    Returns:
+        record (type):
+            the `__slots__` variant of `cls`
+    '''
+    fields = tuple(f.name for f in dataclasses.fields(cls))
+    ns: dict[str, Any] = {}
+    for base in reversed(cls.__mro__[:-1]):
+        ns.update(base.__dict__)
+    for key in fields + ('__dict__', '__weakref__'):
+        ns.pop(key, None)
+    ns['__slots__'] = fields + extra
+    ns['__module__'] = __name__
+    ns['__qualname__'] = name
+    ns['_model'] = cls
+    return type(name, (), ns)
+
+
+StopTimeRecord = slotted(StopTime, 'StopTimeRecord')
+'''the `__slots__` variant of `StopTime`'''
+TripRecord = slotted(Trip, 'TripRecord', ('_pattern', '_shape'))
+'''the `__slots__` variant of `Trip`'''
+
+RECORDS: dict[type, type] = {
+    StopTime: StopTimeRecord,
+    Trip: TripRecord
+}
+'''the `__slots__` variant of every high-cardinality model'''
+
+
+def record (obj: Any) -> Any:
+    '''
+    Returns a copy of the `StopTime` or `Trip` record `obj` as its
+    `__slots__` variant, or `obj` itself if it already is one or its model
+    has no variant.
+
+    Parameters:
+        obj (Any):
+            the record to convert
+
+    Returns:
+        record (Any):
+            the `__slots__` record
+    '''
+    cls = RECORDS.get(type(obj), None)
+    if cls is None: return obj
+    rec = object.__new__(cls)
+    attrs = vars(obj)
+    for key in cls.__slots__:
+        if key in attrs: setattr(rec, key, attrs[key])
+    return rec
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+
+BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float('inf')
+)
+'''the upper bounds in seconds of the latency histogram buckets'''
+
+logger = logging.getLogger('railroaded.queries')
+'''the logger slow queries are logged to, as warnings'''
+
+
+def size (result: Any) -> int:
+    '''
+    Returns the number of records in a query result: the number of trips of
+    a `GTFS` object, the number of elements of an array, or the length of
+    any other sized result.
+
+    Parameters:
+        result (Any):
+            the query result
+
+    Returns:
+        size (int):
+            the number of records in `result`
+    '''
+    trips = getattr(result, 'trips', None)
+    if trips is not None and hasattr(trips, 'data'): return len(trips.data)
+    if isinstance(result, np.ndarray): return result.size
+    try:
+        return len(result)
+    except TypeError:
+        return 0 if result is None else 1
+
+
+class QueryStats:
+    '''
+    Counters of the calls, table rows, records returned and latencies of
+    every query method of `GTFS` objects, safe to share between threads.
+
+    Every call is counted, including those answered from a `QueryCache`,
+    whose latency is then the time of the lookup (see `QueryCache.stats` for
+    hits and misses). The table rows of a query are the size of the table it
+    runs over, such as the trips or stop times of the instance, not the rows
+    it actually touched.
+
+    Attributes:
+        enabled (bool):
+            whether queries are counted; when disabled, a query only checks
+            this flag
+        threshold (Optional[float]):
+            the latency in seconds above which a query is logged with its
+            arguments to `logger`, or `None` to log no queries
+    '''
+
+    def __init__ (
+                self,
+                enabled: bool = True,
+                threshold: Optional[float] = None
+            ):
+        self.enabled = enabled
+        self.threshold = threshold
+        self._counters: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+
+    ### METHODS ###
+    def record (
+                self,
+                name: str,
+                seconds: float,
+                table_rows: int,
+                returned: int,
+                args: tuple = (),
+                kwargs: Optional[dict[str, Any]] = None
+            ):
+        '''
+        Counts one execution of the query `name`, and logs it if it took
+        longer than `threshold`.
+
+        Parameters:
+            name (str):
+                the name of the query
+            seconds (float):
+                the latency of the query in seconds
+            table_rows (int):
+                the number of rows of the table the query runs over
+            returned (int):
+                the number of records the query returned
+            args (tuple):
+                the positional arguments of the query, for logging
+            kwargs (Optional[dict[str, Any]]):
+                the keyword arguments of the query, for logging
+        '''
+        slow = self.threshold is not None and seconds > self.threshold
+        bucket = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            counter = self._counters.get(name, None)
+            if counter is None:
+                counter = [0, 0, 0, 0.0, 0, [0] * len(BUCKETS)]
+                self._counters[name] = counter
+            counter[0] += 1
+            counter[1] += table_rows
+            counter[2] += returned
+            counter[3] += seconds
+            counter[4] += slow
+            counter[5][bucket] += 1
+        if slow:
+            logger.warning(
+                'slow query %s(%s) took %.4fs over %d rows, returned %d',
+                name,
+                ', '.join(
+                    [repr(a)[:80] for a in args] +
+                    [f'{k}={v!r}'[:80] for k, v in (kwargs or {}).items()]
+                ),
+                seconds,
+                table_rows,
+                returned
+            )
+
+    def reset (self):
+        '''
+        Resets every counter.
+        '''
+        with self._lock:
+            self._counters.clear()
+
+    def snapshot (self) -> dict[str, dict[str, Any]]:
+        '''
+        Returns a copy of every counter, for export as metrics.
+
+        Returns:
+            snapshot (dict[str, dict[str, Any]]):
+                the `calls`, `table_rows`, records `returned`, total
+                `seconds`, `slow` calls and the latency histogram `buckets`
+                (the number of calls no slower than each bound of `BUCKETS`,
+                not cumulative) of every query called
+        '''
+        with self._lock:
+            return {
+                name: {
+                    'calls': calls,
+                    'table_rows': table_rows,
+                    'returned': returned,
+                    'seconds': seconds,
+                    'slow': slow,
+                    'buckets': dict(zip(BUCKETS, buckets))
+                }
+                for name, (
+                    calls, table_rows, returned, seconds, slow, buckets
+                ) in self._counters.items()
+            }
+
+
+queries = QueryStats()
+'''the `QueryStats` counting every query of every `GTFS` object'''
+
+
+def counted (table_rows: Callable[[Any], int]) -> Callable:
+    '''
+    Returns a decorator counting the calls of a `GTFS` query method in
+    `queries`. It must wrap `memoized`, so that calls answered from a
+    `QueryCache` are counted too.
+
+    Parameters:
+        table_rows (Callable[[GTFS], int]):
+            a function returning the number of rows of the table the query
+            runs over on the instance it was called on, called once the query
+            returns
+
+    Returns:
+        decorator (Callable):
+            a decorator for `GTFS` query methods
+    '''
+    def decorator (method: Callable) -> Callable:
+        name = method.__name__
+
+        @functools.wraps(method)
+        def wrapper (self, *args, **kwargs):
+            if not queries.enabled: return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            result = method(self, *args, **kwargs)
+            queries.record(
+                name,
+                time.perf_counter() - start,
+                table_rows(self),
+                size(result),
+                args,
+                kwargs
+            )
+            return result
+
+        return wrapper
+    return decorator
@@ -0,0 +1,474 @@
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, Iterator, Mapping
+import io
+import json
+import mmap
+from multiprocessing import resource_tracker, shared_memory
+import pickle
+import struct
+import weakref
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+
+from .gtfs import GTFS, TABLES
+from .index import StopTimeIndex
+from .models import Pattern, Shape, Trip
+from .tables import Trips, Unloaded
+
+
+_ALIGN = 64
+_ARRAYS = ('offsets', 'stops', 'arrivals', 'departures', 'keys')
+_HEADER = struct.Struct('<Q')
+
+
+def _align (n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def _dump (trip: Trip) -> bytes:
+    # Patterns and shapes are stored once in their own tables, so each trip
+    # stores their IDs instead of holding copies.
+    out = io.BytesIO()
+    _Pickler(out, protocol=pickle.HIGHEST_PROTOCOL).dump(trip)
+    return out.getvalue()
+
+
+def _pack (gtfs: GTFS) -> tuple[bytes, list[tuple[int, bytes]], int]:
+    index = gtfs.index
+    eager: dict[str, object] = {}
+    blobs: dict[str, bytes] = {}
+    for key in TABLES:
+        table = getattr(gtfs, key)
+        if table is None or isinstance(table, Unloaded): eager[key] = table
+        elif key != 'trips':
+            blobs[key] = pickle.dumps(table, protocol=pickle.HIGHEST_PROTOCOL)
+
+    trips = gtfs.trips
+    records = [_dump(trips.data[id]) for id in index.trip_ids]
+    route_ids = sorted({ trips.data[id].route_id for id in index.trip_ids })
+    codes = { id: i for i, id in enumerate(route_ids) }
+    blobs['patterns'] = pickle.dumps(
+        trips.patterns, protocol=pickle.HIGHEST_PROTOCOL
+    )
+    blobs['records'] = b''.join(records)
+    blobs['meta'] = pickle.dumps({
+        'name': gtfs.name,
+        'profile': gtfs.profile,
+        'tables': eager,
+        'route_ids': route_ids,
+        'trip_ids': index.trip_ids,
+        'service_ids': index.service_ids,
+        'stop_ids': index.stop_ids,
+        'frequencies': index.frequencies
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    arrays = { name: getattr(index, name) for name in _ARRAYS }
+    arrays['records'] = np.cumsum(
+        [0] + [len(r) for r in records], dtype=np.int64
+    )
+    arrays['routes'] = np.array(
+        [codes[trips.data[id].route_id] for id in index.trip_ids],
+        dtype=np.int32
+    )
+    layout: dict[str, dict[str, list]] = { 'arrays': {}, 'blobs': {} }
+    parts: list[tuple[int, bytes]] = []
+    # The header is written first, so reserve a generous page for it.
+    reserved = cursor = _align(_HEADER.size + 4096)
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        layout['arrays'][name] = [cursor, array.dtype.str, len(array)]
+        parts.append((cursor, array.tobytes()))
+        cursor = _align(cursor + array.nbytes)
+    for name, blob in blobs.items():
+        layout['blobs'][name] = [cursor, len(blob)]
+        parts.append((cursor, blob))
+        cursor += len(blob)
+
+    header = json.dumps(layout).encode()
+    assert _HEADER.size + len(header) <= reserved
+    return _HEADER.pack(len(header)) + header, parts, cursor
+
+
+class _Pickler (pickle.Pickler):
+
+    def persistent_id (self, obj: object) -> Optional[tuple[str, str]]:
+        if not isinstance(obj, (Pattern, Shape)): return None
+        return type(obj).__name__, obj.id
+
+
+class _Unpickler (pickle.Unpickler):
+
+    def __init__ (
+                self,
+                file: io.BytesIO,
+                resolve: Callable[[str, str], object]
+            ):
+        super().__init__(file)
+        self._resolve = resolve
+
+    def persistent_load (self, pid: tuple[str, str]) -> object:
+        return self._resolve(*pid)
+
+
+class _Records (Mapping):
+    # The `Trip` records of a `FeedStore` by ID, in the order of the rows of
+    # its `StopTimeIndex`. Each record is decoded from the shared arena on
+    # every access and never kept, so a process only holds the records its
+    # queries return. `decoded` counts the records decoded so far. The
+    # `GTFS` is only weakly referenced, so that dropping it releases the
+    # views of the index into the arena.
+
+    def __init__ (
+                self,
+                store: FeedStore,
+                gtfs: GTFS,
+                patterns: dict[str, Pattern]
+            ):
+        self.decoded = 0
+        self.index = gtfs.index
+        self._store = store
+        self._gtfs = weakref.ref(gtfs)
+        self._patterns = patterns
+        self._shapes = None
+
+    def __contains__ (self, id: object) -> bool:
+        return self.index.trip(id) is not None
+
+    def __getitem__ (self, id: str) -> Trip:
+        row = self.index.trip(id)
+        if row is None: raise KeyError(id)
+        return self.row(row)
+
+    def __iter__ (self) -> Iterator[str]:
+        return iter(self.index.trip_ids)
+
+    def __len__ (self) -> int:
+        return len(self.index.trip_ids)
+
+    def row (self, row: int) -> Trip:
+        offsets = self._store._array('records')
+        base, _ = self._store._layout()['blobs']['records']
+        start, end = base + offsets[row], base + offsets[row + 1]
+        self.decoded += 1
+        file = io.BytesIO(self._store._buf[start:end])
+        return _Unpickler(file, self._resolve).load()
+
+    def _resolve (self, kind: str, id: str) -> object:
+        if kind == 'Pattern': return self._patterns[id]
+        gtfs = self._gtfs()
+        if gtfs is not None: return gtfs.shapes[id]
+        if self._shapes is None: self._shapes = self._store._table('shapes')
+        return self._shapes[id]
+
+
+class _StoredTrips (Trips):
+    # A read-only `Trips` table of a `FeedStore`, whose filters select trip
+    # rows from the shared arrays and only decode the records they return.
+    _model = Trips
+
+    def __reduce__ (self) -> tuple[type, tuple]:
+        return Trips, (dict(self.data), self.patterns)
+
+    def _select (self, rows: Iterable[int]) -> Trips:
+        data = self.data
+        return self._ref({ t.id: t for t in map(data.row, rows) })
+
+    def connecting (self, stop_a_id: str, stop_b_id: str) -> Trips:
+        index = self.data.index
+        a, b = index.stop(stop_a_id), index.stop(stop_b_id)
+        if a is None or b is None: return self._ref({})
+        rows = [
+            np.searchsorted(
+                index.offsets, np.flatnonzero(index.stops == stop), 'right'
+            ) - 1
+            for stop in (a, b)
+        ]
+        return self._ref({
+            t.id: t for t in map(self.data.row, np.intersect1d(*rows))
+            if t.connects(stop_a_id, stop_b_id)
+        })
+
+    def on_date (self, service_ids: list[str]) -> Trips:
+        return self._select(self.data.index.rows(service_ids))
+
+    def on_route (self, route_id: str) -> Trips:
+        store = self.data._store
+        route_ids = store._meta()['route_ids']
+        code = bisect.bisect_left(route_ids, route_id)
+        if code == len(route_ids) or route_ids[code] != route_id:
+            return self._ref({})
+        return self._select(np.flatnonzero(store._array('routes') == code))
+
+
+class _Table:
+    # Decodes a table from the arena on first access, then keeps it in the
+    # `__dict__` of the `GTFS`, where it can also be replaced.
+
+    def __init__ (self, key: str):
+        self.key = key
+
+    def __get__ (self, obj: Optional[GTFS], cls: type = None):
+        if obj is None: return self
+        if self.key not in obj.__dict__:
+            obj.__dict__[self.key] = obj._store._table(self.key, obj)
+        return obj.__dict__[self.key]
+
+    def __set__ (self, obj: GTFS, value: object):
+        obj.__dict__[self.key] = value
+
+
+class _StoredGTFS (GTFS):
+    # A `GTFS` whose tables are decoded from a `FeedStore` on first access.
+    _model = GTFS
+
+    def __getstate__ (self) -> dict:
+        for key in TABLES: getattr(self, key)
+        state = dict(self.__dict__)
+        for attr in ('_index', '_store'): state.pop(attr, None)
+        return state
+
+for _key in TABLES: setattr(_StoredGTFS, _key, _Table(_key))
+
+
+class FeedStore:
+    '''
+    A read-only arena holding a `GTFS` dataset and its `StopTimeIndex` in a
+    compact, array-based layout, either in a `multiprocessing.shared_memory`
+    block or in a memory-mapped file.
+
+    The `StopTimeIndex` arrays are stored once and exposed to every attached
+    process as read-only, zero-copy `numpy` views, so their memory is paid
+    once per host and attached processes never rebuild the index.
+
+    Trips, the largest table, are stored the same way: each `Trip` record
+    is pickled on its own in the arena, next to shared arrays of the offset
+    and route of every trip row. Attached processes decode a trip only when
+    they access it and do not keep it, and `on_date`, `on_route` and
+    `connecting` select trips from the shared arrays, so a process holds
+    only the trips its queries return rather than a copy of the table.
+
+    The other tables (stops, routes, schedules, agencies, shapes, transfers
+    and the feed) and the trip patterns are not shared: each is stored as
+    its own pickled blob and decoded whole into the memory of a process the
+    first time that process accesses it, still far faster than the mGTFS
+    `.json` format since decoding skips validation. `positions`,
+    `travel_times` and `isochrones` only read the index and the stops.
+
+    Attributes:
+        name (Optional[str]):
+            the name of the shared memory block, or `None` for a file
+    '''
+
+    def __init__ (
+                self,
+                buf: Union[memoryview, mmap.mmap],
+                shm: Optional[shared_memory.SharedMemory] = None,
+                file = None
+            ):
+        self._buf = buf
+        self._arrays: dict[str, np.ndarray] = {}
+        self._header = None
+        self._shm = shm
+        self._state = None
+        self._file = file
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def attach (cls, name: str) -> FeedStore:
+        '''
+        Returns a `FeedStore` attached to the shared memory block `name`
+        created by `FeedStore.create` in another process.
+
+        Attached processes do not own the block, so it is left in place when
+        they exit.
+
+        Parameters:
+            name (str):
+                the name of the shared memory block
+
+        Returns:
+            store (FeedStore):
+                a `FeedStore` attached to the block
+        '''
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13, attaching registers the block with the
+            # resource tracker, which would destroy it when this process
+            # exits.
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args: None
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        return FeedStore(shm.buf, shm)
+
+    @classmethod
+    def create (cls, gtfs: GTFS, name: Optional[str] = None) -> FeedStore:
+        '''
+        Returns a `FeedStore` holding `gtfs` in a new shared memory block.
+
+        The creating process owns the block and must call `unlink` once
+        every process is done with it.
+
+        Parameters:
+            gtfs (GTFS):
+                the `GTFS` dataset to store
+            name (Optional[str]):
+                the name of the shared memory block, or `None` for a random
+                name
+
+        Returns:
+            store (FeedStore):
+                a `FeedStore` holding `gtfs`
+        '''
+        header, parts, size = _pack(gtfs)
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=max(size, 1)
+        )
+        shm.buf[:len(header)] = header
+        for offset, data in parts:
+            shm.buf[offset:offset + len(data)] = data
+        return FeedStore(shm.buf, shm)
+
+    @classmethod
+    def open (cls, path: str) -> FeedStore:
+        '''
+        Returns a `FeedStore` memory-mapping the arena file at `path` written
+        by `FeedStore.write`. Processes mapping the same file share its pages
+        through the operating system.
+
+        Parameters:
+            path (str):
+                the path of the arena file
+
+        Returns:
+            store (FeedStore):
+                a `FeedStore` mapping the file
+        '''
+        file = open(path, 'rb')
+        buf = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return FeedStore(buf, file=file)
+
+    @classmethod
+    def write (cls, gtfs: GTFS, path: str):
+        '''
+        Writes `gtfs` to an arena file at `path` that can be memory-mapped
+        with `FeedStore.open`.
+
+        Parameters:
+            gtfs (GTFS):
+                the `GTFS` dataset to store
+            path (str):
+                the path of the arena file
+        '''
+        header, parts, _ = _pack(gtfs)
+        with open(path, 'wb') as file:
+            file.write(header)
+            for offset, data in parts:
+                file.seek(offset)
+                file.write(data)
+
+
+    ### PROPERTIES ###
+    @property
+    def name (self) -> Optional[str]:
+        '''the name of the shared memory block, or `None` for a file'''
+        return None if self._shm is None else self._shm.name
+
+
+    ### METHODS ###
+    def close (self):
+        '''
+        Releases the mapping of the `FeedStore` in this process. Every `GTFS`
+        loaded from it must be discarded first.
+        '''
+        self._arrays.clear()
+        if self._shm is not None:
+            self._buf = None
+            self._shm.close()
+        else:
+            self._buf.close()
+            self._file.close()
+
+    def _array (self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            offset, dtype, count = self._layout()['arrays'][name]
+            array = np.frombuffer(
+                self._buf, dtype=dtype, count=count, offset=offset
+            )
+            array.flags.writeable = False
+            self._arrays[name] = array
+        return self._arrays[name]
+
+    def _layout (self) -> dict[str, dict[str, list]]:
+        if self._header is None:
+            (length,) = _HEADER.unpack_from(self._buf, 0)
+            self._header = json.loads(
+                bytes(self._buf[_HEADER.size:_HEADER.size + length])
+            )
+        return self._header
+
+    def _meta (self) -> dict[str, Any]:
+        if self._state is None:
+            offset, length = self._layout()['blobs']['meta']
+            self._state = pickle.loads(self._buf[offset:offset + length])
+        return self._state
+
+    def _table (self, key: str, gtfs: Optional[GTFS] = None) -> object:
+        if key == 'trips':
+            trips = _StoredTrips.__new__(_StoredTrips)
+            trips.patterns = self._table('patterns')
+            trips.data = _Records(self, gtfs, trips.patterns)
+            return trips
+        offset, length = self._layout()['blobs'][key]
+        return pickle.loads(self._buf[offset:offset + length])
+
+    def load (self) -> GTFS:
+        '''
+        Returns a read-only `GTFS` dataset backed by the `FeedStore`. Its
+        `StopTimeIndex` is a set of views into the shared arena, which must
+        not be closed while the `GTFS` is in use.
+
+        Its `Trips` table decodes each `Trip` record from the arena when it
+        is accessed, without keeping it, and its filters select trips from
+        the shared arrays, so this process only holds the trips its queries
+        return. Every other table is decoded whole into the memory of this
+        process on first access.
+
+        Returns:
+            gtfs (GTFS):
+                a `GTFS` dataset backed by the `FeedStore`
+        '''
+        state = self._meta()
+        index = StopTimeIndex(
+            state['trip_ids'],
+            state['service_ids'],
+            state['stop_ids'],
+            self._array('offsets'),
+            self._array('stops'),
+            self._array('arrivals'),
+            self._array('departures'),
+            state['frequencies']
+        )
+        index._keys = self._array('keys')
+
+        g = _StoredGTFS.__new__(_StoredGTFS)
+        g.__dict__.update(state['tables'])
+        g.name = state['name']
+        g.profile = state['profile']
+        g._index = index
+        g._store = self
+        return g
+
+    def unlink (self):
+        '''
+        Destroys the shared memory block of a `FeedStore` created by this
+        process. Attached processes keep their mapping until they close it.
+        '''
+        if self._shm is not None: self._shm.unlink()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import sys
+from typing import Optional
+
+
+class StringTable:
+    '''
+    A dataset-wide dictionary mapping every ID and repeated string to a dense
+    `int`, used to store a dataset compactly. Strings looked up through the
+    table are interned, so every record referencing the same ID shares one
+    `str` and equal IDs compare by identity.
+
+    Attributes:
+        strings (list[str]):
+            every string in the table, indexed by its `int` ID
+    '''
+
+    def __init__ (self, strings: Optional[list[str]] = None):
+        self.strings = [sys.intern(v) for v in strings or []]
+        self._ids = { v: i for i, v in enumerate(self.strings) }
+
+
+    ### MAGIC METHODS ###
+    def __contains__ (self, value: str) -> bool:
+        return value in self._ids
+
+    def __getitem__ (self, id: int) -> str:
+        return self.strings[id]
+
+    def __len__ (self) -> int:
+        return len(self.strings)
+
+
+    ### METHODS ###
+    def id (self, value: str) -> int:
+        '''
+        Returns the `int` ID of `value`, adding it to the table if needed.
+
+        Parameters:
+            value (str):
+                the string to look up
+
+        Returns:
+            id (int):
+                the `int` ID of `value`
+        '''
+        id = self._ids.get(value, None)
+        if id is None:
+            id = len(self.strings)
+            self.strings.append(sys.intern(value))
+            self._ids[self.strings[id]] = id
+        return id
+
+    def intern (self, value: str) -> str:
+        '''
+        Returns the instance of `value` shared by the table, adding it to the
+        table if needed.
+
+        Parameters:
+            value (str):
+                the string to intern
+
+        Returns:
+            value (str):
+                the shared instance of `value`
+        '''
+        return self.strings[self.id(value)]
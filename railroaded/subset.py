@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import copy
+from datetime import date as pydate, timedelta
+from typing import Optional
+
+from .models import Feed, Route, Schedule, Stop
+from .models.date_range import DateRange
+
+
+class Subset:
+    '''
+    The criteria selecting the part of a GTFS dataset to keep, for
+    `GTFS.subset` and `GTFS.read`. Every criterion left out keeps everything.
+
+    A trip is kept if its route is selected, if its service runs on at least
+    one date of the window and, if an area is given, if it visits at least
+    one stop inside the area. Stops, routes, schedules, agencies, patterns,
+    shapes and transfers that no kept trip refers to are then removed.
+
+    Attributes:
+        agency_ids (Optional[set[str]]):
+            the IDs of the agencies whose routes are kept
+        bbox (Optional[tuple[float, float, float, float]]):
+            the area to keep, as its minimum latitude, minimum longitude,
+            maximum latitude and maximum longitude
+        end (Optional[date]):
+            the last service date of the window to keep
+        polygon (Optional[list[tuple[float, float]]]):
+            the area to keep, as the latitude and longitude of each vertex of
+            a polygon
+        route_ids (Optional[set[str]]):
+            the IDs of the routes to keep
+        start (Optional[date]):
+            the first service date of the window to keep
+    '''
+
+    def __init__ (
+                self,
+                bbox: Optional[tuple[float, float, float, float]] = None,
+                polygon: Optional[list[tuple[float, float]]] = None,
+                route_ids: Optional[set[str]] = None,
+                agency_ids: Optional[set[str]] = None,
+                start: Optional[pydate] = None,
+                end: Optional[pydate] = None
+            ):
+        if start is not None and end is not None and end < start:
+            raise ValueError(f'window ends ({end}) before it starts ({start})')
+        self.bbox = bbox
+        self.polygon = polygon
+        self.route_ids = None if route_ids is None else set(route_ids)
+        self.agency_ids = None if agency_ids is None else set(agency_ids)
+        self.start = start
+        self.end = end
+
+
+    ### PROPERTIES ###
+    @property
+    def area (self) -> bool:
+        '''whether the subset is limited to an area'''
+        return self.bbox is not None or self.polygon is not None
+
+    @property
+    def window (self) -> bool:
+        '''whether the subset is limited to a window of service dates'''
+        return self.start is not None or self.end is not None
+
+
+    ### METHODS ###
+    def _bounds (self, schedule: Schedule) -> tuple[pydate, pydate]:
+        dates = [*schedule.additions]
+        for r in schedule.ranges: dates.extend((r.start, r.end))
+        if not dates: return pydate.max, pydate.min
+        return (
+            max(min(dates), self.start or pydate.min),
+            min(max(dates), self.end or pydate.max)
+        )
+
+    def clip (self, feed: Optional[Feed]) -> Optional[Feed]:
+        '''
+        Returns a copy of `feed` whose validity is limited to the window.
+
+        Parameters:
+            feed (Optional[Feed]):
+                the `Feed` record of the dataset
+
+        Returns:
+            feed (Optional[Feed]):
+                the clipped `Feed` record
+        '''
+        if feed is None or not self.window: return feed
+        feed = copy.copy(feed)
+        if self.start is not None and feed.start_date is not None:
+            feed.start_date = max(feed.start_date, self.start)
+        if self.end is not None and feed.end_date is not None:
+            feed.end_date = min(feed.end_date, self.end)
+        return feed
+
+    def covers (self, stop: Stop) -> bool:
+        '''
+        Returns a `bool` indicating if `stop` lies inside the area. Stops
+        without coordinates are never inside an area.
+
+        Parameters:
+            stop (Stop):
+                the `Stop` to check
+
+        Returns:
+            covered (bool):
+                whether `stop` lies inside the area
+        '''
+        if not self.area: return True
+        lat, lon = stop.lat, stop.lon
+        if lat is None or lon is None: return False
+        if self.bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = self.bbox
+            if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+                return False
+        if self.polygon is not None:
+            inside = False
+            n = len(self.polygon)
+            for i in range(n):
+                lat_a, lon_a = self.polygon[i]
+                lat_b, lon_b = self.polygon[i - 1]
+                if (lat_a > lat) != (lat_b > lat) and lon < lon_a + \
+                        (lat - lat_a) * (lon_b - lon_a) / (lat_b - lat_a):
+                    inside = not inside
+            return inside
+        return True
+
+    def keeps (self, route: Route) -> bool:
+        '''
+        Returns a `bool` indicating if `route` is selected.
+
+        Parameters:
+            route (Route):
+                the `Route` to check
+
+        Returns:
+            kept (bool):
+                whether `route` is selected
+        '''
+        if self.route_ids is not None and route.id not in self.route_ids:
+            return False
+        if self.agency_ids is not None and \
+                route.agency_id not in self.agency_ids:
+            return False
+        return True
+
+    def runs (self, schedule: Schedule) -> bool:
+        '''
+        Returns a `bool` indicating if `schedule` is active on at least one
+        date of the window.
+
+        Parameters:
+            schedule (Schedule):
+                the `Schedule` to check
+
+        Returns:
+            running (bool):
+                whether `schedule` is active in the window
+        '''
+        if not self.window: return True
+        start, end = self._bounds(schedule)
+        day = start
+        while day <= end:
+            if schedule.active(day): return True
+            day += timedelta(days=1)
+        return False
+
+    def trim (self, schedule: Schedule) -> Schedule:
+        '''
+        Returns a copy of `schedule` without the dates and date ranges
+        outside the window, and with the remaining date ranges clipped to it.
+
+        Parameters:
+            schedule (Schedule):
+                the `Schedule` to trim
+
+        Returns:
+            schedule (Schedule):
+                the trimmed `Schedule`
+        '''
+        if not self.window: return schedule
+        start = self.start or pydate.min
+        end = self.end or pydate.max
+        return Schedule(
+            service_id=schedule.service_id,
+            additions=[d for d in schedule.additions if start <= d <= end],
+            exceptions=[d for d in schedule.exceptions if start <= d <= end],
+            ranges=[
+                DateRange(min(r.end, end), r.schedule, max(r.start, start))
+                for r in schedule.ranges
+                if r.start <= end and r.end >= start
+            ]
+        )
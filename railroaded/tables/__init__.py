@@ -1,5 +1,8 @@
 from .agencies import Agencies
 from .routes import Routes
 from .schedules import Schedules
+from .shapes import Shapes
 from .trips import Trips
-from .stops import Stops
\ No newline at end of file
+from .stops import Stops
+from .transfers import Transfers
+from .unloaded import TableNotLoadedError, Unloaded
\ No newline at end of file
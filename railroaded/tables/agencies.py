@@ -6,6 +6,7 @@ from typing import Optional
 import seared as s
 
 from ..models import Agency
+from ..profiles import Profile
 from ..util import load_list
 
 
@@ -35,13 +36,20 @@ class Agencies(s.Seared):
 
     ### CLASS METHODS ###
     @classmethod
-    def from_gtfs (cls, path: str) -> Agencies:
+    def from_gtfs (
+                cls,
+                path: str,
+                profile: Optional[Profile] = None
+            ) -> Agencies:
         '''
         Returns an `Agencies` table populated from the GTFS data at `path`.
 
         Parameters:
             path (str):
                 the path to the GTFS dataset
+            profile (Optional[Profile]):
+                the `Profile` selecting the columns to read, or `None` to read
+                every column
 
         Returns:
             agencies (Agencies):
@@ -49,7 +57,8 @@ class Agencies(s.Seared):
         '''
         agencies: list[Agency] = load_list(
             path = os.path.join(path, 'agency.txt'),
-            schema = Agency.SCHEMA
+            schema = Agency.SCHEMA,
+            profile = profile
         )
         return Agencies({ a.id: a for a in agencies })
 
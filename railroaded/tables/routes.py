@@ -6,6 +6,7 @@ from typing import Optional
 import seared as s
 
 from ..models import Route
+from ..profiles import Profile
 from ..util import load_list
 
 
@@ -37,13 +38,20 @@ class Routes(s.Seared):
 
     ### CLASS METHODS ###
     @classmethod
-    def from_gtfs (cls, path: str) -> Routes:
+    def from_gtfs (
+                cls,
+                path: str,
+                profile: Optional[Profile] = None
+            ) -> Routes:
         '''
         Returns an `Routes` table populated from the GTFS data at `path`.
 
         Parameters:
             path (str):
                 the path to the GTFS dataset
+            profile (Optional[Profile]):
+                the `Profile` selecting the columns to read, or `None` to read
+                every column
 
         Returns:
             agencies (Routes):
@@ -52,7 +60,8 @@ class Routes(s.Seared):
         routes: list[Route] = load_list(
             path = os.path.join(path, 'routes.txt'),
             schema = Route.SCHEMA,
-            int_cols=['route_type']
+            int_cols=['route_type'],
+            profile=profile
         )
         return Routes({ r.id: r for r in routes })
 
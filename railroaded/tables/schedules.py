@@ -7,6 +7,7 @@ from typing import Optional
 import seared as s
 
 from ..models import Calendar, CalendarDate, Schedule
+from ..profiles import Profile
 from ..util import load_list
 
 
@@ -36,13 +37,20 @@ class Schedules(s.Seared):
 
     ### CLASS METHODS ###
     @classmethod
-    def from_gtfs (cls, path: str) -> Schedules:
+    def from_gtfs (
+                cls,
+                path: str,
+                profile: Optional[Profile] = None
+            ) -> Schedules:
         '''
         Returns an `Schedules` table populated from the GTFS data at `path`.
 
         Parameters:
             path (str):
                 the path to the GTFS dataset
+            profile (Optional[Profile]):
+                the `Profile` selecting the columns to read, or `None` to read
+                every column
 
         Returns:
             agencies (Schedules):
@@ -52,7 +60,8 @@ class Schedules(s.Seared):
 
         calendars: list[Calendar] = load_list(
             path = os.path.join(path, 'calendar.txt'), 
-            schema = Calendar.SCHEMA
+            schema = Calendar.SCHEMA,
+            profile = profile
         )
 
         for cal in calendars:
@@ -64,7 +73,8 @@ class Schedules(s.Seared):
         dates: list[CalendarDate] = load_list(
             path = os.path.join(path, 'calendar_dates.txt'), 
             schema = CalendarDate.SCHEMA,
-            int_cols = ['exception_type']
+            int_cols = ['exception_type'],
+            profile = profile
         )
 
         for date in dates:
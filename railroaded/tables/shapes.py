@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+import numpy as np
+import seared as s
+
+from ..models import Shape
+from ..util import has_pandas, read_rows
+
+
+@s.seared
+class Shapes(s.Seared):
+    '''
+    Serializable dataclass table mapping `str` IDs to `Shape` records.
+
+    Attributes:
+        data (dict[str, Shape]):
+            a `dict` mapping `str` IDs to `Shape` records
+        ids (list[str]):
+            a `list` of all `str` IDs in the `Shapes` table
+        shapes (list[Shape]):
+            a `list` of all `Shape` records in the `Shapes` table
+    '''
+
+    ### ATTRIBUTES ###
+    data: dict[str, Shape] = s.T(
+        schema=Shape.SCHEMA,
+        keyed=True,
+        required=True
+    )
+    '''a `dict` mapping `str` IDs to `Shape` records'''
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def from_gtfs (
+                cls,
+                path: str,
+                tolerance: Optional[float] = None
+            ) -> Shapes:
+        '''
+        Returns a `Shapes` table populated from the GTFS data at `path`, or an
+        empty `Shapes` table if the dataset does not include `shapes.txt`.
+
+        Points are read as numeric columns rather than as individual records,
+        and each shape is encoded once per `shape_id`. Without pandas, points
+        are read with the `csv` module instead.
+
+        Parameters:
+            path (str):
+                the path to the GTFS dataset
+            tolerance (Optional[float]):
+                the Douglas-Peucker tolerance in meters to simplify each shape
+                with, or `None` to keep every point
+
+        Returns:
+            shapes (Shapes):
+                a `Shapes` table populated from the GTFS data at `path`
+        '''
+        shape_path = os.path.join(path, 'shapes.txt')
+        if not os.path.exists(shape_path): return Shapes({})
+
+        if not has_pandas():
+            points: dict[str, list[tuple[float, float, float]]] = {}
+            for row in read_rows(
+                        shape_path,
+                        ', ',
+                        float_cols=[
+                            'shape_pt_lat',
+                            'shape_pt_lon',
+                            'shape_pt_sequence'
+                        ],
+                        usecols={
+                            'shape_id',
+                            'shape_pt_lat',
+                            'shape_pt_lon',
+                            'shape_pt_sequence'
+                        }
+                    ):
+                points.setdefault(row['shape_id'], []).append((
+                    row['shape_pt_sequence'],
+                    row.get('shape_pt_lat', np.nan),
+                    row.get('shape_pt_lon', np.nan)
+                ))
+            shapes: dict[str, Shape] = {}
+            for id in sorted(points):
+                pts = np.array(
+                    sorted(points[id], key=lambda p: p[0]), dtype=np.float64
+                )
+                shapes[id] = Shape.from_points(
+                    id, pts[:, 1], pts[:, 2], tolerance
+                )
+            return Shapes(shapes)
+
+        import pandas as pd
+
+        df = pd.read_csv(
+            shape_path,
+            usecols=[
+                'shape_id',
+                'shape_pt_lat',
+                'shape_pt_lon',
+                'shape_pt_sequence'
+            ],
+            dtype={ 'shape_id': str },
+            skipinitialspace=True
+        )
+        df['shape_id'] = df['shape_id'].str.strip()
+        df = df.sort_values(['shape_id', 'shape_pt_sequence'], kind='stable')
+
+        return Shapes({
+            id: Shape.from_points(
+                id,
+                group['shape_pt_lat'].to_numpy(),
+                group['shape_pt_lon'].to_numpy(),
+                tolerance
+            )
+            for id, group in df.groupby('shape_id', sort=False)
+        })
+
+
+    ### PROPERTIES ###
+    @property
+    def ids (self) -> list[str]:
+        '''a `list` of all `str` IDs in the `Shapes` table'''
+        return list(self.data.keys())
+
+    @property
+    def shapes (self) -> list[Shape]:
+        '''a `list` of all `Shape` records in the `Shapes` table'''
+        return list(self.data.values())
+
+
+    ### MAGIC METHODS ###
+    def __getitem__ (self, id: str) -> Optional[Shape]:
+        '''
+        Returns the `Shape` record associated with the `id` if it exists,
+        otherwise returns `None`.
+
+        Parameters:
+            id (str):
+                the `str` id associated with the `Shape` record to retrieve
+
+        Returns:
+            record (Optional[Shape]):
+                the `Shape` record associated with `id` if it exists, otherwise
+                `None`
+        '''
+        return self.data.get(id, None)
@@ -6,6 +6,7 @@ from typing import Optional
 import seared as s
 
 from ..models import Stop
+from ..profiles import Profile
 from ..util import load_list
 
 
@@ -36,13 +37,20 @@ class Stops(s.Seared):
 
     ### CLASS METHODS ###
     @classmethod
-    def from_gtfs (cls, path: str) -> Stops:
+    def from_gtfs (
+                cls,
+                path: str,
+                profile: Optional[Profile] = None
+            ) -> Stops:
         '''
         Returns an `Stops` table populated from the GTFS data at `path`.
 
         Parameters:
             path (str):
                 the path to the GTFS dataset
+            profile (Optional[Profile]):
+                the `Profile` selecting the columns to read, or `None` to read
+                every column
 
         Returns:
             stops (Stops):
@@ -51,7 +59,8 @@ class Stops(s.Seared):
         stops: list[Stop] = load_list(
             os.path.join(path, 'stops.txt'), 
             Stop.SCHEMA,
-            int_cols=['drop_off_type', 'pickup_type', 'timepoint']
+            int_cols=['drop_off_type', 'pickup_type', 'timepoint'],
+            profile=profile
         )
 
         return Stops({ s.id: s for s in stops })
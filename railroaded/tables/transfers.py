@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+import seared as s
+
+from ..models import Transfer
+from ..models.transfer import TransferType
+from ..profiles import Profile
+from ..util import load_list
+
+
+@s.seared
+class Transfers(s.Seared):
+    '''
+    Serializable dataclass table of `Transfer` records.
+
+    Attributes:
+        data (list[Transfer]):
+            a `list` of all `Transfer` records
+        footpaths (list[tuple[str, str, int]]):
+            the stop IDs and walking time in seconds of every usable transfer
+            between two different stops
+    '''
+
+    ### ATTRIBUTES ###
+    data: list[Transfer] = s.T(
+        schema=Transfer.SCHEMA,
+        many=True,
+        required=True
+    )
+    '''a `list` of all `Transfer` records'''
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def from_gtfs (
+                cls,
+                path: str,
+                profile: Optional[Profile] = None
+            ) -> Transfers:
+        '''
+        Returns a `Transfers` table populated from the GTFS data at `path`, or
+        an empty `Transfers` table if the dataset does not include
+        `transfers.txt`.
+
+        Parameters:
+            path (str):
+                the path to the GTFS dataset
+            profile (Optional[Profile]):
+                the `Profile` selecting the columns to read, or `None` to read
+                every column
+
+        Returns:
+            transfers (Transfers):
+                a `Transfers` table populated from the GTFS data at `path`
+        '''
+        transfer_path = os.path.join(path, 'transfers.txt')
+        if not os.path.exists(transfer_path): return Transfers([])
+        return Transfers(load_list(
+            transfer_path,
+            Transfer.SCHEMA,
+            int_cols=['min_transfer_time', 'transfer_type'],
+            profile=profile
+        ))
+
+
+    ### PROPERTIES ###
+    @property
+    def footpaths (self) -> list[tuple[str, str, int]]:
+        '''
+        the stop IDs and walking time in seconds of every usable transfer
+        between two different stops
+        '''
+        return [
+            (t.from_stop_id, t.to_stop_id, t.min_time or 0)
+            for t in self.data
+            if t.from_stop_id is not None and t.to_stop_id is not None
+            and t.from_stop_id != t.to_stop_id
+            and t.from_route_id is None and t.from_trip_id is None
+            and t.to_route_id is None and t.to_trip_id is None
+            and t.type in (
+                TransferType.RECOMMENDED,
+                TransferType.TIMED,
+                TransferType.MINIMUM_TIME
+            )
+        ]
+
+
+    ### MAGIC METHODS ###
+    def __len__ (self) -> int:
+        return len(self.data)
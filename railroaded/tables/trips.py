@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from datetime import time
 import os
-from typing import Optional
+from typing import Callable, Optional
 
 import seared as s
 
-from ..models import StopTime, Timetable, Trip
-from ..util import load_list
+from ..models import Frequency, Pattern, StopTime, Timetable, Trip
+from ..profiles import Profile
+from ..records import record
+from ..timing import stage
+from ..util import _delimiter, load_list, read_rows
+from .shapes import Shapes
+from .stops import Stops
 
 
 @s.seared
@@ -15,6 +19,10 @@ class Trips(s.Seared):
     '''
     Serializable dataclass table mapping `str` IDs to `Trip` records.
 
+    Trips that share a stop sequence are grouped into a `Pattern`, so each
+    `Trip` stores only its start time (and time differences, if its running
+    times differ from the pattern) instead of a full `Timetable`.
+
     Attributes:
         trips (list[Trip]):
             a `list` of all `Trip` records in the `Trips` table
@@ -22,6 +30,8 @@ class Trips(s.Seared):
             a `dict` mapping `str` IDs to `Trip` records
         ids (list[str]):
             a `list` of all `str` IDs in the `Trips` table
+        patterns (Optional[dict[str, Pattern]]):
+            a `dict` mapping `str` pattern IDs to `Pattern` records
     '''
 
     ### ATTRIBUTES ###
@@ -31,17 +41,49 @@ class Trips(s.Seared):
         required=True
     )
     '''a `dict` mapping `str` IDs to `Trip` records'''
+    patterns: Optional[dict[str, Pattern]] = s.T(
+        schema=Pattern.SCHEMA,
+        keyed=True
+    )
+    '''a `dict` mapping `str` pattern IDs to `Pattern` records'''
 
 
     ### CLASS METHODS ###
     @classmethod
-    def from_gtfs (cls, path: str) -> Trips:
+    def from_gtfs (
+                cls,
+                path: str,
+                profile: Optional[Profile] = None,
+                where: Optional[Callable[[Trip], bool]] = None,
+                stop_ids: Optional[set[str]] = None
+            ) -> Trips:
         '''
         Returns an `Trips` table populated from the GTFS data at `path`.
 
+        Only the trips accepted by `where` and visiting at least one of
+        `stop_ids` are kept, and the stop times of the other trips are never
+        deserialized.
+
+        If the dataset includes `frequencies.txt`, each `Frequency` is attached
+        to its template `Trip` rather than expanded into individual runs.
+
+        Trips on the same route with the same stops are grouped into a 
+        `Pattern`, whose reference profile is taken from the first such trip.
+        Trips following different shapes never share a `Pattern`, and trips
+        without stop times are kept with an empty `Timetable`.
+
         Parameters:
             path (str):
                 the path to the GTFS dataset
+            profile (Optional[Profile]):
+                the `Profile` selecting the columns to read, or `None` to read
+                every column
+            where (Optional[Callable[[Trip], bool]]):
+                a function returning whether to keep a `Trip`, or `None` to
+                keep every trip
+            stop_ids (Optional[set[str]]):
+                the IDs of the stops a trip must visit at least one of to be
+                kept, or `None` to keep trips visiting any stop
 
         Returns:
             trips (Trips):
@@ -49,28 +91,83 @@ class Trips(s.Seared):
         '''
         stop_times: dict[str, list[StopTime]] = {}
 
+        trips: list[Trip] = load_list(
+            path = os.path.join(path, 'trips.txt'),
+            schema = Trip.SCHEMA,
+            int_cols=['bikes_allowed', 'wheelchair_accessible'],
+            profile=profile
+        )
+
+        times_path = os.path.join(path, 'stop_times.txt')
+        keep = None
+        if where is not None or stop_ids is not None:
+            if where is not None: trips = [t for t in trips if where(t)]
+            if stop_ids is not None:
+                visiting = {
+                    row['trip_id'] for row in read_rows(
+                        times_path,
+                        _delimiter(times_path),
+                        where=lambda row: row.get('stop_id', None) in stop_ids,
+                        usecols={ 'stop_id', 'trip_id' }
+                    )
+                }
+                trips = [t for t in trips if t.id in visiting]
+            ids = { t.id for t in trips }
+            keep = lambda row: row.get('trip_id', None) in ids
+
         stops: list[StopTime] = load_list(
-            os.path.join(path, 'stop_times.txt'), 
+            times_path, 
             StopTime.SCHEMA,
-            int_cols=['drop_off_type', 'pickup_type', 'timepoint']
+            int_cols=['drop_off_type', 'pickup_type', 'timepoint'],
+            where=keep,
+            profile=profile
         )
 
         for stop in stops:
             if stop.trip_id in stop_times:
                 stop_times[stop.trip_id].append(stop)
             else:
-                stop_times[stop.trip_id] = []
+                stop_times[stop.trip_id] = [stop]
 
-        trips: list[Trip] = load_list(
-            path = os.path.join(path, 'trips.txt'),
-            schema = Trip.SCHEMA,
-            int_cols=['bikes_allowed', 'wheelchair_accessible']
-        )
+        frequencies: dict[str, list[Frequency]] = {}
+        freq_path = os.path.join(path, 'frequencies.txt')
+        if os.path.exists(freq_path):
+            for f in load_list(
+                        freq_path, 
+                        Frequency.SCHEMA, 
+                        int_cols=['exact_times', 'headway_secs'],
+                        profile=profile
+                    ):
+                frequencies.setdefault(f.trip_id, []).append(f)
 
-        for trip in trips:
-            trip.timetable = Timetable.from_gtfs(stop_times[trip.id])
+        patterns: dict[tuple, Pattern] = {}
+        counts: dict[str, int] = {}
 
-        return Trips({ t.id: t for t in trips })
+        with stage('Trips.patterns') as info:
+            info['rows'] = len(trips)
+            for trip in trips:
+                trip.frequencies = frequencies.get(trip.id, None)
+                stops = sorted(
+                    stop_times.get(trip.id, []), key=lambda st: st.index
+                )
+                if not stops:
+                    trip.timetable = Timetable.from_gtfs(stops)
+                    continue
+                sig = Pattern.signature(trip.route_id, trip.shape_id, stops)
+                pattern = patterns.get(sig, None)
+                if pattern is None:
+                    n = counts.get(trip.route_id, 0)
+                    counts[trip.route_id] = n + 1
+                    pattern = Pattern.from_gtfs(f'{trip.route_id}:{n}', stops)
+                    patterns[sig] = pattern
+                trip.pattern_id = pattern.id
+                trip.offset, trip.deltas = pattern.fit(stops)
+                trip.pattern = pattern
+
+        return Trips(
+            { t.id: t for t in trips },
+            { p.id: p for p in patterns.values() }
+        )
 
 
     ### PROPERTIES ###
@@ -103,27 +200,119 @@ class Trips(s.Seared):
         return self.data.get(id, None)
     
 
-    ### METHODS ###    
-    def between (self, start: time, end: time) -> Trips:
-        return Trips({
+    ### METHODS ###
+    def _ref (self, data: dict[str, Trip]) -> Trips:
+        return Trips(data, self.patterns)
+    
+    def bind (self, shapes: Optional[Shapes] = None):
+        '''
+        Binds every `Trip` that follows a `Pattern` to its `Pattern` record,
+        and every `Trip` with a shape to its `Shape` record in `shapes`. Must
+        be called after a `Trips` table is deserialized.
+
+        Parameters:
+            shapes (Optional[Shapes]):
+                the `Shapes` table of the dataset
+        '''
+        for trip in self.trips:
+            if trip.pattern_id is not None:
+                trip.pattern = self.patterns[trip.pattern_id]
+            if shapes is not None and trip.shape_id is not None:
+                trip.shape = shapes[trip.shape_id]
+    
+    def between (self, start: int, end: int) -> Trips:
+        '''
+        Returns a `Trips` table containing only the trips running at any time
+        from `start` to `end`, both in seconds after the start of the service
+        day.
+
+        Parameters:
+            start (int):
+                the start of the window in seconds after the start of the \
+                service day
+            end (int):
+                the end of the window in seconds after the start of the \
+                service day
+
+        Returns:
+            trips (Trips):
+                a `Trips` table containing only the trips running from `start`
+                to `end`
+        '''
+        return self._ref({
             t.id: t for t in self.trips
             if t.between(start, end)
         })
     
     def connecting (self, stop_a_id: str, stop_b_id: str) -> Trips:
-        return Trips({
+        return self._ref({
             t.id: t for t in self.trips
             if t.connects(stop_a_id, stop_b_id)
         })
     
     def on_date (self, service_ids: list[str]) -> Trips:
-        return Trips({
+        return self._ref({
             t.id: t for t in self.trips
             if t.service_id in service_ids
         })
     
     def on_route (self, route_id: str) -> Trips:
-        return Trips({
+        return self._ref({
             t.id: t for t in self.trips
             if t.route_id == route_id
-        })
\ No newline at end of file
+        })
+    
+    def project (self, shapes: Shapes, stops: Stops):
+        '''
+        Fills in `StopTime.dist_traveled` for the stops of every trip with a
+        shape when the dataset leaves it out, as the distance in meters along
+        the shape of the projection of each stop onto it. Stops of a shared
+        `Pattern` are projected once.
+
+        Parameters:
+            shapes (Shapes):
+                the `Shapes` table of the dataset
+            stops (Stops):
+                the `Stops` table of the dataset
+        '''
+        done: set[str] = set()
+        for trip in self.trips:
+            shape = None if trip.shape_id is None else shapes[trip.shape_id]
+            if shape is None: continue
+            if trip.pattern is not None:
+                if trip.pattern_id in done: continue
+                done.add(trip.pattern_id)
+                records = trip.pattern.stops
+            else:
+                records = trip.timetable.stops
+            if any(st.dist_traveled is not None for st in records): continue
+            located = [stops[st.stop_id] for st in records]
+            if any(
+                        stop is None or stop.lat is None or stop.lon is None 
+                        for stop in located
+                    ): 
+                continue
+            dists = shape.project(
+                [stop.lat for stop in located], 
+                [stop.lon for stop in located]
+            )
+            for st, dist in zip(records, dists):
+                st.dist_traveled = round(float(dist), 1)
+
+    def slot (self):
+        '''
+        Replaces every `Trip` record in the table, and the `StopTime` records
+        of its patterns and stored timetables, with their `__slots__`
+        variants (see `records`), which need much less memory per record.
+        Bound patterns and shapes are kept.
+        '''
+        for pattern in (self.patterns or {}).values():
+            pattern.stops = [record(st) for st in pattern.stops]
+        for id, trip in self.data.items():
+            trip = record(trip)
+            timetable = trip._timetable
+            if timetable is not None:
+                timetable.data = {
+                    sid: record(st) for sid, st in timetable.data.items()
+                }
+            self.data[id] = trip
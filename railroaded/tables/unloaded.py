@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+class TableNotLoadedError(LookupError):
+    '''
+    Raised when a table of a `GTFS` object that was read without it is used.
+    '''
+
+
+class Unloaded:
+    '''
+    Stands in for a table of a `GTFS` object that was not loaded because it
+    was left out of the `tables` read (see `GTFS.read`). Using the table in
+    any way raises a `TableNotLoadedError`.
+
+    Attributes:
+        table (str):
+            the name of the table that was not loaded
+    '''
+
+    def __init__ (self, table: str):
+        self.table = table
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def loaded (cls, table: Any) -> bool:
+        '''
+        Returns a `bool` indicating if `table` is a loaded table, rather than
+        `None` or an `Unloaded` table.
+
+        Parameters:
+            table (Any):
+                the table to check
+
+        Returns:
+            loaded (bool):
+                whether `table` was loaded
+        '''
+        return table is not None and not isinstance(table, Unloaded)
+
+
+    ### MAGIC METHODS ###
+    def __getattr__ (self, name: str) -> Any:
+        if name.startswith('_'): raise AttributeError(name)
+        self._raise()
+
+    def __getitem__ (self, key: Any) -> Any:
+        self._raise()
+
+    def __iter__ (self):
+        self._raise()
+
+    def __len__ (self) -> int:
+        self._raise()
+
+    def __repr__ (self) -> str:
+        return f'Unloaded({self.table!r})'
+
+
+    ### METHODS ###
+    def _raise (self):
+        raise TableNotLoadedError(
+            f'the {self.table} table was not loaded; read the dataset with '
+            f'tables including {self.table!r}'
+        )
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import date as pydate, datetime, time, timedelta, timezone as tz
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from .tables import Schedules
+
+
+class Timeline:
+    '''
+    Converts between service days and absolute instants in an agency timezone.
+
+    GTFS stop times are measured from "noon minus 12h" of their service day, so
+    times past `24:00:00` belong to the previous service day and remain
+    correct across daylight saving transitions. A `Timeline` knows the latest
+    stop time in the dataset, and therefore how many earlier service days can
+    still be running at any instant.
+
+    Attributes:
+        lookback (int):
+            the number of earlier service days that can overlap an instant
+        span (int):
+            the latest stop time in the dataset in seconds
+        zone (ZoneInfo):
+            the timezone of the agency
+    '''
+
+    def __init__ (self, timezone: str, schedules: Schedules, span: int):
+        self.zone = ZoneInfo(timezone)
+        self.span = span
+        self.lookback = max(span, 0) // 86400
+        self._schedules = schedules
+        self._active: dict[pydate, list[str]] = {}
+
+
+    ### METHODS ###
+    def active (self, service_date: pydate) -> list[str]:
+        '''
+        Returns the service IDs active on `service_date`, caching the result.
+
+        Parameters:
+            service_date (date):
+                the service date to find active services for
+
+        Returns:
+            service_ids (list[str]):
+                the service IDs active on `service_date`
+        '''
+        if service_date not in self._active:
+            self._active[service_date] = self._schedules.on_date(service_date)
+        return self._active[service_date]
+
+    def days (
+                self,
+                start: datetime,
+                end: Optional[datetime] = None
+            ) -> list[tuple[pydate, int, int]]:
+        '''
+        Returns the service days whose stop times can overlap the instants
+        from `start` to `end`, with the window expressed in seconds after the
+        start of each service day.
+
+        Parameters:
+            start (datetime):
+                the start of the window
+            end (Optional[datetime]):
+                the end of the window, or `None` for the instant `start`
+
+        Returns:
+            days (list[tuple[date, int, int]]):
+                the overlapping service dates with the start and end of the
+                window in seconds after the start of each
+        '''
+        start = self.localize(start)
+        end = start if end is None else self.localize(end)
+        first = start.date() - timedelta(days=self.lookback + 1)
+        days: list[tuple[pydate, int, int]] = []
+        d = first
+        while d <= end.date():
+            origin = self.origin(d)
+            s = int((start - origin).total_seconds())
+            e = int((end - origin).total_seconds())
+            if e >= 0 and s <= self.span:
+                days.append((d, s, e))
+            d += timedelta(days=1)
+        return days
+
+    def instant (self, service_date: pydate, secs: int) -> datetime:
+        '''
+        Returns the absolute instant of a stop time on `service_date`.
+
+        Parameters:
+            service_date (date):
+                the service date of the stop time
+            secs (int):
+                the stop time in seconds after the start of the service day
+
+        Returns:
+            instant (datetime):
+                the timezone-aware instant of the stop time
+        '''
+        return (self.origin(service_date) + timedelta(seconds=secs)) \
+            .astimezone(self.zone)
+
+    def localize (self, when: datetime) -> datetime:
+        '''
+        Returns `when` as an aware `datetime` in the agency timezone. Naive
+        values are assumed to already be in the agency timezone.
+
+        Parameters:
+            when (datetime):
+                the `datetime` to localize
+
+        Returns:
+            when (datetime):
+                `when` as an aware `datetime` in the agency timezone
+        '''
+        if when.tzinfo is None: return when.replace(tzinfo=self.zone)
+        return when.astimezone(self.zone)
+
+    def origin (self, service_date: pydate) -> datetime:
+        '''
+        Returns the instant that stop times on `service_date` are measured
+        from (noon minus 12h).
+
+        Parameters:
+            service_date (date):
+                the service date
+
+        Returns:
+            origin (datetime):
+                the instant, in UTC, that stop times on `service_date` are 
+                measured from
+        '''
+        noon = datetime.combine(service_date, time(12), tzinfo=self.zone)
+        return noon.astimezone(tz.utc) - timedelta(hours=12)
+
+    def today (self) -> pydate:
+        '''
+        Returns the current date in the agency timezone.
+
+        Returns:
+            today (date):
+                the current date in the agency timezone
+        '''
+        return datetime.now(self.zone).date()
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import cProfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class Event:
+    '''
+    The measurements of one stage of reading, converting or writing a
+    dataset.
+
+    Attributes:
+        name (str):
+            the name of the stage, such as `read.decode` or `load_list`
+        parent (Optional[str]):
+            the name of the stage it ran in
+        seconds (float):
+            the wall time of the stage in seconds
+        rows (Optional[int]):
+            the number of rows or records the stage processed
+        nbytes (Optional[int]):
+            the size in bytes of the file the stage read or wrote
+        path (Optional[str]):
+            the file or directory the stage read or wrote
+        peak (Optional[int]):
+            the peak traced memory in bytes during the stage, if memory
+            tracing was requested
+        rss (Optional[int]):
+            the peak resident set size of the process in bytes at the end of
+            the stage
+        profile (Optional[cProfile.Profile]):
+            the profile of the stage, if profiling was requested for it
+        start (float):
+            the `time.perf_counter` value when the stage started
+    '''
+
+    def __init__ (
+                self,
+                name: str,
+                parent: Optional[str],
+                start: float,
+                seconds: float,
+                rows: Optional[int] = None,
+                nbytes: Optional[int] = None,
+                path: Optional[str] = None,
+                peak: Optional[int] = None,
+                rss: Optional[int] = None,
+                profile: Optional[cProfile.Profile] = None
+            ):
+        self.name = name
+        self.parent = parent
+        self.start = start
+        self.seconds = seconds
+        self.rows = rows
+        self.nbytes = nbytes
+        self.path = path
+        self.peak = peak
+        self.rss = rss
+        self.profile = profile
+
+
+    ### MAGIC METHODS ###
+    def __repr__ (self) -> str:
+        return f'Event({self.name!r}, {self.seconds:.4f}s)'
+
+
+    ### METHODS ###
+    def as_dict (self) -> dict[str, Any]:
+        '''
+        Returns the measurements of the stage as a `dict`, without its
+        profile.
+
+        Returns:
+            event (dict[str, Any]):
+                the measurements of the stage
+        '''
+        return {
+            'name': self.name,
+            'parent': self.parent,
+            'start': self.start,
+            'seconds': self.seconds,
+            'rows': self.rows,
+            'nbytes': self.nbytes,
+            'path': self.path,
+            'peak': self.peak,
+            'rss': self.rss
+        }
+
+
+class Report:
+    '''
+    The `Event` of every stage recorded by `instrument`, in the order the
+    stages finished.
+
+    Attributes:
+        events (list[Event]):
+            the recorded events
+    '''
+
+    def __init__ (self):
+        self.events: list[Event] = []
+
+
+    ### MAGIC METHODS ###
+    def __iter__ (self) -> Iterator[Event]:
+        return iter(self.events)
+
+    def __len__ (self) -> int:
+        return len(self.events)
+
+    def __str__ (self) -> str:
+        lines = [
+            f'{"stage":<32} {"seconds":>9} {"rows":>10} {"MiB":>9} '
+            f'{"peak MiB":>9}'
+        ]
+        depth: dict[str, int] = {}
+        for event in sorted(self.events, key=lambda e: e.start):
+            d = depth.get(event.parent, -1) + 1 if event.parent else 0
+            depth[event.name] = d
+            name = '  ' * d + event.name
+            rows = '' if event.rows is None else str(event.rows)
+            mib = '' if event.nbytes is None \
+                else f'{event.nbytes / 2 ** 20:.1f}'
+            peak = '' if event.peak is None else f'{event.peak / 2 ** 20:.1f}'
+            lines.append(
+                f'{name:<32} {event.seconds:>9.4f} {rows:>10} {mib:>9} '
+                f'{peak:>9}'
+            )
+        return '\n'.join(lines)
+
+
+    ### METHODS ###
+    def totals (self) -> dict[str, float]:
+        '''
+        Returns the total wall time in seconds of every stage name.
+
+        Returns:
+            totals (dict[str, float]):
+                the total seconds by stage name
+        '''
+        totals: dict[str, float] = {}
+        for event in self.events:
+            totals[event.name] = totals.get(event.name, 0.0) + event.seconds
+        return totals
+
+
+class _Session:
+
+    def __init__ (
+                self,
+                callback: Optional[Callable[[Event], None]],
+                profile: set[str],
+                memory: bool
+            ):
+        self.callback = callback
+        self.profile = profile
+        self.memory = memory
+        self.report = Report()
+
+
+_SESSIONS: ContextVar[tuple[_Session, ...]] = \
+    ContextVar('railroaded_sessions', default=())
+_STACK: ContextVar[tuple[dict[str, Any], ...]] = \
+    ContextVar('railroaded_stages', default=())
+
+
+def _rss () -> Optional[int]:
+    if resource is None: return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+@contextmanager
+def instrument (
+            callback: Optional[Callable[[Event], None]] = None,
+            profile: Iterable[str] = (),
+            memory: bool = False
+        ) -> Iterator[Report]:
+    '''
+    Records an `Event` for every stage of `GTFS.read`, `GTFS.from_gtfs` (and
+    each table it reads), `load_list` and `GTFS.save` run inside the `with`
+    block, in the current thread or task.
+
+    Parameters:
+        callback (Optional[Callable[[Event], None]]):
+            a function called with every `Event` as its stage finishes
+        profile (Iterable[str]):
+            the names of the stages to run under `cProfile`, whose profiles
+            are attached to their events
+        memory (bool):
+            whether to trace memory allocations with `tracemalloc` to record
+            the peak memory of every stage, which slows every stage down
+
+    Returns:
+        report (Report):
+            the `Report` collecting every `Event`, complete once the `with`
+            block exits
+    '''
+    session = _Session(callback, set(profile), memory)
+    started = memory and not tracemalloc.is_tracing()
+    if started: tracemalloc.start()
+    token = _SESSIONS.set(_SESSIONS.get() + (session,))
+    try:
+        yield session.report
+    finally:
+        _SESSIONS.reset(token)
+        if started: tracemalloc.stop()
+
+
+@contextmanager
+def stage (name: str, path: Optional[str] = None) -> Iterator[dict[str, Any]]:
+    '''
+    Measures the stage run inside the `with` block for every active
+    `instrument` session, and does nothing if there is none. The stage can
+    set `rows` in the yielded `dict`; the size of `path` is read once the
+    stage finishes.
+
+    Parameters:
+        name (str):
+            the name of the stage
+        path (Optional[str]):
+            the file or directory the stage reads or writes
+
+    Returns:
+        info (dict[str, Any]):
+            a `dict` the stage can set `rows` in
+    '''
+    sessions = _SESSIONS.get()
+    if not sessions:
+        yield {}
+        return
+
+    stack = _STACK.get()
+    frame: dict[str, Any] = { 'name': name, 'peak': 0 }
+    tracing = any(s.memory for s in sessions) and tracemalloc.is_tracing()
+    if tracing:
+        peak = tracemalloc.get_traced_memory()[1]
+        for outer in stack: outer['peak'] = max(outer['peak'], peak)
+        tracemalloc.reset_peak()
+    profiling = any(name in s.profile for s in sessions) and \
+        not any('profile' in outer for outer in stack)
+    if profiling:
+        frame['profile'] = cProfile.Profile()
+        frame['profile'].enable()
+
+    token = _STACK.set(stack + (frame,))
+    start = time.perf_counter()
+    try:
+        yield frame
+    finally:
+        seconds = time.perf_counter() - start
+        _STACK.reset(token)
+        if profiling: frame['profile'].disable()
+        peak = None
+        if tracing:
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            for outer in stack: outer['peak'] = max(outer['peak'], peak)
+        nbytes = None
+        if path is not None and os.path.isfile(path):
+            nbytes = os.path.getsize(path)
+        event = Event(
+            name,
+            stack[-1]['name'] if stack else None,
+            start,
+            seconds,
+            frame.get('rows', None),
+            nbytes,
+            path,
+            peak,
+            _rss(),
+            frame.get('profile', None)
+        )
+        for session in sessions:
+            session.report.events.append(event)
+            if session.callback is not None: session.callback(event)
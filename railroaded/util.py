@@ -1,67 +1,256 @@
-from typing import Any, Callable, Optional, TypeVar
+from __future__ import annotations
 
-from marshmallow import Schema
-import pandas as pd
+import csv
+from datetime import time
+import functools
+import importlib.util
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Collection, Optional, TypeVar
+
+from .timing import stage
+
+if TYPE_CHECKING:
+    from marshmallow import Schema
+
+    from .profiles import Profile
+
+
+def _delimiter (path: str) -> str:
+    with open(path, 'r') as file:
+        header = file.readline()
+    return ', ' if header.split(',')[1].startswith(' ') else ','
+
+
+def _number (value: str, kind: type) -> Any:
+    try:
+        return kind(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def has_pandas () -> bool:
+    '''
+    Returns a `bool` indicating if pandas is installed, without importing it.
+    '''
+    return importlib.util.find_spec('pandas') is not None
+
+
+def read_rows (
+            path: str,
+            delimiter: str = ',',
+            int_cols: Optional[list[str]] = [],
+            float_cols: Optional[list[str]] = [],
+            where: Optional[Callable[[dict[str, Any]], bool]] = None,
+            usecols: Optional[Collection[str]] = None
+        ) -> list[dict[str, Any]]:
+    '''
+    Reads a CSV file with the `csv` module and returns a `dict` of the
+    non-blank values of every row. Column names and values are stripped of
+    surrounding whitespace, as `ValidationReport` reads them. Values of
+    `int_cols` and `float_cols` are converted to numbers (or dropped if they
+    are not numbers), and other values are interned. Rows rejected by `where` are dropped as they are
+    read, and columns left out of `usecols` are skipped without being
+    converted or stored.
+
+    Parameters:
+        path (str):
+            the path of the CSV file to read
+        delimiter (str):
+            the delimiter of the CSV file; `', '` skips the space after each
+            comma
+        int_cols (Optional[list[str]]):
+            the columns holding integers
+        float_cols (Optional[list[str]]):
+            the columns holding floating point numbers
+        where (Optional[Callable[[dict[str, Any]], bool]]):
+            a function returning whether to keep a row
+        usecols (Optional[Collection[str]]):
+            the columns to read, or `None` to read every column
+
+    Returns:
+        rows (list[dict[str, Any]]):
+            the non-blank values of every row by column name
+    '''
+    kinds = { c: float for c in float_cols or [] }
+    kinds.update({ c: int for c in int_cols or [] })
+    intern = sys.intern
+    rows: list[dict[str, Any]] = []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+        reader = csv.reader(
+            file, delimiter=delimiter[0], skipinitialspace=len(delimiter) > 1
+        )
+        header = [intern(h.strip()) for h in next(reader, [])]
+        columns = [
+            (h, kinds.get(h, None)) if usecols is None or h in usecols
+                else (None, None)
+            for h in header
+        ]
+        for row in reader:
+            if not row: continue
+            record: dict[str, Any] = {}
+            for (name, kind), value in zip(columns, row):
+                if name is None: continue
+                value = value.strip()
+                if value == '': continue
+                if kind is None:
+                    record[name] = intern(value)
+                else:
+                    value = _number(value, kind)
+                    if value is not None: record[name] = value
+            if where is None or where(record): rows.append(record)
+    return rows
+
+
+def _read_pandas (
+            path: str,
+            delimiter: str,
+            int_cols: Optional[list[str]],
+            float_cols: Optional[list[str]],
+            where: Optional[Callable[[dict[str, Any]], bool]],
+            usecols: Optional[Collection[str]] = None
+        ) -> list[dict[str, Any]]:
+    import pandas as pd
+
+    df = pd.read_csv(
+        path, 
+        dtype=str, 
+        delimiter=delimiter, 
+        engine='python' if len(delimiter) > 0 else None,
+        usecols=None if usecols is None else lambda c: c.strip() in usecols
+    )
+    df.columns = [c.strip() for c in df.columns]
+    for col in df.columns: df[col] = df[col].str.strip()
+
+    for col in float_cols or []:
+        if not col in df.columns: continue
+        df[col] = pd.to_numeric(
+            df[col], errors='coerce', downcast='float'
+        )
+    for col in int_cols or []:
+        if not col in df.columns: continue
+        df[col] = pd.to_numeric(
+            df[col], errors='coerce', downcast='integer'
+        )
+
+    df = df.fillna('').replace([''], [None])
+
+    rows = [
+        {
+            k: sys.intern(v) if type(v) is str else v
+            for k, v in j.items() 
+            if v != None
+        }
+        for j in df.to_dict(orient='records')
+    ]
+    return rows if where is None else [r for r in rows if where(r)]
 
 
 def load_list (
                 path: str, 
                 schema: Schema,
                 int_cols: Optional[list[str]] = [],
-                float_cols: Optional[list[str]] = []
+                float_cols: Optional[list[str]] = [],
+                engine: Optional[str] = None,
+                where: Optional[Callable[[dict[str, Any]], bool]] = None,
+                profile: Optional[Profile] = None
             ) -> list:
         '''
-        Reads a CSV file and returns a list of deserialized records.
+        Reads a CSV file and returns a list of deserialized records. String
+        values are interned, so records repeating an ID share one instance.
 
         Parameters:
             path (str):
                 the path of the CSV file to load data from
             schema (marshmallow.Schema):
                 the Schema for the records in the CSV file
+            int_cols (Optional[list[str]]):
+                the columns holding integers
+            float_cols (Optional[list[str]]):
+                the columns holding floating point numbers
+            engine (Optional[str]):
+                `'pandas'` to parse the file with pandas, `'csv'` to parse it
+                with the `csv` module (see `read_rows`), or `None` to use
+                pandas only if it is installed
+            where (Optional[Callable[[dict[str, Any]], bool]]):
+                a function returning whether to keep a row, given its values
+                by column name, so rejected rows are never deserialized
+            profile (Optional[Profile]):
+                the `Profile` selecting the columns to read, or `None` to read
+                every column
 
         Returns:
             records (list[T]):
                 a list of deserialized records
         '''
-        delim = ','
-        with open(path, 'r') as file:
-            header = file.readline()
-            two = header.split(',')[1]
-            if two.startswith(' '): delim = ', '
-
-        df = pd.read_csv(
-            path, 
-            dtype=str, 
-            delimiter=delim, 
-            engine='python' if len(delim) > 0 else None
-        )
+        if engine is None: engine = 'pandas' if has_pandas() else 'csv'
+        if engine not in ('csv', 'pandas'):
+            raise ValueError(f'unknown CSV engine {engine!r}')
 
-        for col in float_cols:
-            if not col in df.columns: continue
-            df[col] = pd.to_numeric(
-                df[col], errors='coerce', downcast='float'
-            )
-        for col in int_cols:
-            if not col in df.columns: continue
-            df[col] = pd.to_numeric(
-                df[col], errors='coerce', downcast='integer'
-            )
-
-        df = df.fillna('').replace([''], [None])
-
-        json = df.to_dict(orient='records')
-
-        return schema.load(
-            [
-                {
-                    k: v 
-                    for k, v in j.items() 
-                    if v != None
-                }
-                for j in json
-            ],
-            many=True
-        )
+        with stage('load_list', path) as info:
+            delim = _delimiter(path)
+            usecols = None if profile is None else profile.usecols(path)
+
+            with stage('load_list.csv', path):
+                read = _read_pandas if engine == 'pandas' else read_rows
+                rows = read(path, delim, int_cols, float_cols, where, usecols)
+
+            info['rows'] = len(rows)
+            with stage('load_list.schema') as schema_info:
+                schema_info['rows'] = len(rows)
+                return schema.load(rows, many=True)
+
+
+def format_time (secs: int) -> str:
+    '''
+    Returns the GTFS `HH:MM:SS` time string for a number of seconds after the
+    start of the service day. Hours past `24` are preserved.
+
+    Parameters:
+        secs (int):
+            the number of seconds after the start of the service day
+
+    Returns:
+        value (str):
+            the GTFS `HH:MM:SS` time string
+    '''
+    return f'{secs // 3600:02d}:{secs % 3600 // 60:02d}:{secs % 60:02d}'
+
+
+def parse_time (value: str) -> int:
+    '''
+    Returns the number of seconds after the start of the service day described
+    by a GTFS `HH:MM:SS` time string. Hours past `24` are preserved.
+
+    Parameters:
+        value (str):
+            the GTFS `HH:MM:SS` time string to parse
+
+    Returns:
+        seconds (int):
+            the number of seconds after the start of the service day
+    '''
+    h, m, sec = value.strip().split(':')
+    return int(h) * 3600 + int(m) * 60 + int(sec)
+
+
+def time_secs (value: time) -> int:
+    '''
+    Returns the number of seconds after midnight of a `time`.
+
+    Parameters:
+        value (time):
+            the `time` to convert
+
+    Returns:
+        seconds (int):
+            the number of seconds after midnight of `value`
+    '''
+    return value.hour * 3600 + value.minute * 60 + value.second
 
 
 T = TypeVar('T', Any, object)
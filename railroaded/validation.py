@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Iterator
+
+import numpy as np
+
+from .util import _delimiter, has_pandas, read_rows
+
+
+CHECKS: dict[str, tuple[str, str]] = {
+    'trip_route': (
+        'error', 'trips whose route_id is not in routes.txt'
+    ),
+    'trip_service': (
+        'error',
+        'trips whose service_id is in neither calendar.txt nor '
+        'calendar_dates.txt'
+    ),
+    'trip_stop_times': (
+        'warning', 'trips without stop times'
+    ),
+    'stop_time_trip': (
+        'warning', 'stop times whose trip_id is not in trips.txt'
+    ),
+    'stop_time_stop': (
+        'error', 'stop times whose stop_id is not in stops.txt'
+    ),
+    'parent_station': (
+        'error', 'stops whose parent station is not in stops.txt'
+    ),
+    'stop_sequence': (
+        'error',
+        'stop times whose stop_sequence is not an integer or repeats within '
+        'its trip'
+    ),
+    'stop_time_format': (
+        'error', 'stop times whose arrival or departure is not HH:MM:SS'
+    ),
+    'stop_time_order': (
+        'error',
+        'stop times that depart before they arrive, or arrive before the '
+        'previous stop of their trip departs'
+    )
+}
+'''the severity and description of every check, by name'''
+
+COLUMNS: dict[str, set[str]] = {
+    'calendar.txt': { 'service_id' },
+    'calendar_dates.txt': { 'service_id' },
+    'routes.txt': { 'route_id' },
+    'stop_times.txt': {
+        'arrival_time', 'departure_time', 'stop_id', 'stop_sequence',
+        'trip_id'
+    },
+    'stops.txt': { 'parent_id', 'parent_station', 'stop_id' },
+    'trips.txt': { 'route_id', 'service_id', 'trip_id' }
+}
+'''the columns read from each GTFS file to validate it'''
+
+
+def _read (path: str, columns: set[str]) -> dict[str, np.ndarray]:
+    if not os.path.exists(path): return {}
+    if has_pandas():
+        import pandas as pd
+
+        df = pd.read_csv(
+            path,
+            usecols=lambda c: c.strip() in columns,
+            dtype=str,
+            keep_default_na=False,
+            skipinitialspace=True
+        )
+        return {
+            c.strip(): np.char.strip(df[c].to_numpy(dtype=str))
+            for c in df.columns
+        }
+    rows = read_rows(path, _delimiter(path), usecols=columns)
+    present = { c for row in rows for c in row }
+    return {
+        c: np.char.strip(np.array([row.get(c, '') for row in rows], dtype=str))
+        for c in present
+    }
+
+
+def _column (table: dict[str, np.ndarray], name: str) -> np.ndarray:
+    if name in table: return table[name]
+    n = len(next(iter(table.values()))) if table else 0
+    return np.full(n, '', dtype=str)
+
+
+def _integers (values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    valid = np.char.isdigit(values)
+    return np.where(valid, values, '0').astype(np.int64), valid
+
+
+def _seconds (
+            values: np.ndarray
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    given = values != ''
+    length = np.char.str_len(values)
+    padded = np.char.zfill(values, 8).astype('<U8')
+    codes = padded.view(np.uint32).reshape(-1, 8).astype(np.int64) - 48
+    digits = codes[:, [0, 1, 3, 4, 6, 7]]
+    valid = given & (length >= 7) & (length <= 8) \
+        & ((digits >= 0) & (digits <= 9)).all(axis=1) \
+        & (codes[:, 2] == 10) & (codes[:, 5] == 10) \
+        & (digits[:, 2] < 6) & (digits[:, 4] < 6)
+    secs = (digits[:, 0] * 10 + digits[:, 1]) * 3600 \
+        + (digits[:, 2] * 10 + digits[:, 3]) * 60 \
+        + digits[:, 4] * 10 + digits[:, 5]
+    return secs, valid, given
+
+
+def _stop_times (
+            times: dict[str, np.ndarray],
+            samples: int
+        ) -> list[Finding]:
+    trips = np.unique(_column(times, 'trip_id'), return_inverse=True)[1]
+    seqs, numbered = _integers(_column(times, 'stop_sequence'))
+    order = np.lexsort((seqs, trips))
+    ordered = trips[order]
+    repeated = np.zeros(len(order), dtype=bool)
+    repeated[order[1:]] = (ordered[1:] == ordered[:-1]) \
+        & (seqs[order][1:] == seqs[order][:-1])
+
+    arrs, arr_valid, arr_given = _seconds(_column(times, 'arrival_time'))
+    deps, dep_valid, dep_given = _seconds(_column(times, 'departure_time'))
+    timed = arr_valid & dep_valid
+    late = np.zeros(len(order), dtype=bool)
+    rows = order[timed[order]]
+    late[rows[1:]] = (trips[rows[1:]] == trips[rows[:-1]]) \
+        & (arrs[rows[1:]] < deps[rows[:-1]])
+    columns = ['trip_id', 'stop_sequence', 'arrival_time', 'departure_time']
+    return [
+        Finding.from_mask(
+            'stop_sequence',
+            ~numbered | repeated,
+            times, ['trip_id', 'stop_sequence'], samples
+        ),
+        Finding.from_mask(
+            'stop_time_format',
+            (arr_given & ~arr_valid) | (dep_given & ~dep_valid),
+            times, columns, samples
+        ),
+        Finding.from_mask(
+            'stop_time_order',
+            (timed & (deps < arrs)) | late,
+            times, columns, samples
+        )
+    ]
+
+
+class Finding:
+    '''
+    The result of one check of a GTFS dataset (see `CHECKS`).
+
+    Attributes:
+        name (str):
+            the name of the check, such as `trip_route`
+        severity (str):
+            `'error'` if the failing rows break the dataset, or `'warning'`
+            if they are only dropped while reading it
+        description (str):
+            a description of the failing rows
+        count (int):
+            the number of failing rows
+        samples (list[dict[str, Any]]):
+            the first failing rows, with the values of the checked columns
+            and the `row` number of the record in its file, counting data
+            rows from `1` and skipping blank lines, so a quoted field
+            spanning several lines counts once
+    '''
+
+    def __init__ (
+                self,
+                name: str,
+                count: int,
+                samples: list[dict[str, Any]]
+            ):
+        self.name = name
+        self.severity, self.description = CHECKS[name]
+        self.count = count
+        self.samples = samples
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def from_mask (
+                cls,
+                name: str,
+                mask: np.ndarray,
+                table: dict[str, np.ndarray],
+                columns: list[str],
+                samples: int
+            ) -> Finding:
+        '''
+        Returns the `Finding` of the check `name`, failed by the rows of
+        `table` selected by `mask`.
+
+        Parameters:
+            name (str):
+                the name of the check
+            mask (np.ndarray):
+                whether each row of `table` fails the check
+            table (dict[str, np.ndarray]):
+                the checked columns of a GTFS file, by name
+            columns (list[str]):
+                the columns of the failing rows to sample
+            samples (int):
+                the number of failing rows to sample
+
+        Returns:
+            finding (Finding):
+                the `Finding` of the check
+        '''
+        rows = np.flatnonzero(mask)
+        return Finding(name, len(rows), [
+            {
+                'row': int(i) + 1,
+                **{ c: str(table[c][i]) for c in columns if c in table }
+            }
+            for i in rows[:samples]
+        ])
+
+
+    ### PROPERTIES ###
+    @property
+    def passed (self) -> bool:
+        '''whether no row fails the check'''
+        return self.count == 0
+
+
+    ### MAGIC METHODS ###
+    def __repr__ (self) -> str:
+        return f'Finding({self.name!r}, {self.count})'
+
+
+    ### METHODS ###
+    def as_dict (self) -> dict[str, Any]:
+        '''
+        Returns the finding as a `dict`.
+
+        Returns:
+            finding (dict[str, Any]):
+                the severity, description, count and samples of the check
+        '''
+        return {
+            'severity': self.severity,
+            'description': self.description,
+            'count': self.count,
+            'samples': self.samples
+        }
+
+
+class InvalidFeedError(ValueError):
+    '''
+    Raised when a GTFS dataset read with `check=True` fails a check with
+    severity `'error'`.
+
+    Attributes:
+        report (ValidationReport):
+            the `ValidationReport` of the dataset
+    '''
+
+    def __init__ (self, report: ValidationReport):
+        self.report = report
+        failed = ', '.join(
+            f'{f.name} ({f.count})' for f in report.findings
+            if f.severity == 'error' and not f.passed
+        )
+        super().__init__(f'the GTFS dataset failed validation: {failed}')
+
+    def __reduce__ (self) -> tuple[type, tuple[ValidationReport]]:
+        # Rebuilt from its report, so it survives being raised in a worker
+        # process.
+        return InvalidFeedError, (self.report,)
+
+
+class ValidationReport:
+    '''
+    The referential integrity and data quality of a GTFS dataset: whether
+    trips reference existing routes and services, stop times existing trips
+    and stops, and stops existing parent stations, and whether the stop
+    times of each trip have distinct sequences and ordered times.
+
+    Attributes:
+        findings (list[Finding]):
+            the `Finding` of every check
+        ok (bool):
+            whether no check with severity `'error'` failed
+    '''
+
+    def __init__ (self, findings: list[Finding]):
+        self.findings = findings
+
+
+    ### CLASS METHODS ###
+    @classmethod
+    def from_gtfs (cls, path: str, samples: int = 5) -> ValidationReport:
+        '''
+        Returns the `ValidationReport` of the unzipped GTFS dataset at `path`.
+
+        Only the columns of `COLUMNS` are read, as arrays of strings, and
+        every check runs as vectorized joins and comparisons over them, so no
+        records are deserialized.
+
+        Parameters:
+            path (str):
+                the path to the GTFS dataset
+            samples (int):
+                the number of failing rows to sample for every check
+
+        Returns:
+            report (ValidationReport):
+                the `ValidationReport` of the dataset at `path`
+        '''
+        files = {
+            file: _read(os.path.join(path, file), columns)
+            for file, columns in COLUMNS.items()
+        }
+        trips, times = files['trips.txt'], files['stop_times.txt']
+        stops = files['stops.txt']
+        trip_ids = _column(trips, 'trip_id')
+        stop_ids = _column(stops, 'stop_id')
+        services = np.union1d(
+            _column(files['calendar.txt'], 'service_id'),
+            _column(files['calendar_dates.txt'], 'service_id')
+        )
+        parents = _column(stops, 'parent_station')
+        if not (parents != '').any(): parents = _column(stops, 'parent_id')
+        stops['parent_station'] = parents
+        findings = [
+            Finding.from_mask(
+                'trip_route',
+                ~np.isin(
+                    _column(trips, 'route_id'),
+                    _column(files['routes.txt'], 'route_id')
+                ),
+                trips, ['trip_id', 'route_id'], samples
+            ),
+            Finding.from_mask(
+                'trip_service',
+                ~np.isin(_column(trips, 'service_id'), services),
+                trips, ['trip_id', 'service_id'], samples
+            ),
+            Finding.from_mask(
+                'trip_stop_times',
+                ~np.isin(trip_ids, _column(times, 'trip_id')),
+                trips, ['trip_id'], samples
+            ),
+            Finding.from_mask(
+                'stop_time_trip',
+                ~np.isin(_column(times, 'trip_id'), trip_ids),
+                times, ['trip_id', 'stop_sequence'], samples
+            ),
+            Finding.from_mask(
+                'stop_time_stop',
+                ~np.isin(_column(times, 'stop_id'), stop_ids),
+                times, ['trip_id', 'stop_sequence', 'stop_id'], samples
+            ),
+            Finding.from_mask(
+                'parent_station',
+                (parents != '') & ~np.isin(parents, stop_ids),
+                stops, ['stop_id', 'parent_station'], samples
+            ),
+            *_stop_times(times, samples)
+        ]
+        return ValidationReport(findings)
+
+
+    ### PROPERTIES ###
+    @property
+    def ok (self) -> bool:
+        '''whether no check with severity `'error'` failed'''
+        return all(
+            f.passed for f in self.findings if f.severity == 'error'
+        )
+
+
+    ### MAGIC METHODS ###
+    def __getitem__ (self, name: str) -> Finding:
+        for f in self.findings:
+            if f.name == name: return f
+        raise KeyError(name)
+
+    def __iter__ (self) -> Iterator[Finding]:
+        return iter(self.findings)
+
+    def __str__ (self) -> str:
+        lines = [f'{"check":<18} {"severity":<8} {"count":>10}']
+        for f in self.findings:
+            lines.append(f'{f.name:<18} {f.severity:<8} {f.count:>10}')
+            for sample in f.samples:
+                lines.append(
+                    '    ' + ' '.join(f'{k}={v}' for k, v in sample.items())
+                )
+        return '\n'.join(lines)
+
+
+    ### METHODS ###
+    def as_dict (self) -> dict[str, dict[str, Any]]:
+        '''
+        Returns the report as a `dict`, for export as metrics.
+
+        Returns:
+            report (dict[str, dict[str, Any]]):
+                the severity, description, count and samples of every check,
+                by name
+        '''
+        return { f.name: f.as_dict() for f in self.findings }
@@ -0,0 +1,103 @@
+import os
+from typing import Callable, Optional
+
+import pytest
+
+
+FEED: dict[str, str] = {
+    'agency.txt': '''\
+agency_id,agency_name,agency_url,agency_timezone
+A,Agency,http://a.example,America/New_York
+''',
+    'calendar.txt': '''\
+service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,start_date,end_date
+WK,1,1,1,1,1,0,0,20260101,20261231
+WE,0,0,0,0,0,1,1,20260101,20261231
+''',
+    'calendar_dates.txt': '''\
+service_id,date,exception_type
+WK,20261225,2
+WE,20261225,1
+''',
+    'feed_info.txt': '''\
+feed_publisher_name,feed_publisher_url,feed_lang,feed_version
+Pub,http://p.example,en,1
+''',
+    'frequencies.txt': '''\
+trip_id,start_time,end_time,headway_secs,exact_times
+T3,06:00:00,10:00:00,900,1
+''',
+    'routes.txt': '''\
+route_id,agency_id,route_short_name,route_long_name,route_type
+R1,A,1,Red,2
+R2,A,2,Blue,3
+''',
+    'shapes.txt': '''\
+shape_id,shape_pt_lat,shape_pt_lon,shape_pt_sequence
+SH1,40.0,-75.0,1
+SH1,40.05,-75.05,2
+SH1,40.1,-75.1,3
+SH1,40.15,-75.15,4
+SH1,40.2,-75.2,5
+''',
+    'stop_times.txt': '''\
+trip_id,arrival_time,departure_time,stop_id,stop_sequence
+T1,08:00:00,08:00:00,S1,1
+T1,08:10:00,08:11:00,S2,2
+T1,08:20:00,08:20:00,S3,3
+T2,09:00:00,09:00:00,S1,1
+T2,09:10:00,09:11:00,S2,2
+T2,09:20:00,09:20:00,S3,3
+T3,08:15:00,08:15:00,S2,1
+T3,08:30:00,08:30:00,S4,2
+T4,10:00:00,10:00:00,S1,1
+T4,10:10:00,10:11:00,S2,2
+T4,10:20:00,10:20:00,S3,3
+T5,23:50:00,23:50:00,S1,1
+T5,24:10:00,24:11:00,S2,2
+T5,24:25:00,24:25:00,S3,3
+''',
+    'stops.txt': '''\
+stop_id,stop_name,stop_lat,stop_lon,location_type,parent_station
+S1,One,40.0,-75.0,0,
+S2,Two,40.1,-75.1,0,
+S3,Three,40.2,-75.2,0,
+S4,Four,40.3,-75.3,0,
+''',
+    'trips.txt': '''\
+route_id,service_id,trip_id,trip_headsign,direction_id,shape_id
+R1,WK,T1,Three,0,SH1
+R1,WK,T2,Three,0,SH1
+R2,WK,T3,Four,0,
+R1,WE,T4,Three,0,SH1
+R1,WK,T5,Three,0,SH1
+'''
+}
+'''the files of a small GTFS dataset, by name'''
+
+
+def write_feed (path: str, files: Optional[dict[str, str]] = None) -> str:
+    '''
+    Writes the GTFS dataset `FEED`, with the files of `files` replaced or
+    added, to the directory `path` and returns `path`.
+    '''
+    os.makedirs(path, exist_ok=True)
+    for name, text in { **FEED, **(files or {}) }.items():
+        with open(os.path.join(path, name), 'w') as file:
+            file.write(text)
+    return path
+
+
+@pytest.fixture
+def make_feed (tmp_path) -> Callable[..., str]:
+    '''writes a variant of `FEED` to a temporary directory'''
+    count = iter(range(1000))
+    def make (files: Optional[dict[str, str]] = None) -> str:
+        return write_feed(str(tmp_path / f'feed{next(count)}'), files)
+    return make
+
+
+@pytest.fixture
+def feed_path (make_feed) -> str:
+    '''the path to a copy of `FEED`'''
+    return make_feed()
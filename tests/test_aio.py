@@ -0,0 +1,73 @@
+import asyncio
+import functools
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+import os
+import shutil
+import threading
+
+import pytest
+
+import railroaded as rr
+from railroaded.tables import Unloaded
+
+
+class _Quiet (SimpleHTTPRequestHandler):
+
+    def log_message (self, *args):
+        pass
+
+
+@pytest.fixture
+def serve (tmp_path):
+    '''serves the files of a temporary directory over HTTP'''
+    root = tmp_path / 'www'
+    root.mkdir()
+    handler = functools.partial(_Quiet, directory=root)
+    server = HTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield root, f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_remote_feeds_apply_read_arguments (serve, feed_path, tmp_path):
+    root, url = serve
+    shutil.make_archive(str(root / 'feed'), 'zip', feed_path)
+    mgtfs_path = str(tmp_path / 'feed.json')
+
+    results = asyncio.run(rr.read_many([
+        {
+            'name': 'routing',
+            'gtfs_uri': f'{url}/feed.zip',
+            'profile': 'routing',
+            'tables': { 'agencies', 'routes', 'stops' },
+            'mgtfs_path': mgtfs_path
+        },
+        {
+            'name': 'subset',
+            'gtfs_uri': f'{url}/feed.zip',
+            'subset': rr.Subset(route_ids={ 'R2' }),
+            'slots': True,
+            'check': True
+        }
+    ], processes=1))
+
+    routing, subset = results
+    assert routing.ok and subset.ok
+    assert routing.gtfs.profile == 'routing'
+    assert isinstance(routing.gtfs.trips, Unloaded)
+    assert not os.path.exists(mgtfs_path)
+    assert list(subset.gtfs.trips.data) == ['T3']
+
+
+def test_remote_feeds_check (serve, make_feed):
+    root, url = serve
+    bad = make_feed({ 'routes.txt': 'route_id,route_type\nR1,2\n' })
+    shutil.make_archive(str(root / 'bad'), 'zip', bad)
+
+    (result,) = asyncio.run(rr.read_many([
+        { 'name': 'bad', 'gtfs_uri': f'{url}/bad.zip', 'check': True }
+    ], processes=1))
+
+    assert isinstance(result.error, rr.InvalidFeedError)
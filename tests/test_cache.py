@@ -0,0 +1,40 @@
+from datetime import date, time
+
+import railroaded as rr
+
+
+TRANSFERS = '''\
+from_stop_id,to_stop_id,transfer_type,min_transfer_time
+S1,S4,2,60
+'''
+
+
+def test_replacing_transfers_invalidates_results (feed_path, make_feed):
+    gtfs = rr.GTFS.read('feed', gtfs_path=feed_path)
+    linked = rr.GTFS.read(
+        'linked', gtfs_path=make_feed({ 'transfers.txt': TRANSFERS })
+    )
+    gtfs.memoize()
+    query = (['S1'], ['S4'], date(2026, 3, 2), time(8, 0))
+
+    before = gtfs.travel_times(*query)
+    gtfs.transfers = linked.transfers
+    after = gtfs.travel_times(*query)
+
+    assert after[0, 0] < before[0, 0]
+    assert (gtfs.travel_times(*query) == after).all()
+
+
+def test_replacing_routes_misses_the_cache (feed_path, make_feed):
+    gtfs = rr.GTFS.read('feed', gtfs_path=feed_path)
+    other = rr.GTFS.read('other', gtfs_path=make_feed())
+    gtfs.memoize()
+
+    before = gtfs.on_route('R1')
+    gtfs.routes = other.routes
+    after = gtfs.on_route('R1')
+
+    assert gtfs.cache.stats['misses'] == 2
+    assert gtfs.cache.stats['hits'] == 0
+    assert before.routes is not other.routes
+    assert after.routes is other.routes
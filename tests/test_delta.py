@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+import railroaded as rr
+from railroaded.delta import patch_mgtfs
+
+
+ROUTES = '''\
+route_id,agency_id,route_short_name,route_long_name,route_type
+R1,A,1,Green,2
+R2,A,2,Blue,3
+'''
+
+STOP_TIMES = '''\
+trip_id,arrival_time,departure_time,stop_id,stop_sequence
+T1,08:00:00,08:00:00,S1,1
+T1,08:12:00,08:13:00,S2,2
+T1,08:22:00,08:22:00,S3,3
+T2,09:00:00,09:00:00,S1,1
+T2,09:10:00,09:11:00,S2,2
+T2,09:20:00,09:20:00,S3,3
+T3,08:15:00,08:15:00,S2,1
+T3,08:30:00,08:30:00,S4,2
+T5,23:50:00,23:50:00,S1,1
+T5,24:10:00,24:11:00,S2,2
+T5,24:25:00,24:25:00,S3,3
+'''
+
+TRIPS = '''\
+route_id,service_id,trip_id,trip_headsign,direction_id,shape_id
+R1,WK,T1,Three,0,SH1
+R1,WK,T2,Three,0,SH1
+R2,WK,T3,Four,0,
+R1,WK,T5,Three,0,SH1
+'''
+
+
+@pytest.fixture
+def versions (feed_path, make_feed) -> tuple[rr.GTFS, rr.GTFS]:
+    '''`FEED` and a version with a renamed route and changed trips'''
+    old = rr.GTFS.read('feed', gtfs_path=feed_path)
+    new = rr.GTFS.read('feed', gtfs_path=make_feed({
+        'routes.txt': ROUTES,
+        'stop_times.txt': STOP_TIMES,
+        'trips.txt': TRIPS
+    }))
+    return old, new
+
+
+def test_patch_round_trips_in_memory (versions, tmp_path):
+    old, new = versions
+    old.index
+    path = os.path.join(tmp_path, 'feed.delta.json.gz')
+    rr.Delta.save(rr.diff(old, new), path)
+    delta = rr.Delta.load(path)
+
+    assert delta.removals == { 'trips': ['T4'] }
+    assert set(delta.changes['routes']) == { 'R1' }
+    assert delta.changes['trips']
+
+    patched = rr.patch(old, delta)
+    assert len(rr.diff(patched, new)) == 0
+    assert patched.routes['R2'] is old.routes['R2']
+    assert old.trips['T4'] is not None
+    assert sorted(patched.index.trip_ids) == sorted(new.trips.ids)
+    with pytest.raises(ValueError, match='does not apply'):
+        rr.patch(patched, delta)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_patch_mgtfs_round_trips (versions, tmp_path, compact):
+    old, new = versions
+    path = os.path.join(tmp_path, 'feed.json')
+    rr.GTFS.save(old, path, compact=compact)
+    delta = rr.diff(old, new)
+    patch_mgtfs(path, delta)
+
+    patched = rr.GTFS.read('feed', mgtfs_path=path)
+    assert len(rr.diff(patched, new)) == 0
+    assert patched.routes['R1'].long_name == 'Green'
+    assert patched.trips['T4'] is None
+    with pytest.raises(ValueError, match='does not apply'):
+        patch_mgtfs(path, delta)
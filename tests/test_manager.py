@@ -0,0 +1,71 @@
+import pytest
+
+import railroaded as rr
+from railroaded.manager import check
+
+
+def _broken ():
+    raise OSError('download failed')
+
+
+def test_reload_swaps_in_a_changed_feed (feed_path, make_feed):
+    old = rr.GTFS.read('feed', gtfs_path=feed_path)
+    manager = rr.FeedManager(old)
+    path = make_feed({ 'routes.txt': '''\
+route_id,agency_id,route_short_name,route_long_name,route_type
+R1,A,1,Green,2
+R2,A,2,Blue,3
+''' })
+    try:
+        new = manager.reload(name='feed', gtfs_path=path).result(timeout=60)
+    finally:
+        manager.shutdown()
+
+    assert manager.current is new
+    assert new is not old
+    assert manager.version == 2
+    assert new.routes['R1'].long_name == 'Green'
+    assert old.routes['R1'].long_name == 'Red'
+
+
+def test_reload_of_an_unchanged_feed_keeps_the_current (feed_path, make_feed):
+    old = rr.GTFS.read('feed', gtfs_path=feed_path)
+    old.memoize(16)
+    index = old.index
+    manager = rr.FeedManager(old)
+    try:
+        same = manager.reload(name='feed', gtfs_path=make_feed())
+        assert same.result(timeout=60) is old
+    finally:
+        manager.shutdown()
+
+    assert manager.current is old
+    assert manager.version == 1
+    assert manager.current.index is index
+
+
+def test_failed_reload_keeps_the_current (feed_path, make_feed):
+    old = rr.GTFS.read('feed', gtfs_path=feed_path)
+    manager = rr.FeedManager(old)
+    path = make_feed({ 'trips.txt': '''\
+route_id,service_id,trip_id,trip_headsign,direction_id,shape_id
+R9,WK,T1,Three,0,SH1
+''' })
+    try:
+        with pytest.raises(OSError):
+            manager.reload_with(_broken).result(timeout=60)
+        with pytest.raises(ValueError, match='missing route R9'):
+            manager.reload(name='feed', gtfs_path=path).result(timeout=60)
+    finally:
+        manager.shutdown()
+
+    assert manager.current is old
+    assert manager.version == 1
+
+
+def test_check_rejects_an_empty_feed (make_feed):
+    g = rr.GTFS.read('feed', gtfs_path=make_feed({ 'trips.txt': '''\
+route_id,service_id,trip_id,trip_headsign,direction_id,shape_id
+''' }))
+    with pytest.raises(ValueError, match='no trips'):
+        check(g)
@@ -0,0 +1,11 @@
+from datetime import date, time
+
+import railroaded as rr
+from railroaded import matrix
+
+
+def test_single_process_leaves_no_connections (feed_path):
+    gtfs = rr.GTFS.read('feed', gtfs_path=feed_path)
+    times = gtfs.travel_times(['S1'], ['S3'], date(2026, 3, 2), time(8, 0))
+    assert times[0, 0] == 8 * 3600 + 20 * 60
+    assert matrix._CONNECTIONS is None
@@ -0,0 +1,22 @@
+import pytest
+
+import railroaded as rr
+
+
+def test_merge_rejects_unloaded_tables (feed_path):
+    full = rr.GTFS.read('full', gtfs_path=feed_path)
+    partial = rr.GTFS.read(
+        'partial',
+        gtfs_path=feed_path,
+        tables={ 'agencies', 'routes', 'schedules', 'stops', 'trips' }
+    )
+    with pytest.raises(ValueError, match=r"'partial'.*\['feed', 'shapes'"):
+        rr.merge([full, partial], 'merged')
+
+
+def test_merge_prefixes_ids (feed_path):
+    a = rr.GTFS.read('a', gtfs_path=feed_path)
+    b = rr.GTFS.read('b', gtfs_path=feed_path)
+    merged = rr.merge([a, b], 'merged')
+    assert { 'a:T1', 'b:T1' } <= set(merged.trips.ids)
+    assert len(merged.trips.ids) == 2 * len(a.trips.ids)
@@ -0,0 +1,43 @@
+import json
+
+import numpy as np
+import pytest
+
+import railroaded as rr
+from railroaded.models import Shape
+
+
+LATS = [40.0, 40.05, 40.1, 40.15, 40.2]
+LONS = [-75.0, -75.05, -75.1, -75.15, -75.2]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_shapes_round_trip (feed_path, tmp_path, compact):
+    gtfs = rr.GTFS.read('feed', gtfs_path=feed_path)
+    path = str(tmp_path / 'feed.json')
+    rr.GTFS.save(gtfs, path, compact)
+
+    shape = rr.GTFS.read('feed', mgtfs_path=path).shapes['SH1']
+    assert '_steps' not in shape.__dict__
+    assert np.allclose(shape.coords, np.column_stack((LATS, LONS)))
+    assert shape.lats.dtype == np.int32
+    assert shape.lats.tolist() == gtfs.shapes['SH1'].lats.tolist()
+
+
+def test_shapes_are_compact ():
+    shape = Shape.from_points('SH', np.array(LATS), np.array(LONS))
+    data = Shape.SCHEMA.dump(shape)
+    assert isinstance(data['lats'], str)
+    assert len(data['lats']) == 4 * -(-4 * len(LATS) // 3)
+    assert shape.lats.nbytes == 4 * len(LATS)
+    assert shape.lons.nbytes == 4 * len(LONS)
+    assert len(json.dumps(data['lats'])) < len(json.dumps(
+        shape.lats.tolist()
+    ))
+
+
+def test_shapes_read_list_steps ():
+    steps = [4000000, 5000, 5000]
+    shape = Shape('SH', steps, [-7500000, -5000, -5000])
+    assert shape.lats.tolist() == steps
+    assert np.allclose(shape.coords[:, 0], [40.0, 40.05, 40.1])
@@ -0,0 +1,19 @@
+from datetime import date
+
+import railroaded as rr
+
+
+def test_cache_hits_are_counted (feed_path):
+    gtfs = rr.GTFS.read('feed', gtfs_path=feed_path)
+    gtfs.memoize()
+    rr.queries.reset()
+
+    first = gtfs.on_date(date(2026, 3, 2))
+    second = gtfs.on_date(date(2026, 3, 2))
+
+    stats = rr.queries.snapshot()['on_date']
+    assert second is first
+    assert gtfs.cache.stats['hits'] == 1
+    assert stats['calls'] == 2
+    assert stats['table_rows'] == 2 * len(gtfs.trips.data)
+    assert stats['returned'] == 2 * len(first.trips.data)
@@ -0,0 +1,62 @@
+from datetime import date
+import multiprocessing
+import os
+import pickle
+
+import railroaded as rr
+
+
+def _query (name: str) -> tuple[list[str], list[str], list[str], int, int]:
+    store = rr.FeedStore.attach(name)
+    gtfs = store.load()
+    routed = sorted(gtfs.on_route('R2').trips.ids)
+    dated = sorted(gtfs.on_date(date(2026, 3, 7)).trips.ids)
+    connecting = sorted(gtfs.connecting('S1', 'S3').trips.ids)
+    decoded, total = gtfs.trips.data.decoded, len(gtfs.trips.data)
+    del gtfs
+    store.close()
+    return routed, dated, connecting, decoded, total
+
+
+def test_tables_decode_on_first_access (feed_path, tmp_path):
+    g = rr.GTFS.read('feed', gtfs_path=feed_path)
+    path = os.path.join(tmp_path, 'feed.arena')
+    rr.FeedStore.write(g, path)
+    store = rr.FeedStore.open(path)
+    loaded = store.load()
+
+    assert 'trips' not in loaded.__dict__
+    assert 'shapes' not in loaded.__dict__
+    assert loaded.index.trip_ids == g.index.trip_ids
+
+    trip = loaded.trips['T1']
+    assert trip.shape is loaded.shapes['SH1']
+    assert trip.stop_ids == g.trips['T1'].stop_ids
+    assert trip.timetable.start.stop_id == 'S1'
+    assert loaded.trips['T3'].frequencies == g.trips['T3'].frequencies
+    assert 'agencies' not in loaded.__dict__
+
+    copy = pickle.loads(pickle.dumps(loaded))
+    assert list(copy.routes.data) == list(g.routes.data)
+    assert list(copy.trips.data) == list(g.trips.data)
+    del loaded, copy
+    store.close()
+
+
+def test_attached_processes_decode_only_returned_trips (feed_path):
+    g = rr.GTFS.read('feed', gtfs_path=feed_path)
+    store = rr.FeedStore.create(g)
+    try:
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(2) as pool:
+            results = pool.map(_query, [store.name] * 2)
+    finally:
+        store.close()
+        store.unlink()
+
+    for routed, dated, connecting, decoded, total in results:
+        assert routed == ['T3']
+        assert dated == ['T4', 'T5']
+        assert connecting == ['T1', 'T2', 'T4', 'T5']
+        assert total == len(g.trips.data)
+        assert decoded == len(routed) + len(dated) + len(connecting)
@@ -0,0 +1,96 @@
+from datetime import date, datetime
+import importlib
+
+import pytest
+
+import railroaded as rr
+
+from conftest import FEED
+
+
+def test_first_stop_time_is_kept (feed_path):
+    gtfs = rr.GTFS.read('feed', gtfs_path=feed_path)
+    assert gtfs.trips['T1'].stop_ids == ['S1', 'S2', 'S3']
+    assert gtfs.trips['T3'].stop_ids == ['S2', 'S4']
+    rows = FEED['stop_times.txt'].strip().count('\n')
+    assert len(gtfs.index.stops) == rows
+
+
+def test_trip_without_stop_times_is_kept (make_feed):
+    path = make_feed({
+        'trips.txt': FEED['trips.txt'] + 'R1,WK,T6,Empty,0,\n'
+    })
+    gtfs = rr.GTFS.read('feed', gtfs_path=path)
+    trip = gtfs.trips['T6']
+    assert trip.stop_ids == []
+    assert trip.runs(0, 86400) == []
+    assert 'T6' in gtfs.on_date(date(2026, 3, 2)).trips.ids
+    saturday = gtfs.on_date(date(2026, 3, 7))
+    assert 'T6' not in saturday.trips.ids
+    assert 'T5' in saturday.trips.ids
+    positions = gtfs.positions(datetime(2026, 3, 2, 8, 5))
+    assert 'T6' not in positions.trip_ids
+
+
+def test_trip_without_stop_times_between_trips (make_feed):
+    trips = FEED['trips.txt'].splitlines(keepends=True)
+    path = make_feed({
+        'trips.txt': ''.join(trips[:2]) + 'R1,WK,T6,Empty,0,\n' \
+            + ''.join(trips[2:])
+    })
+    gtfs = rr.GTFS.read('feed', gtfs_path=path)
+    running = gtfs.between(
+        datetime(2026, 3, 2, 8, 15), datetime(2026, 3, 2, 9, 5)
+    )
+    assert sorted(running.trips.ids) == ['T1', 'T2', 'T3']
+
+
+def test_location_crosses_midnight (feed_path):
+    gtfs = rr.GTFS.read('feed', gtfs_path=feed_path)
+    trip, timeline = gtfs.trips['T5'], gtfs.timeline
+    a, b = trip.location_at(datetime(2026, 3, 3, 0, 15), timeline)
+    assert (a.stop_id, b.stop_id) == ('S2', 'S3')
+    a, b = trip.location_at(datetime(2026, 3, 2, 23, 55), timeline)
+    assert (a.stop_id, b.stop_id) == ('S1', 'S2')
+    a, b = trip.location_at(datetime(2026, 3, 2, 12, 0), timeline)
+    assert a is None and b.stop_id == 'S1'
+
+    trip = gtfs.trips['T1']
+    a, b = trip.location_at(datetime(2026, 3, 2, 8, 5), timeline)
+    assert (a.stop_id, b.stop_id) == ('S1', 'S2')
+    a, b = trip.location_at(datetime(2026, 3, 2, 8, 10, 30), timeline)
+    assert (a.stop_id, b.stop_id) == ('S1', 'S2')
+    a, b = trip.location_at(datetime(2026, 3, 2, 9, 0), timeline)
+    assert a.stop_id == 'S3' and b is None
+
+
+def test_location_follows_frequency_runs (feed_path):
+    gtfs = rr.GTFS.read('feed', gtfs_path=feed_path)
+    trip, timeline = gtfs.trips['T3'], gtfs.timeline
+    a, b = trip.location_at(datetime(2026, 3, 2, 6, 20), timeline)
+    assert (a.stop_id, b.stop_id) == ('S2', 'S4')
+    a, b = trip.location_at(datetime(2026, 3, 2, 9, 50), timeline)
+    assert (a.stop_id, b.stop_id) == ('S2', 'S4')
+    a, b = trip.location_at(datetime(2026, 3, 2, 5, 0), timeline)
+    assert a is None and b.stop_id == 'S2'
+    a, b = trip.location_at(datetime(2026, 3, 2, 11, 0), timeline)
+    assert a.stop_id == 'S4' and b is None
+
+
+def test_location_properties_are_deprecated (feed_path, monkeypatch):
+    class Now(datetime):
+        @classmethod
+        def now (cls, tz=None):
+            return datetime(2026, 3, 2, 8, 30)
+
+    for name in ('trip', 'timetable'):
+        module = importlib.import_module(f'railroaded.models.{name}')
+        monkeypatch.setattr(module, 'datetime', Now)
+    gtfs = rr.GTFS.read('feed', gtfs_path=feed_path)
+
+    with pytest.deprecated_call():
+        a, b = gtfs.trips['T3'].location
+    assert (a.stop_id, b.stop_id) == ('S2', 'S4')
+    with pytest.deprecated_call():
+        a, b = gtfs.trips['T1'].timetable.location
+    assert a.stop_id == 'S3' and b is None
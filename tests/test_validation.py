@@ -0,0 +1,74 @@
+import pytest
+
+import railroaded as rr
+from railroaded import util, validation
+from railroaded.tables import shapes
+
+from conftest import FEED
+
+
+@pytest.fixture(params=['pandas', 'csv'])
+def engine (request, monkeypatch):
+    if request.param == 'pandas':
+        pytest.importorskip('pandas')
+    else:
+        for module in (shapes, util, validation):
+            monkeypatch.setattr(module, 'has_pandas', lambda: False)
+    return request.param
+
+
+def test_valid_feed_passes (feed_path, engine):
+    report = rr.ValidationReport.from_gtfs(feed_path)
+    assert report.ok
+    assert all(f.passed for f in report)
+
+
+def test_trailing_whitespace_is_ignored (make_feed, engine):
+    path = make_feed({
+        'stop_times.txt': FEED['stop_times.txt'].replace(
+            'T1,08:00:00,08:00:00,S1,1', 'T1,08:00:00 ,08:00:00 ,S1 ,1 '
+        )
+    })
+    report = rr.ValidationReport.from_gtfs(path)
+    assert report['stop_time_format'].passed
+    assert report['stop_time_stop'].passed
+    assert report.ok
+
+
+def test_samples_count_rows_not_lines (make_feed, engine):
+    path = make_feed({
+        'trips.txt': '''\
+route_id,service_id,trip_id,trip_headsign,direction_id,shape_id
+
+R1,WK,T1,"Three
+lines",0,SH1
+R1,WK,T2,Three,0,SH1
+RX,WK,T3,Four,0,
+R1,WE,T4,Three,0,SH1
+R1,WK,T5,Three,0,SH1
+'''
+    })
+    report = rr.ValidationReport.from_gtfs(path)
+    finding = report['trip_route']
+    assert finding.count == 1
+    assert finding.samples == [{ 'row': 3, 'trip_id': 'T3', 'route_id': 'RX' }]
+    assert not report.ok
+
+
+def test_ingest_strips_like_validation (make_feed, engine):
+    path = make_feed({
+        'stop_times.txt': FEED['stop_times.txt'].replace(
+            'T1,08:00:00,08:00:00,S1,1', 'T1 ,08:00:00 ,08:00:00, S1 ,1 '
+        ),
+        'shapes.txt': FEED['shapes.txt'].replace('SH1,40.0,', 'SH1 ,40.0,'),
+        'trips.txt': FEED['trips.txt'].replace(
+            'R1,WK,T1,Three,0,SH1', 'R1 , WK,T1 ,Three,0,SH1 '
+        )
+    })
+    gtfs = rr.GTFS.read('feed', gtfs_path=path, check=True)
+    trip = gtfs.trips['T1']
+    assert (trip.route_id, trip.service_id) == ('R1', 'WK')
+    assert trip.stop_ids == ['S1', 'S2', 'S3']
+    assert trip.shape is gtfs.shapes['SH1']
+    assert len(gtfs.shapes['SH1'].lats) == 5
+    assert gtfs.stops[gtfs.index.stop_ids[gtfs.index.stops[0]]] is not None